@@ -0,0 +1,69 @@
+import sys
+import time
+from typing import List, Dict
+
+from bsvlib import Key, Unspent, Transaction, ChainBuilder, create_transaction
+
+#
+# pay out of a wallet of many coins while some of its payments wait for confirmation, change of each payment is spent again later
+# each payment spends the shallowest spendable output within the ancestor depth, a block confirms the payments of the one before
+# compare tracking unspents and ancestor depths by hand, as a caller would without the chain builder, with the chain builder
+# by hand finding the shallowest output is a scan over every spendable output, the chain builder takes it out of its depth buckets
+# signing costs the same to both, so the gap grows with the number of coins
+#
+COINS = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+PAYMENTS = 1000
+BLOCK = 100
+MAX_DEPTH = 25
+
+
+def build_coins(k: Key) -> List[Unspent]:
+    return [Unspent(txid=f'{i:064x}', vout=0, satoshi=2000, private_keys=[k]) for i in range(COINS)]
+
+
+def by_hand(k: Key, coins: List[Unspent], address: str) -> List[Transaction]:
+    spendable: List[Unspent] = list(coins)
+    depths: Dict[str, int] = {}
+    unconfirmed: List[Transaction] = []
+    transactions = []
+    for i in range(PAYMENTS):
+        if i and i % BLOCK == 0:
+            # payments of the block before confirm, depths of those left are recomputed in order
+            unconfirmed = unconfirmed[-BLOCK:]
+            depths = {}
+            for t in unconfirmed:
+                depths[t.txid()] = 1 + max([depths.get(tx_input.txid, 0) for tx_input in t.tx_inputs])
+        index = min(range(len(spendable)), key=lambda j: depths.get(spendable[j].txid, 0))
+        unspent = spendable.pop(index)
+        depth = 1 + depths.get(unspent.txid, 0)
+        assert depth <= MAX_DEPTH
+        t = create_transaction([unspent], [(address, 1000)], k.address())
+        depths[t.txid()] = depth
+        unconfirmed.append(t)
+        transactions.append(t)
+        spendable.append(t.to_unspent(1, private_keys=[k]))
+    return transactions
+
+
+def chain_builder(coins: List[Unspent], address: str) -> List[Transaction]:
+    builder = ChainBuilder(coins, max_depth=MAX_DEPTH)
+    transactions = []
+    for i in range(PAYMENTS):
+        if i and i % BLOCK == 0:
+            builder.confirm([t.txid() for t in transactions[-2 * BLOCK:-BLOCK]])
+        transactions.append(builder.create_transaction([(address, 1000)]))
+    return transactions
+
+
+if __name__ == '__main__':
+    k = Key()
+    address = Key().address()
+    coins = build_coins(k)
+    print(f'{COINS} coins, {PAYMENTS} payments, a block every {BLOCK} payments')
+    start = time.perf_counter()
+    by_hand(k, coins, address)
+    print(f'by hand        {time.perf_counter() - start:.3f}s')
+    coins = build_coins(k)
+    start = time.perf_counter()
+    chain_builder(coins, address)
+    print(f'chain builder  {time.perf_counter() - start:.3f}s')
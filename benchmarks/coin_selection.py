@@ -0,0 +1,56 @@
+import math
+import time
+from typing import List
+
+from bsvlib import Key, Transaction, TxOutput, Unspent, create_transaction
+
+#
+# pick small unspents one at a time until the outputs and fee are covered, compare running totals with walking the transaction every round
+#
+UNSPENTS = 100000
+SATOSHI = 1000
+# satoshi to pay, as number of unspents needed
+PAYMENTS = [1000, 5000, 20000, 90000]
+# the walking selection is quadratic, don't wait for it beyond this
+LEGACY_LIMIT = 5000
+
+
+def build_unspents(k: Key) -> List[Unspent]:
+    return [Unspent(txid=i.to_bytes(32, 'big').hex(), vout=0, satoshi=SATOSHI, private_keys=[k]) for i in range(UNSPENTS)]
+
+
+def legacy_fee(t: Transaction) -> int:
+    return sum([tx_input.satoshi for tx_input in t.tx_inputs]) - sum([tx_output.satoshi for tx_output in t.tx_outputs])
+
+
+def legacy_estimated_fee(t: Transaction) -> int:
+    estimated_length = 10 + sum([41 + tx_input.script_type.estimated_unlocking_byte_length(private_keys=tx_input.private_keys) for tx_input in t.tx_inputs])
+    return math.ceil(t.fee_rate * (estimated_length + sum([tx_output.byte_length() for tx_output in t.tx_outputs])))
+
+
+def legacy_select(unspents: List[Unspent], address: str, satoshi: int) -> Transaction:
+    """
+    how unspents were picked before, both fee and estimated fee walk every input and output in each round
+    """
+    t = Transaction().add_output(TxOutput(address, satoshi))
+    while unspents and legacy_fee(t) < legacy_estimated_fee(t):
+        t.add_input(unspents.pop())
+    return t
+
+
+if __name__ == '__main__':
+    k = Key()
+    unspents = build_unspents(k)
+    print(f'{UNSPENTS} unspents of {SATOSHI} satoshi')
+    for count in PAYMENTS:
+        satoshi = count * SATOSHI * 9 // 10
+        start = time.perf_counter()
+        t = create_transaction(list(unspents), [(k.address(), satoshi)], change=False, sign=False)
+        seconds = time.perf_counter() - start
+        line = f'pay {satoshi:>10} satoshi {len(t.tx_inputs):>6} inputs picked  running totals {seconds:8.4f}s'
+        if count <= LEGACY_LIMIT:
+            start = time.perf_counter()
+            legacy = legacy_select(list(unspents), k.address(), satoshi)
+            line += f'  walking {time.perf_counter() - start:8.4f}s'
+            assert len(legacy.tx_inputs) == len(t.tx_inputs)
+        print(line)
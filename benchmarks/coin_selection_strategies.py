@@ -0,0 +1,76 @@
+import random
+import sys
+import time
+from typing import List
+
+from bsvlib import Key, Transaction, TxOutput, Unspent
+from bsvlib.coin_selection import UnspentPool, CoinSelector, LargestFirst, OldestFirst, Knapsack, BranchAndBound
+
+#
+# select coins for payments out of wallets of 10k to 1M unspents, the index is built once and every selection is O(log n) lookups
+# the number of inputs and the satoshi left over beyond the fee tell how good each strategy is
+#
+SIZES = [10000, 100000, 1000000]
+PAYMENTS = 20
+
+
+def build_unspents(k: Key, size: int, rng: random.Random) -> List[Unspent]:
+    # mostly small coins, a few big ones
+    return [Unspent(txid=i.to_bytes(32, 'big').hex(), vout=0, satoshi=int(rng.paretovariate(1.2) * 1000), height=rng.randint(1, 800000),
+                    private_keys=[k]) for i in range(size)]
+
+
+def legacy_select(unspents: List[Unspent], t: Transaction) -> List[Unspent]:
+    """
+    how coins were picked before, the last unspent first
+    """
+    picked = []
+    while unspents and t.fee() < t.estimated_fee():
+        picked.append(unspents.pop())
+        t.add_input(picked[-1])
+    return picked
+
+
+def bench(name: str, select, payments: List[int], address: str) -> None:
+    inputs, excess, seconds = 0, 0, 0.0
+    for payment in payments:
+        t = Transaction().add_output(TxOutput(address, payment))
+        start = time.perf_counter()
+        select(t)
+        seconds += time.perf_counter() - start
+        inputs += len(t.tx_inputs)
+        excess += t.fee() - t.estimated_fee()
+    n = len(payments)
+    print(f'  {name:<16} {seconds / n * 1000:9.3f} ms/tx {inputs / n:8.1f} inputs/tx {excess / n:12.1f} satoshi left over/tx')
+
+
+def pooled(pool: UnspentPool, selector: CoinSelector):
+    def select(t: Transaction) -> None:
+        # put the coins back so that every payment selects from the same wallet
+        pool.add_many(selector.select(pool, t))
+    return select
+
+
+def listed(unspents: List[Unspent]):
+    def select(t: Transaction) -> None:
+        unspents.extend(reversed(legacy_select(unspents, t)))
+    return select
+
+
+if __name__ == '__main__':
+    sizes = [int(size) for size in sys.argv[1:]] or SIZES
+    k = Key()
+    for size in sizes:
+        rng = random.Random(size)
+        unspents = build_unspents(k, size, rng)
+        payments = [rng.randint(10000, 1000000) for _ in range(PAYMENTS)]
+        start = time.perf_counter()
+        pool = UnspentPool(unspents)
+        print(f'{size} unspents, {pool.total()} satoshi, index built in {time.perf_counter() - start:.3f}s')
+        start = time.perf_counter()
+        pool._oldest()
+        print(f'index by age built in {time.perf_counter() - start:.3f}s on first use')
+        bench('last in first', listed(unspents), payments, k.address())
+        for name, selector in [('largest first', LargestFirst()), ('oldest first', OldestFirst()), ('knapsack', Knapsack(seed=0)),
+                               ('branch and bound', BranchAndBound())]:
+            bench(name, pooled(pool, selector), payments, k.address())
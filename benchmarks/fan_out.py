@@ -0,0 +1,38 @@
+import os
+import sys
+import time
+
+from bsvlib import Key, Unspent, Transaction, TxOutput, UnspentPool, LargestFirst, create_fan_outs
+from bsvlib.payout import spendable_unspents
+
+#
+# split a few large coins into 10k coins of the same value, then build payments out of them with no two spending the same coin
+# without splitting, only as many payments as there are coins can be in flight before they have to chain off each other's change
+#
+COINS = 10
+SATOSHI = 10000000
+SPLIT = 10000
+PAYMENT = 5000
+
+
+if __name__ == '__main__':
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+    k = Key()
+    unspents = [Unspent(txid=i.to_bytes(32, 'big').hex(), vout=0, satoshi=SATOSHI, private_keys=[k]) for i in range(COINS)]
+    print(f'{COINS} coins of {SATOSHI} satoshi, {COINS} payments in flight at most')
+    start = time.perf_counter()
+    transactions = create_fan_outs(list(unspents), SPLIT, workers=workers)
+    split = spendable_unspents(transactions)
+    print(f'split into {len(split)} coins by {len(transactions)} transactions in {time.perf_counter() - start:.3f}s')
+    pool = UnspentPool(split)
+    selector = LargestFirst()
+    start = time.perf_counter()
+    payments = []
+    while len(pool):
+        t = Transaction().add_output(TxOutput(k.address(), PAYMENT))
+        selector.select(pool, t)
+        payments.append(t.add_change())
+    Transaction.sign_all(payments, workers=workers)
+    outpoints = {tx_input.outpoint for t in payments for tx_input in t.tx_inputs}
+    assert len(outpoints) == sum([len(t.tx_inputs) for t in payments])
+    print(f'{len(payments)} independent payments built and signed in {time.perf_counter() - start:.3f}s')
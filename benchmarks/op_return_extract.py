@@ -0,0 +1,63 @@
+import os
+import tempfile
+import timeit
+from typing import List, Tuple
+
+from bsvlib import Key, Transaction, Unspent, TxOutput
+from bsvlib.constants import OP
+from bsvlib.script import OpReturnScriptType
+from bsvlib.transaction import OpReturnExtractor
+
+#
+# pick B:// and MAP outputs out of a stream of transactions, compare the single pass extractor with parsing every transaction
+#
+TRANSACTIONS = 2000
+REPEAT = 5
+B = '19HxigV4QyBv3tHpQVcUEQyq1pzZVdoAut'
+MAP = '1PuQa7K62MiKCtssSLKy1kh56WWU7MtUR5'
+PREFIXES = [B, MAP, 'app']
+
+
+def build_stream() -> bytes:
+    k = Key()
+    stream = bytearray()
+    for i in range(TRANSACTIONS):
+        t = Transaction().add_input(Unspent(txid=i.to_bytes(32, 'big').hex(), vout=0, satoshi=10000, private_keys=[k]))
+        t.add_outputs([TxOutput(k.address(), 500) for _ in range(3)])
+        # one in ten transactions carries a payload of a wanted protocol
+        t.add_output(TxOutput([PREFIXES[i % 3] if i % 10 == 0 else 'other', 'x' * 100, 'text/plain']))
+        stream += t.sign().serialize()
+    return bytes(stream)
+
+
+def full_parse(path: str) -> List[Tuple[str, int, List[bytes]]]:
+    """
+    how payloads were picked before, every transaction is decoded and every OP_RETURN script tokenized
+    """
+    prefixes = [prefix.encode() for prefix in PREFIXES]
+    matches = []
+    for _, t in Transaction.iter_file(path):
+        for vout, tx_output in enumerate(t.tx_outputs):
+            if tx_output.script_type == OpReturnScriptType():
+                chunks = list(tx_output.locking_script.chunks())
+                # pushdatas after OP_RETURN
+                returned = [opcode for opcode, _ in chunks].index(OP.OP_RETURN[0])
+                pushdatas = [bytes(pushdata) for _, pushdata in chunks[returned + 1:] if pushdata is not None]
+                if pushdatas and pushdatas[0].startswith(tuple(prefixes)):
+                    matches.append((t.txid(), vout, pushdatas))
+    return matches
+
+
+if __name__ == '__main__':
+    raw = build_stream()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'transactions.bin')
+        with open(path, 'wb') as f:
+            f.write(raw)
+        extractor = OpReturnExtractor(PREFIXES)
+        assert full_parse(path) == list(extractor.extract_file(path))
+        print(f'{TRANSACTIONS} transactions, {len(raw)} bytes')
+        for name, fn in [('parse every transaction', lambda: full_parse(path)), ('extractor (memoryview)', lambda: list(extractor.extract(raw))),
+                         ('extractor (file)', lambda: list(extractor.extract_file(path)))]:
+            seconds = min(timeit.repeat(fn, number=1, repeat=REPEAT))
+            print(f'{name:<32} {seconds:8.4f}s {TRANSACTIONS / seconds:10.1f} tx/s')
@@ -0,0 +1,54 @@
+import os
+import pickle
+import sys
+import timeit
+
+from bsvlib import Key, Transaction, Unspent, TxOutput
+from bsvlib.transaction.transaction import decode_compact_chunk
+
+#
+# decode many small transactions, in the current process and across process pools of growing size
+# workers only decode raw transactions into the compact form, the parent still builds every transaction from it
+# so the serial share printed first, parent side plus pickling against decoding in the current process, bounds the speedup
+# unless the compact form is asked for, scaling is bounded by the number of CPUs available as well
+#
+TRANSACTIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+CHUNKSIZE = 64
+WORKERS = [1, 2, 4, 8]
+REPEAT = 5
+
+
+def build_raws():
+    k = Key()
+    t = Transaction().add_input(Unspent(txid='00' * 32, vout=0, satoshi=100000, private_keys=[k]))
+    t.add_outputs([TxOutput(k.address(), 1000), TxOutput(['hello'])]).add_change().sign()
+    raws = []
+    for i in range(TRANSACTIONS):
+        t.locktime = i
+        raws.append(t.serialize())
+    return raws
+
+
+def best(fn) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=REPEAT))
+
+
+if __name__ == '__main__':
+    raws = build_raws()
+    print(f'cpus: {os.cpu_count()}, transactions: {TRANSACTIONS}, {len(raws[0])} bytes each')
+    compacts = decode_compact_chunk(raws)
+    pickled = pickle.dumps(compacts)
+    serial = best(lambda: [Transaction.from_hex(raw) for raw in raws])
+    worker_side = best(lambda: decode_compact_chunk(raws))
+    parent_side = best(lambda: [Transaction.from_compact(compact) for compact in compacts])
+    pickling = best(lambda: pickle.loads(pickled)) + best(lambda: pickle.dumps(compacts))
+    print(f'from_hex in the current process  {serial * 1000:8.1f} ms')
+    print(f'  worker side, decode_compact    {worker_side * 1000:8.1f} ms')
+    print(f'  parent side, from_compact      {parent_side * 1000:8.1f} ms')
+    print(f'  pickling the compact form      {pickling * 1000:8.1f} ms')
+    print(f'  best speedup possible          {serial / (parent_side + pickling):8.2f}x')
+    for compact in [False, True]:
+        print('compact form, building nothing in the parent' if compact else 'transactions')
+        for workers in WORKERS:
+            seconds = best(lambda: Transaction.parse_many(raws, workers=workers, chunksize=CHUNKSIZE, compact=compact))
+            print(f'  workers {workers:>2}: {seconds * 1000:8.1f} ms, {TRANSACTIONS / seconds:8.0f} tx/s, speedup {serial / seconds:.2f}x')
@@ -0,0 +1,196 @@
+import timeit
+from contextlib import suppress
+from typing import List, Optional, Dict, Any, Union
+
+from bsvlib import Key, Transaction, Unspent, TxOutput
+from bsvlib.constants import Chain, SIGHASH, TRANSACTION_SEQUENCE, TRANSACTION_VERSION, TRANSACTION_LOCKTIME, TRANSACTION_FEE_RATE
+from bsvlib.script.type import ScriptType, P2pkhScriptType, UnknownScriptType
+from bsvlib.service.provider import Provider
+from bsvlib.transaction import TransactionBytesIO
+from bsvlib.utils import unsigned_to_varint
+
+#
+# decode a transaction with many inputs and outputs, compare the memoryview reader with the BytesIO path
+# the BytesIO path builds the plain objects of the library as they were before, copied below, rather than the current ones
+# which track their owner and running totals, so the comparison keeps measuring against the original parser
+#
+INPUTS = 200
+OUTPUTS = 200
+ROUNDS = 50
+REPEAT = 7
+
+
+def build_raw() -> bytes:
+    k = Key()
+    t = Transaction()
+    for i in range(INPUTS):
+        t.add_input(Unspent(txid=i.to_bytes(32, 'big').hex(), vout=i, satoshi=1000, private_keys=[k]))
+    for _ in range(OUTPUTS):
+        t.add_output(TxOutput(k.address(), 500))
+    return t.sign().serialize()
+
+
+class LegacyScript:
+    """
+    Script as it was before, kept here with the other classes below so that the comparison doesn't move along with the library
+    """
+
+    def __init__(self, script: Union[str, bytes, None] = None):
+        if script is None:
+            self.script: bytes = b''
+        elif isinstance(script, str):
+            self.script: bytes = bytes.fromhex(script)
+        elif isinstance(script, bytes):
+            self.script: bytes = script
+        else:
+            raise TypeError('unsupported script type')
+
+
+class LegacyUnspent:
+
+    def __init__(self, **kwargs):
+        self.txid: str = kwargs.get('txid')
+        self.vout: int = int(kwargs.get('vout'))
+        self.satoshi: int = int(kwargs.get('satoshi'))
+        self.height: int = -1 if kwargs.get('height') is None else kwargs.get('height')
+        self.confirmations: int = 0 if kwargs.get('confirmations') is None else kwargs.get('confirmations')
+        self.private_keys: List = kwargs.get('private_keys') if kwargs.get('private_keys') else []
+        self.address: Optional[str] = kwargs.get('address') or (self.private_keys[0].address() if self.private_keys else None)
+        self.script_type: ScriptType = kwargs.get('script_type') or (P2pkhScriptType() if self.address else UnknownScriptType())
+        self.locking_script: LegacyScript = kwargs.get('locking_script') or LegacyScript()
+        assert self.txid and len(self.txid) == 64 and self.vout is not None and self.satoshi is not None and self.locking_script, 'bad unspent'
+
+
+class LegacyTxInput:
+
+    def __init__(self, unspent: Optional[LegacyUnspent] = None, private_keys: Optional[List] = None, unlocking_script: Optional[LegacyScript] = None,
+                 sequence: int = TRANSACTION_SEQUENCE, sighash: SIGHASH = SIGHASH.ALL_FORKID):
+        self.txid: str = unspent.txid if unspent else ('00' * 32)
+        self.vout: int = unspent.vout if unspent else 0
+        self.satoshi: int = unspent.satoshi if unspent else 0
+        self.height: int = unspent.height if unspent else -1
+        self.confirmations: int = unspent.confirmations if unspent else 0
+        self.private_keys: List = private_keys or (unspent.private_keys if unspent else [])
+        self.script_type: ScriptType = unspent.script_type if unspent else UnknownScriptType
+        self.locking_script: LegacyScript = unspent.locking_script if unspent else LegacyScript()
+        self.unlocking_script: LegacyScript = unlocking_script
+        self.sequence: int = sequence
+        self.sighash: SIGHASH = sighash
+
+    @classmethod
+    def from_hex(cls, stream: Union[str, bytes, TransactionBytesIO]) -> Optional['LegacyTxInput']:
+        with suppress(Exception):
+            stream = stream if isinstance(stream, TransactionBytesIO) else TransactionBytesIO(stream if isinstance(stream, bytes) else bytes.fromhex(stream))
+            txid = stream.read_bytes(32)[::-1]
+            assert len(txid) == 32
+            vout = stream.read_int(4)
+            assert vout is not None
+            script_length = stream.read_varint()
+            assert script_length is not None
+            unlocking_script_bytes = stream.read_bytes(script_length)
+            sequence = stream.read_int(4)
+            assert sequence is not None
+            unspent = LegacyUnspent(txid=txid.hex(), vout=vout, satoshi=0, locking_script=LegacyScript())
+            return LegacyTxInput(unspent=unspent, unlocking_script=LegacyScript(unlocking_script_bytes), sequence=sequence)
+        return None
+
+
+class LegacyTxOutput:
+
+    def __init__(self, out: Union[str, List[Union[str, bytes]], LegacyScript], satoshi: int = 0, script_type: ScriptType = UnknownScriptType()):
+        self.satoshi = satoshi
+        if isinstance(out, str):
+            raise NotImplementedError('outputs to an address are never parsed')
+        elif isinstance(out, List):
+            raise NotImplementedError('outputs of pushdata are never parsed')
+        elif isinstance(out, LegacyScript):
+            self.locking_script: LegacyScript = out
+            self.script_type: ScriptType = script_type
+        else:
+            raise TypeError('unsupported transaction output type')
+
+    @classmethod
+    def from_hex(cls, stream: Union[str, bytes, TransactionBytesIO]) -> Optional['LegacyTxOutput']:
+        with suppress(Exception):
+            stream = stream if isinstance(stream, TransactionBytesIO) else TransactionBytesIO(stream if isinstance(stream, bytes) else bytes.fromhex(stream))
+            satoshi = stream.read_int(8)
+            assert satoshi is not None
+            script_length = stream.read_varint()
+            assert script_length is not None
+            locking_script_bytes = stream.read_bytes(script_length)
+            return LegacyTxOutput(out=LegacyScript(locking_script_bytes), satoshi=satoshi)
+        return None
+
+
+class LegacyTransaction:
+
+    def __init__(self, tx_inputs: Optional[List[LegacyTxInput]] = None, tx_outputs: Optional[List[LegacyTxOutput]] = None,
+                 version: int = TRANSACTION_VERSION, locktime: int = TRANSACTION_LOCKTIME, fee_rate: Optional[float] = None,
+                 chain: Optional[Chain] = None, provider: Optional[Provider] = None, **kwargs):
+        self.tx_inputs: List[LegacyTxInput] = tx_inputs or []
+        self.tx_outputs: List[LegacyTxOutput] = tx_outputs or []
+        self.version: int = version
+        self.locktime: int = locktime
+        self.fee_rate: float = fee_rate if fee_rate is not None else TRANSACTION_FEE_RATE
+
+        self.chain: Chain = chain
+        self.provider: Provider = provider
+        if self.provider:
+            self.chain = self.provider.chain
+
+        self.kwargs: Dict[str, Any] = dict(**kwargs) or {}
+
+    @classmethod
+    def from_hex(cls, stream: Union[str, bytes, TransactionBytesIO]) -> Optional['LegacyTransaction']:
+        """
+        how transactions were decoded before, every field is copied out of a BytesIO and every input goes through an unspent
+        """
+        with suppress(Exception):
+            stream = stream if isinstance(stream, TransactionBytesIO) else TransactionBytesIO(stream if isinstance(stream, bytes) else bytes.fromhex(stream))
+            t = LegacyTransaction()
+            t.version = stream.read_int(4)
+            assert t.version is not None
+            inputs_count = stream.read_varint()
+            assert inputs_count is not None
+            for _ in range(inputs_count):
+                _input = LegacyTxInput.from_hex(stream)
+                assert _input is not None
+                t.tx_inputs.append(_input)
+            outputs_count = stream.read_varint()
+            assert outputs_count is not None
+            for _ in range(outputs_count):
+                _output = LegacyTxOutput.from_hex(stream)
+                assert _output is not None
+                t.tx_outputs.append(_output)
+            t.locktime = stream.read_int(4)
+            assert t.locktime is not None
+            return t
+        return None
+
+
+def legacy_serialize(t: LegacyTransaction) -> bytes:
+    chunks = [t.version.to_bytes(4, 'little'), unsigned_to_varint(len(t.tx_inputs))]
+    for tx_input in t.tx_inputs:
+        chunks += [bytes.fromhex(tx_input.txid)[::-1], tx_input.vout.to_bytes(4, 'little'), unsigned_to_varint(len(tx_input.unlocking_script.script)),
+                   tx_input.unlocking_script.script, tx_input.sequence.to_bytes(4, 'little')]
+    chunks.append(unsigned_to_varint(len(t.tx_outputs)))
+    for tx_output in t.tx_outputs:
+        chunks += [tx_output.satoshi.to_bytes(8, 'little'), unsigned_to_varint(len(tx_output.locking_script.script)), tx_output.locking_script.script]
+    chunks.append(t.locktime.to_bytes(4, 'little'))
+    return b''.join(chunks)
+
+
+def bench(name: str, fn, raws: List) -> None:
+    # best of several repeats to reduce the noise
+    seconds = min(timeit.repeat(lambda: [fn(raw) for raw in raws], number=1, repeat=REPEAT))
+    print(f'{name:<32} {seconds:8.4f}s {len(raws) / seconds:10.1f} tx/s')
+
+
+if __name__ == '__main__':
+    raw = build_raw()
+    assert legacy_serialize(LegacyTransaction.from_hex(raw)) == Transaction.from_hex(raw).serialize() == raw
+    print(f'{INPUTS} inputs, {OUTPUTS} outputs, {len(raw)} bytes, {ROUNDS} rounds')
+    bench('BytesIO + Unspent (legacy)', LegacyTransaction.from_hex, [raw] * ROUNDS)
+    bench('memoryview reader (bytes)', Transaction.from_hex, [raw] * ROUNDS)
+    bench('memoryview reader (bytearray)', Transaction.from_hex, [bytearray(raw)] * ROUNDS)
+    bench('memoryview reader (hex)', Transaction.from_hex, [raw.hex()] * ROUNDS)
@@ -0,0 +1,48 @@
+import os
+import sys
+import time
+from typing import List, Tuple
+
+from bsvlib import Key, Unspent, create_transaction, create_payouts
+
+#
+# pay 20k recipients in transactions of up to 1000 outputs, compare the planner with creating transactions one at a time
+# recipients repeat, as payouts to the same addresses do, each address is decoded once by the planner
+#
+RECIPIENTS = 20000
+ADDRESSES = 2000
+MAX_OUTPUTS = 1000
+UNSPENTS = 2000
+
+
+def build(k: Key) -> Tuple[List[Unspent], List[Tuple[str, int]]]:
+    unspents = [Unspent(txid=i.to_bytes(32, 'big').hex(), vout=0, satoshi=20000, private_keys=[k]) for i in range(UNSPENTS)]
+    addresses = [Key().address() for _ in range(ADDRESSES)]
+    return unspents, [(addresses[i % ADDRESSES], 1000 + i % 100) for i in range(RECIPIENTS)]
+
+
+def one_at_a_time(unspents: List[Unspent], recipients: List[Tuple[str, int]], leftover: str) -> int:
+    """
+    a batch at a time, each output decodes its address and each transaction is signed on its own
+    """
+    count = 0
+    for i in range(0, len(recipients), MAX_OUTPUTS):
+        create_transaction(unspents, recipients[i:i + MAX_OUTPUTS], leftover)
+        count += 1
+    return count
+
+
+if __name__ == '__main__':
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+    k = Key()
+    unspents, recipients = build(k)
+    start = time.perf_counter()
+    count = one_at_a_time(list(unspents), recipients, k.address())
+    print(f'one at a time  {count} transactions in {time.perf_counter() - start:.3f}s')
+    start = time.perf_counter()
+    transactions = create_payouts(list(unspents), recipients, max_outputs=MAX_OUTPUTS)
+    print(f'planner        {len(transactions)} transactions in {time.perf_counter() - start:.3f}s')
+    if workers > 1:
+        start = time.perf_counter()
+        transactions = create_payouts(list(unspents), recipients, max_outputs=MAX_OUTPUTS, workers=workers)
+        print(f'planner        {len(transactions)} transactions in {time.perf_counter() - start:.3f}s signed by {workers} workers')
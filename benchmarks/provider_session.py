@@ -0,0 +1,86 @@
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import List, Dict, Callable
+
+import requests
+
+from bsvlib.constants import THREAD_POOL_MAX_EXECUTORS
+from bsvlib.service.provider import Provider, BroadcastResult
+
+#
+# call a local stand-in of the service, each new connection is delayed as TCP and TLS handshakes to a remote host would be
+# compare a new connection every call, as module level requests.get does, with the connections kept alive by the provider session
+#
+CALLS = 500
+# round trips of the handshakes, in seconds
+HANDSHAKE = 0.01
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request = super().get_request()
+        time.sleep(HANDSHAKE)
+        return request
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # headers and body are written separately, don't let them wait for delayed acks on a kept alive connection
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        payload = json.dumps([{'tx_hash': '00' * 32, 'tx_pos': 0, 'value': 1000, 'height': 1}]).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class LocalProvider(Provider):
+
+    def get_unspents(self, **kwargs) -> List[Dict]:
+        return self.get(url=kwargs['url'])
+
+    def get_balance(self, **kwargs) -> int:  # pragma: no cover
+        return 0
+
+    def broadcast(self, raw: str) -> BroadcastResult:  # pragma: no cover
+        return BroadcastResult(True, raw)
+
+
+def bench(name: str, call: Callable[[int], None], workers: int) -> None:
+    latencies = [0.0] * CALLS
+
+    def timed(i: int) -> None:
+        start = time.perf_counter()
+        call(i)
+        latencies[i] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(timed, range(CALLS)))
+    seconds = time.perf_counter() - start
+    latencies.sort()
+    print(f'  {name:<20} {CALLS / seconds:8.1f} calls/s  median {latencies[CALLS // 2] * 1000:7.2f} ms  p99 {latencies[CALLS * 99 // 100] * 1000:7.2f} ms')
+
+
+if __name__ == '__main__':
+    server = Server(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_port}/unspent'
+    provider = LocalProvider()
+    for workers in [1, int(sys.argv[1]) if len(sys.argv) > 1 else THREAD_POOL_MAX_EXECUTORS]:
+        print(f'{CALLS} calls from {workers} threads, {HANDSHAKE * 1000:.0f} ms to set up a connection')
+        bench('requests.get', lambda _: requests.get(url, timeout=30).json(), workers)
+        bench('provider session', lambda _: provider.get_unspents(url=url), workers)
+    server.shutdown()
@@ -0,0 +1,37 @@
+import timeit
+
+from bsvlib.constants import OP
+from bsvlib.script.interpreter import Interpreter, ScriptLimits
+from bsvlib.utils import encode_int, encode_pushdata
+
+#
+# evaluate large arithmetic and hashing scripts, report executed opcodes per second
+#
+REPEAT = 5
+LIMITS = ScriptLimits(max_ops=10 * 1000 * 1000)
+
+
+def arithmetic_script(rounds: int) -> bytes:
+    # (x + 3) * 7 - 5 repeatedly on a growing number, then compare with itself
+    body = (encode_int(3) + OP.OP_ADD + encode_int(7) + OP.OP_MUL + encode_int(5) + OP.OP_SUB) * rounds
+    return encode_int(1) + body + OP.OP_DUP + OP.OP_NUMEQUAL
+
+
+def hashing_script(rounds: int) -> bytes:
+    return encode_pushdata(bytes(1024)) + (OP.OP_SHA256 + OP.OP_DUP + OP.OP_CAT + OP.OP_HASH256) * rounds + OP.OP_SIZE
+
+
+def stack_script(rounds: int) -> bytes:
+    return OP.OP_1 + OP.OP_2 + (OP.OP_2DUP + OP.OP_SWAP + OP.OP_ROT + OP.OP_2DROP + OP.OP_1ADD) * rounds
+
+
+def run(name: str, script: bytes, ops: int) -> None:
+    interpreter = Interpreter(limits=LIMITS)
+    best = min(timeit.repeat(lambda: interpreter.evaluate(script), number=1, repeat=REPEAT))
+    print(f'{name:<12} {len(script):>9} bytes, {ops:>8} ops, {best * 1000:8.1f} ms, {ops / best:12.0f} ops/s')
+
+
+if __name__ == '__main__':
+    run('arithmetic', arithmetic_script(20000), 20000 * 6 + 2)
+    run('hashing', hashing_script(20000), 20000 * 4 + 1)
+    run('stack', stack_script(100000), 100000 * 5)
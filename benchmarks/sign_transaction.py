@@ -0,0 +1,37 @@
+import os
+import sys
+import time
+
+from bsvlib import Key, Transaction, Unspent, TxOutput
+
+#
+# sign a consolidation transaction with many inputs, in the current process and across process pools of growing size
+# scaling is bounded by the number of CPUs available, which is printed first
+#
+INPUTS = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+WORKERS = [1, 2, 4, 8, 16]
+REPEAT = 3
+
+
+def build_transaction(keys) -> Transaction:
+    t = Transaction()
+    for i in range(INPUTS):
+        t.add_input(Unspent(txid=i.to_bytes(32, 'big').hex(), vout=0, satoshi=1000, private_keys=[keys[i % len(keys)]]))
+    t.add_output(TxOutput(keys[0].address(), INPUTS * 1000 - 100000))
+    return t
+
+
+if __name__ == '__main__':
+    print(f'cpus: {os.cpu_count()}, inputs: {INPUTS}')
+    keys = [Key() for _ in range(10)]
+    baseline = None
+    for workers in WORKERS:
+        elapsed = []
+        for _ in range(REPEAT):
+            t = build_transaction(keys)
+            start = time.perf_counter()
+            t.sign(workers=workers)
+            elapsed.append(time.perf_counter() - start)
+        best = min(elapsed)
+        baseline = baseline or best
+        print(f'workers {workers:>2}: {best * 1000:8.1f} ms, {INPUTS / best:8.0f} inputs/s, speedup {baseline / best:.2f}x')
@@ -0,0 +1,74 @@
+import gc
+import sys
+import tracemalloc
+from typing import Callable, List
+
+from bsvlib import Key, Unspent, TxInput
+from bsvlib.script import Script, P2pkhScriptType
+
+#
+# memory held by unspents of one wallet address, compare with the dict-backed classes used before
+#
+COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+
+class LegacyUnspent:
+    """
+    how Unspent was laid out before, a dict-backed object with its own locking script
+    """
+
+    def __init__(self, **kwargs):
+        self.txid = kwargs.get('txid')
+        self.vout = int(kwargs.get('vout'))
+        self.satoshi = int(kwargs.get('satoshi'))
+        self.height = -1 if kwargs.get('height') is None else kwargs.get('height')
+        self.confirmations = 0 if kwargs.get('confirmations') is None else kwargs.get('confirmations')
+        self.private_keys = kwargs.get('private_keys') if kwargs.get('private_keys') else []
+        self.address = kwargs.get('address')
+        self.script_type = P2pkhScriptType()
+        self.locking_script = LegacyScript(P2pkhScriptType.locking(self.address).serialize())
+
+
+class LegacyScript:
+
+    def __init__(self, script: bytes):
+        self.script = script
+
+
+class LegacyTxInput:
+
+    def __init__(self, unspent):
+        self.txid = unspent.txid
+        self.vout = unspent.vout
+        self.satoshi = unspent.satoshi
+        self.height = unspent.height
+        self.confirmations = unspent.confirmations
+        self.private_keys = unspent.private_keys
+        self.script_type = unspent.script_type
+        self.locking_script = unspent.locking_script
+        self.unlocking_script = None
+        self.sequence = 0xffffffff
+        self.sighash = 0x41
+
+
+def measure(name: str, create: Callable[[int], object]) -> List:
+    gc.collect()
+    tracemalloc.start()
+    objects = [create(i) for i in range(COUNT)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'{name:<24} {current / COUNT:8.1f} bytes per object')
+    return objects
+
+
+if __name__ == '__main__':
+    address = Key().address()
+    # txid strings are created outside of the measurement, they are the same in both layouts
+    txids = [i.to_bytes(32, 'big').hex() for i in range(COUNT)]
+    print(f'{COUNT} unspents of one address')
+    legacy = measure('Unspent (legacy)', lambda i: LegacyUnspent(txid=txids[i], vout=0, satoshi=1000 + i, address=address))
+    unspents = measure('Unspent (__slots__)', lambda i: Unspent(txid=txids[i], vout=0, satoshi=1000 + i, address=address))
+    measure('TxInput (legacy)', lambda i: LegacyTxInput(legacy[i]))
+    measure('TxInput (__slots__)', lambda i: TxInput(unspents[i]))
+    measure('Script (legacy)', lambda i: LegacyScript(b''))
+    measure('Script (__slots__)', lambda i: Script(b''))
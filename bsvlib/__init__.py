@@ -1,6 +1,10 @@
 from .aes import InvalidPadding
+from .chain_builder import ChainBuilder
+from .coin_selection import UnspentPool, CoinSelector, LargestFirst, OldestFirst, Knapsack, BranchAndBound
 from .keys import verify_signed_text, Key, PublicKey, PrivateKey
-from .transaction import TxInput, TxOutput, Transaction, Unspent, InsufficientFunds
+from .merkle import merkle_root, MerkleProof, verify_merkle_proofs
+from .payout import create_payouts, create_fan_outs
+from .transaction import TxInput, TxOutput, Transaction, Outpoint, Unspent, UnspentSet, InsufficientFunds, OpReturnExtractor
 from .wallet import Wallet, create_transaction
 
 __version__ = '0.10.0'
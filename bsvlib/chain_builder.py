@@ -0,0 +1,167 @@
+from typing import List, Optional, Iterable, Dict, Tuple, Union
+
+from .constants import Chain
+from .keys import PrivateKey
+from .service.provider import Provider
+from .transaction.outpoint import Outpoint
+from .transaction.transaction import Transaction, TxInput, TxOutput, InsufficientFunds
+from .transaction.unspent import Unspent
+
+
+class ChainBuilder:
+    """
+    build transactions spending change of unconfirmed transactions built before, without asking the service in between
+    unconfirmed transactions and their spendable outputs are tracked locally, outputs are bucketed by the ancestor depth of their transaction
+    so handing out a spendable output is O(1), and so is checking that a new transaction stays within the ancestor depth
+    """
+
+    def __init__(self, unspents: Optional[Iterable[Unspent]] = None, max_depth: int = 25, fee_rate: Optional[float] = None,
+                 chain: Optional[Chain] = None, provider: Optional[Provider] = None, **kwargs):
+        """
+        :param unspents: confirmed unspents to start with
+        :param max_depth: most unconfirmed transactions chained one after another, the first one spending confirmed unspents only is of depth 1
+        """
+        assert max_depth > 0, 'max_depth must be positive'
+        self.max_depth: int = max_depth
+        self.fee_rate: Optional[float] = fee_rate
+        self.chain: Optional[Chain] = chain
+        self.provider: Optional[Provider] = provider
+        self.kwargs: Dict = dict(**kwargs) or {}
+        # unconfirmed transactions in the order they're added, which is topological as one can only spend outputs of those before it
+        self._transactions: Dict[bytes, Transaction] = {}
+        # ancestor depth of each unconfirmed transaction by txid in internal byte order, confirmed ones are of depth 0
+        self._depths: Dict[bytes, int] = {}
+        # spendable outputs of depth 0 to max_depth - 1, then those of max_depth which can't be spent until some ancestor confirms
+        self._buckets: List[Dict[Outpoint, Unspent]] = [{} for _ in range(max_depth + 1)]
+        # transactions emitted for broadcasting so far
+        self._emitted: int = 0
+        if unspents:
+            self.add_many(unspents)
+
+    def _depth(self, outpoint: Outpoint) -> int:
+        return self._depths.get(outpoint.txid_bytes, 0)
+
+    def add(self, unspent: Unspent) -> None:
+        self._buckets[self._depth(unspent.outpoint)][unspent.outpoint] = unspent
+
+    def add_many(self, unspents: Iterable[Unspent]) -> None:
+        for unspent in unspents:
+            self.add(unspent)
+
+    def __len__(self) -> int:
+        """
+        :returns: number of outputs spendable within the ancestor depth
+        """
+        return sum([len(bucket) for bucket in self._buckets[:-1]])
+
+    def __contains__(self, o: object) -> bool:
+        outpoint = o.outpoint if isinstance(o, Unspent) else o
+        return isinstance(outpoint, Outpoint) and outpoint in self._buckets[self._depth(outpoint)]
+
+    def total(self) -> int:
+        """
+        :returns: satoshi spendable within the ancestor depth
+        """
+        return sum([unspent.satoshi for bucket in self._buckets[:-1] for unspent in bucket.values()])
+
+    def take(self) -> Unspent:
+        """
+        hand out a spendable output, the shallowest first, then the latest added
+        :raises InsufficientFunds: if no output is spendable within the ancestor depth
+        """
+        for bucket in self._buckets[:-1]:
+            if bucket:
+                return bucket.popitem()[1]
+        raise InsufficientFunds(f'no output spendable within ancestor depth {self.max_depth}')
+
+    def depth(self, txid: str) -> int:
+        """
+        :returns: ancestor depth of transaction txid, 0 if it's not an unconfirmed transaction added
+        """
+        return self._depths.get(bytes.fromhex(txid)[::-1], 0)
+
+    def add_transaction(self, t: Transaction) -> Transaction:
+        """
+        add a signed transaction, the outputs it spends are no longer spendable
+        outputs paying back to the keys of its inputs become spendable
+        :raises ValueError: if the transaction would be beyond the ancestor depth
+        """
+        depth = 1 + max([self._depth(tx_input.outpoint) for tx_input in t.tx_inputs], default=0)
+        if depth > self.max_depth:
+            raise ValueError(f'transaction would be of ancestor depth {depth}, beyond {self.max_depth}')
+        for tx_input in t.tx_inputs:
+            self._buckets[self._depth(tx_input.outpoint)].pop(tx_input.outpoint, None)
+        # txid is computed once for all the outputs
+        txid_bytes = bytes.fromhex(t.txid())[::-1]
+        self._transactions[txid_bytes] = t
+        self._depths[txid_bytes] = depth
+        keys: Dict[bytes, List[PrivateKey]] = {tx_input.locking_script.serialize(): tx_input.private_keys for tx_input in t.tx_inputs if tx_input.private_keys}
+        bucket = self._buckets[depth]
+        for vout, tx_output in enumerate(t.tx_outputs):
+            private_keys = keys.get(tx_output.locking_script.serialize())
+            if private_keys:
+                outpoint = Outpoint(txid_bytes, vout)
+                bucket[outpoint] = Unspent(outpoint=outpoint, satoshi=tx_output.satoshi, script_type=tx_output.script_type,
+                                           locking_script=tx_output.locking_script, private_keys=private_keys)
+        return t
+
+    def create_transaction(self, outputs: Optional[List[Tuple]] = None, leftover: Optional[str] = None,
+                           pushdatas: Optional[List[Union[str, bytes]]] = None, **kwargs) -> Transaction:
+        """create, sign and add a transaction spending outputs handed out
+        :param outputs: list of tuple (address, satoshi)
+        :param leftover: transaction change address, the address of the first P2PKH input if None so that change stays spendable
+        :param pushdatas: list of OP_RETURN pushdata
+        :param kwargs: passing to create transaction
+        :raises InsufficientFunds: if outputs spendable within the ancestor depth are not enough, then nothing is changed
+        """
+        t = Transaction(fee_rate=self.fee_rate, chain=self.chain, provider=self.provider, **{**self.kwargs, **kwargs})
+        if pushdatas:
+            t.add_output(TxOutput(pushdatas))
+        if outputs:
+            t.add_outputs([TxOutput(output[0], output[1]) for output in outputs])
+        picked: List[Unspent] = []
+        while t.fee() < t.estimated_fee() or not t.tx_inputs:
+            try:
+                picked.append(self.take())
+            except InsufficientFunds:
+                required, available = t.estimated_fee() + t.satoshi_total_out(), t.satoshi_total_in()
+                self.add_many(picked)
+                raise InsufficientFunds(f'require {required} satoshi but only {available} spendable within ancestor depth {self.max_depth}')
+            t.add_input(TxInput(picked[-1]))
+        t.add_change(leftover)
+        t.sign()
+        return self.add_transaction(t)
+
+    def confirm(self, txids: Iterable[str]) -> None:
+        """
+        forget transactions confirmed, then the depth of their descendants and outputs is brought down
+        """
+        confirmed = [txid_bytes for txid_bytes in [bytes.fromhex(txid)[::-1] for txid in txids] if txid_bytes in self._transactions]
+        if not confirmed:
+            return
+        transactions = list(self._transactions.items())
+        emitted = {txid_bytes for txid_bytes, _ in transactions[:self._emitted]}
+        for txid_bytes in confirmed:
+            del self._transactions[txid_bytes]
+            del self._depths[txid_bytes]
+        self._emitted = len([txid_bytes for txid_bytes in self._transactions if txid_bytes in emitted])
+        unspents = [unspent for bucket in self._buckets for unspent in bucket.values()]
+        # parents come before children, so depths are recomputed in one pass
+        for txid_bytes, t in self._transactions.items():
+            self._depths[txid_bytes] = 1 + max([self._depth(tx_input.outpoint) for tx_input in t.tx_inputs], default=0)
+        self._buckets = [{} for _ in range(self.max_depth + 1)]
+        self.add_many(unspents)
+
+    def transactions(self) -> List[Transaction]:
+        """
+        :returns: unconfirmed transactions in topological order
+        """
+        return list(self._transactions.values())
+
+    def emit(self) -> List[Transaction]:
+        """
+        :returns: unconfirmed transactions not emitted before, in topological order, ready to broadcast one by one
+        """
+        transactions = self.transactions()[self._emitted:]
+        self._emitted += len(transactions)
+        return transactions
@@ -0,0 +1,449 @@
+import math
+import random
+from abc import ABCMeta, abstractmethod
+from bisect import bisect_left, bisect_right
+from typing import List, Optional, Iterable, Dict, Iterator, Tuple, Union
+
+from .constants import P2PKH_DUST_LIMIT
+from .transaction.outpoint import Outpoint
+from .transaction.transaction import Transaction, TxInput, InsufficientFunds
+from .transaction.unspent import Unspent
+from .transaction.unspent_set import UnspentSet
+
+# byte length of a P2PKH output, which is what a change output costs
+P2PKH_OUTPUT_BYTE_LENGTH: int = 34
+
+
+class FenwickTree:
+    """
+    binary indexed tree over a fixed number of slots, point update / prefix sum / search by prefix sum are all O(log n)
+    """
+
+    def __init__(self, values: List[int]):
+        # linear construction, tree[i] covers the slots (i - lowbit(i), i]
+        self.size: int = len(values)
+        self.tree: List[int] = [0] + list(values)
+        for i in range(1, self.size + 1):
+            parent = i + (i & -i)
+            if parent <= self.size:
+                self.tree[parent] += self.tree[i]
+        self.step: int = 1 << (self.size.bit_length() - 1) if self.size else 0
+
+    def add(self, slot: int, delta: int) -> None:
+        i = slot + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix(self, end: int) -> int:
+        """
+        :returns: sum of slots [0, end)
+        """
+        total, i = 0, end
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def search(self, k: int) -> int:
+        """
+        only for non-negative values
+        :returns: the lowest slot where the prefix sum through it reaches k, k starts from 1
+        """
+        position, step = 0, self.step
+        while step:
+            if position + step <= self.size and self.tree[position + step] < k:
+                position += step
+                k -= self.tree[position]
+            step >>= 1
+        return position
+
+
+class UnspentPool:
+    """
+    unspents indexed by satoshi, which are taken out and put back in O(log n)
+    positions are the ranks of unspents sorted by satoshi, they stay the same until more unspents are added
+    """
+
+    def __init__(self, unspents: Optional[Iterable[Unspent]] = None):
+        self._build(list(unspents or []))
+
+    def _build(self, unspents: List[Unspent]) -> None:
+        self._unspents: List[Unspent] = sorted(unspents, key=lambda unspent: unspent.satoshi)
+        self._satoshis: List[int] = [unspent.satoshi for unspent in self._unspents]
+        self._positions: Dict[Outpoint, int] = {unspent.outpoint: position for position, unspent in enumerate(self._unspents)}
+        self._alive: bytearray = bytearray(b'\x01' * len(self._unspents))
+        self._counts: FenwickTree = FenwickTree([1] * len(self._unspents))
+        self._sums: FenwickTree = FenwickTree(self._satoshis)
+        # positions ordered from the oldest, built on first use
+        self._ages: Optional[Tuple[List[int], List[int], FenwickTree]] = None
+
+    def _take(self, position: int) -> Unspent:
+        assert self._alive[position], 'unspent already taken'
+        self._alive[position] = 0
+        self._counts.add(position, -1)
+        self._sums.add(position, -self._satoshis[position])
+        if self._ages:
+            self._ages[2].add(self._ages[1][position], -1)
+        return self._unspents[position]
+
+    def _put(self, position: int) -> None:
+        assert not self._alive[position], 'unspent already in pool'
+        self._alive[position] = 1
+        self._counts.add(position, 1)
+        self._sums.add(position, self._satoshis[position])
+        if self._ages:
+            self._ages[2].add(self._ages[1][position], 1)
+
+    def __len__(self) -> int:
+        return self._counts.prefix(len(self._unspents))
+
+    def __iter__(self) -> Iterator[Unspent]:
+        """
+        :returns: generator of unspents in ascending order of satoshi
+        """
+        for position, unspent in enumerate(self._unspents):
+            if self._alive[position]:
+                yield unspent
+
+    def __contains__(self, o: object) -> bool:
+        position = self._positions.get(o.outpoint) if isinstance(o, Unspent) else None
+        return position is not None and self._alive[position] == 1
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f'<UnspentPool count={len(self)} satoshi={self.total()}>'
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return self.__str__()
+
+    def total(self) -> int:
+        """
+        :returns: sum of satoshi
+        """
+        return self._sums.prefix(len(self._unspents))
+
+    def _count_below(self, satoshi: float) -> int:
+        """
+        :returns: number of unspents in pool whose satoshi is less than or equal to satoshi
+        """
+        return self._counts.prefix(bisect_right(self._satoshis, satoshi))
+
+    def _nth(self, n: int) -> int:
+        """
+        :returns: position of the n-th smallest unspent in pool, n starts from 1
+        """
+        return self._counts.search(n)
+
+    def _largest(self) -> Optional[int]:
+        count = len(self)
+        return self._nth(count) if count else None
+
+    def _ceiling(self, satoshi: float) -> Optional[int]:
+        """
+        :returns: position of the smallest unspent in pool whose satoshi is no less than satoshi
+        """
+        below = self._counts.prefix(bisect_left(self._satoshis, satoshi))
+        return self._nth(below + 1) if below < len(self) else None
+
+    def _oldest(self) -> Optional[int]:
+        if self._ages is None:
+            # confirmed from the lowest height, then those of unknown height from the most confirmations
+            order = sorted(range(len(self._unspents)), key=lambda p: (0, self._unspents[p].height) if self._unspents[p].height > 0 else (1, -self._unspents[p].confirmations))
+            ranks = [0] * len(order)
+            for rank, position in enumerate(order):
+                ranks[position] = rank
+            self._ages = order, ranks, FenwickTree([self._alive[position] for position in order])
+        order, _, counts = self._ages
+        return order[counts.search(1)] if len(self) else None
+
+    def add_many(self, unspents: Iterable[Unspent]) -> int:
+        """
+        add unspents to pool, those taken out before are put back in O(log n), new ones rebuild the index
+        :returns: number of unspents added
+        """
+        added, fresh = 0, {}
+        for unspent in unspents:
+            position = self._positions.get(unspent.outpoint)
+            if position is None:
+                fresh[unspent.outpoint] = unspent
+            elif not self._alive[position]:
+                self._put(position)
+                added += 1
+        if fresh:
+            # unspents taken out are dropped from the rebuilt index
+            self._build(list(self) + list(fresh.values()))
+        return added + len(fresh)
+
+    extend = add_many
+
+    def add(self, unspent: Unspent) -> bool:
+        return self.add_many([unspent]) == 1
+
+    def remove_many(self, unspents: Iterable[Unspent]) -> int:
+        """
+        :returns: number of unspents removed
+        """
+        removed = 0
+        for unspent in unspents:
+            position = self._positions.get(unspent.outpoint)
+            if position is not None and self._alive[position]:
+                self._take(position)
+                removed += 1
+        return removed
+
+    def pop(self) -> Unspent:
+        """
+        remove and return the largest unspent, so that an UnspentPool can be passed to create_transaction directly
+        """
+        position = self._largest()
+        if position is None:
+            raise IndexError('pop from empty UnspentPool')
+        return self._take(position)
+
+
+class CoinSelector(metaclass=ABCMeta):
+    """
+    strategy to pick unspents out of a pool to fund a transaction
+    """
+
+    def __init__(self, input_byte_length: Optional[int] = None):
+        """
+        :param input_byte_length: estimated byte length of a signed input, from the largest unspent in pool if None
+        """
+        self.input_byte_length: Optional[int] = input_byte_length
+
+    @abstractmethod
+    def _pick(self, pool: UnspentPool, t: Transaction) -> Iterable[int]:
+        """
+        :returns: positions in pool to spend, the iterable is consumed lazily and stops as soon as the transaction is funded
+        """
+        raise NotImplementedError('CoinSelector._pick')
+
+    def _costs(self, pool: UnspentPool, t: Transaction) -> Tuple[float, float]:
+        """
+        :returns: (satoshi still needed before adding any more inputs, fee of adding one input)
+        """
+        input_byte_length = self.input_byte_length
+        if input_byte_length is None:
+            largest = pool._largest()
+            unspent = pool._unspents[largest] if largest is not None else None
+            input_byte_length = 41 + unspent.script_type.estimated_unlocking_byte_length(private_keys=unspent.private_keys, **t.kwargs) if unspent else 148
+        # one more satoshi as the fee is rounded up
+        target = t.satoshi_total_out() - t.satoshi_total_in() + t.fee_rate * t.estimated_byte_length() + 1
+        return target, t.fee_rate * input_byte_length
+
+    def select(self, pool: UnspentPool, t: Transaction) -> List[Unspent]:
+        """
+        add inputs picked out of pool to transaction t, whose outputs are already set, until outputs and fee are covered
+        the strategy picks first, then it's topped up if needed, with the smallest unspent covering the shortfall if any, otherwise the largest
+        :returns: unspents picked, which are removed from pool
+        :raises InsufficientFunds: if the pool doesn't hold enough, then neither pool nor transaction is changed
+        """
+        picked: List[int] = []
+
+        def funded() -> bool:
+            return t.fee() >= t.estimated_fee()
+
+        def spend(position: int) -> None:
+            picked.append(position)
+            t.add_input(TxInput(pool._take(position)))
+
+        for position in self._pick(pool, t):
+            if funded():
+                break
+            spend(position)
+        while not funded() and len(pool):
+            _, input_fee = self._costs(pool, t)
+            position = pool._ceiling(t.estimated_fee() - t.fee() + input_fee)
+            spend(position if position is not None else pool._largest())
+        if not funded():
+            required, available = t.estimated_fee() + t.satoshi_total_out(), t.satoshi_total_in()
+            del t.tx_inputs[len(t.tx_inputs) - len(picked):]
+            for position in picked:
+                pool._put(position)
+            raise InsufficientFunds(f'require {required} satoshi but only {available}')
+        return [pool._unspents[position] for position in picked]
+
+
+class LargestFirst(CoinSelector):
+    """
+    spend the largest unspents first, fewest inputs but breaks big coins for small payments
+    """
+
+    def _pick(self, pool: UnspentPool, t: Transaction) -> Iterator[int]:
+        while True:
+            position = pool._largest()
+            if position is None:
+                return
+            yield position
+
+
+class OldestFirst(CoinSelector):
+    """
+    spend the unspents confirmed earliest first, the unconfirmed ones go last
+    """
+
+    def _pick(self, pool: UnspentPool, t: Transaction) -> Iterator[int]:
+        while True:
+            position = pool._oldest()
+            if position is None:
+                return
+            yield position
+
+
+class Knapsack(CoinSelector):
+    """
+    the classic stochastic approximation, an exact match or the smallest single unspent covering the target if any is no worse,
+    otherwise the best of random subsets among the unspents below the target
+    """
+
+    def __init__(self, input_byte_length: Optional[int] = None, max_candidates: int = 500, iterations: int = 100, seed: Optional[int] = None):
+        """
+        :param max_candidates: at most this number of unspents below the target, sampled at random, are tried in subsets
+        :param iterations: rounds of random subsets
+        :param seed: seed of the random generator, for reproducible selections
+        """
+        super().__init__(input_byte_length)
+        self.max_candidates: int = max_candidates
+        self.iterations: int = iterations
+        self.random: random.Random = random.Random(seed)
+
+    def _pick(self, pool: UnspentPool, t: Transaction) -> List[int]:
+        target, input_fee = self._costs(pool, t)
+        if target <= 0:
+            return []
+        lowest_larger = pool._ceiling(target + input_fee)
+        if lowest_larger is not None and pool._satoshis[lowest_larger] - input_fee < target + 1:
+            return [lowest_larger]
+        # unspents below the target whose value covers the fee of spending them, a random sample of them if there are too many
+        count, worthless = pool._count_below(target + input_fee), pool._count_below(input_fee)
+        ranks = range(worthless + 1, count + 1)
+        if len(ranks) > self.max_candidates:
+            ranks = self.random.sample(ranks, self.max_candidates)
+        candidates = [pool._nth(n) for n in sorted(ranks, reverse=True)]
+        values = [pool._satoshis[position] - input_fee for position in candidates]
+        total = sum(values)
+        if total < target:
+            return [lowest_larger] if lowest_larger is not None else candidates
+        if total < target + 1:
+            return candidates
+        best, best_total = self._approximate_best_subset(values, target, total)
+        if lowest_larger is not None and pool._satoshis[lowest_larger] - input_fee <= best_total:
+            return [lowest_larger]
+        return [position for position, included in zip(candidates, best) if included]
+
+    def _approximate_best_subset(self, values: List[float], target: float, total: float) -> Tuple[List[bool], float]:
+        best, best_total = [True] * len(values), total
+        for _ in range(self.iterations):
+            if best_total < target + 1:
+                break
+            included, subtotal, reached = [False] * len(values), 0.0, False
+            for rounds in range(2):
+                if reached:
+                    break
+                for i, value in enumerate(values):
+                    # randomly in the first round, then whatever left out in the second round
+                    if (self.random.random() < 0.5) if rounds == 0 else not included[i]:
+                        subtotal += value
+                        included[i] = True
+                        if subtotal >= target:
+                            reached = True
+                            if subtotal < best_total:
+                                best, best_total = included[:], subtotal
+                            subtotal -= value
+                            included[i] = False
+        return best, best_total
+
+
+class BranchAndBound(CoinSelector):
+    """
+    depth-first search for a set of unspents which covers the target without leaving enough for a change output,
+    so the transaction pays no dust change, falls back to another strategy if there isn't one found in time
+    """
+
+    def __init__(self, input_byte_length: Optional[int] = None, max_tries: int = 100000, fallback: Optional[CoinSelector] = None):
+        """
+        :param max_tries: number of search steps before giving up
+        :param fallback: strategy used if no match is found, Knapsack if None
+        """
+        super().__init__(input_byte_length)
+        self.max_tries: int = max_tries
+        self.fallback: CoinSelector = fallback or Knapsack(input_byte_length)
+
+    def _pick(self, pool: UnspentPool, t: Transaction) -> Iterable[int]:
+        target, input_fee = self._costs(pool, t)
+        if target <= 0:
+            return []
+        # anything left beyond this would rather be paid back in a change output
+        cost_of_change = t.fee_rate * P2PKH_OUTPUT_BYTE_LENGTH + P2PKH_DUST_LIMIT
+        match = self._search(pool, target, target + cost_of_change, input_fee)
+        return match if match is not None else self.fallback._pick(pool, t)
+
+    def _search(self, pool: UnspentPool, target: float, upper: float, input_fee: float) -> Optional[List[int]]:
+        """
+        candidates are unspents whose value, that is satoshi minus the fee of spending it, is within (0, upper), visited in descending order
+        :returns: positions of the match with the least excess, None if not found
+        """
+        top, worthless = pool._count_below(math.ceil(upper + input_fee) - 1), pool._count_below(input_fee)
+        size = top - worthless
+        if size <= 0:
+            return None
+        # value of all the candidates, then candidates are looked up lazily as the search goes deeper
+        total = pool._sums.prefix(pool._nth(top) + 1) - pool._sums.prefix(bisect_right(pool._satoshis, input_fee)) - size * input_fee
+        positions: List[int] = []
+        values: List[float] = []
+        # cumulative[k] is the value of candidates before k
+        cumulative: List[float] = [0.0]
+
+        def value(k: int) -> float:
+            while len(values) <= k:
+                positions.append(pool._nth(top - len(positions)))
+                values.append(pool._satoshis[positions[-1]] - input_fee)
+                cumulative.append(cumulative[-1] + values[-1])
+            return values[k]
+
+        selection: List[int] = []
+        best: Optional[List[int]] = None
+        best_excess, current, k = upper - target, 0.0, 0
+        for _ in range(self.max_tries):
+            if current >= target:
+                # a match, then try the branches without the last one for a smaller excess
+                if current - target < best_excess:
+                    best, best_excess = selection[:], current - target
+                    if best_excess < 1:
+                        break
+                backtrack = True
+            elif k >= size:
+                backtrack = True
+            else:
+                # value of candidates from k to the end is not enough
+                backtrack = current + total - cumulative[k] < target
+            if not backtrack:
+                v = value(k)
+                if current + v < upper:
+                    selection.append(k)
+                    current += v
+                # otherwise it overshoots, skip it and try the smaller ones
+                k += 1
+                continue
+            if not selection:
+                break
+            last = selection.pop()
+            current -= values[last]
+            k = last + 1
+            # branches starting from a candidate of the same satoshi as the one just left out were explored already
+            while k < size and value(k) == values[last]:
+                k += 1
+        return None if best is None else [positions[k] for k in best]
+
+
+def discard_spent(unspents: Union[List[Unspent], UnspentSet, UnspentPool], pool: UnspentPool, spent: List[Union[Unspent, Outpoint]]) -> None:
+    """
+    remove unspents spent out of pool, given either as unspents or outpoints, from the unspents pool was built on
+    nothing to do if pool is the unspents themselves
+    """
+    if isinstance(unspents, UnspentSet):
+        unspents.remove_many(spent)
+    elif pool is not unspents:
+        spent = {item.outpoint if isinstance(item, Unspent) else item for item in spent}
+        unspents[:] = [unspent for unspent in unspents if unspent.outpoint not in spent]
@@ -9,6 +9,9 @@ TRANSACTION_FEE_RATE: float = float(os.getenv('BSVLIB_TRANSACTION_FEE_RATE') or
 P2PKH_DUST_LIMIT: int = int(os.getenv('BSVLIB_P2PKH_DUST_LIMIT') or 135)
 HTTP_REQUEST_TIMEOUT: int = int(os.getenv('BSVLIB_HTTP_REQUEST_TIMEOUT') or 30)
 THREAD_POOL_MAX_EXECUTORS: int = int(os.getenv('BSVLIB_THREAD_POOL_MAX_EXECUTORS') or 10)
+# number of hosts to keep a connection pool for, and number of connections kept alive in each
+HTTP_POOL_CONNECTIONS: int = int(os.getenv('BSVLIB_HTTP_POOL_CONNECTIONS') or 10)
+HTTP_POOL_MAXSIZE: int = int(os.getenv('BSVLIB_HTTP_POOL_MAXSIZE') or THREAD_POOL_MAX_EXECUTORS)
 BIP39_ENTROPY_BIT_LENGTH: int = int(os.getenv('BSVLIB_BIP39_ENTROPY_BIT_LENGTH') or 128)
 BIP44_DERIVATION_PATH = os.getenv('BSVLIB_BIP44_DERIVATION_PATH') or "m/44'/236'/0'"
 
@@ -36,6 +39,11 @@ class SIGHASH(int, Enum):
 
 NUMBER_BYTE_LENGTH: int = 32
 
+#
+# BIP-239 transaction extended format
+#
+TRANSACTION_EXTENDED_FORMAT_MARKER: bytes = b'\x00\x00\x00\x00\x00\xef'
+
 #
 # P2PKH address
 #
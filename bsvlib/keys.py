@@ -1,7 +1,7 @@
 import hashlib
 import hmac
 from base64 import b64encode, b64decode
-from typing import Optional, Union, Callable, Tuple
+from typing import Optional, Union, Callable, Tuple, List, Iterable, Dict
 
 from coincurve import PrivateKey as CcPrivateKey, PublicKey as CcPublicKey
 
@@ -206,6 +206,17 @@ class PrivateKey:
         """
         return self.key.sign(message, hasher)
 
+    def sign_many(self, digests: Iterable[bytes], prehashed: bool = True) -> List[bytes]:
+        """
+        sign in a tight loop, coincurve is never called back into a Python hasher
+        :param digests: 32-byte hashes to sign if prehashed, otherwise messages which are hash256-ed here first
+        :returns: ECDSA signatures in bitcoin strict DER (low-s) format, in the same order as digests
+        """
+        sign = self.key.sign
+        if prehashed:
+            return [sign(digest, None) for digest in digests]
+        return [sign(hash256(digest), None) for digest in digests]
+
     def verify(self, signature: bytes, message: bytes, hasher: Optional[Callable[[bytes], bytes]] = hash256) -> bool:
         """
         verify ECDSA signature in bitcoin strict DER (low-s) format
@@ -320,4 +331,21 @@ def recover_public_key(signature: bytes, message: bytes, hasher: Optional[Callab
     return PublicKey(CcPublicKey.from_signature_and_message(signature, message, hasher))
 
 
+def sign_many(pairs: Iterable[Tuple[PrivateKey, bytes]], prehashed: bool = True) -> List[bytes]:
+    """
+    sign many (private key, digest) pairs, digests of the same private key are signed together through PrivateKey.sign_many
+    :returns: ECDSA signatures in bitcoin strict DER (low-s) format, in the same order as pairs
+    """
+    pairs = list(pairs)
+    # id(private key) -> (private key, positions of its digests in pairs)
+    groups: Dict[int, Tuple[PrivateKey, List[int]]] = {}
+    for position, (private_key, _) in enumerate(pairs):
+        groups.setdefault(id(private_key), (private_key, []))[1].append(position)
+    signatures: List[Optional[bytes]] = [None] * len(pairs)
+    for private_key, positions in groups.values():
+        for position, signature in zip(positions, private_key.sign_many([pairs[position][1] for position in positions], prehashed)):
+            signatures[position] = signature
+    return signatures
+
+
 Key = PrivateKey
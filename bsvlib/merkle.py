@@ -0,0 +1,222 @@
+from typing import List, Optional, Union, Dict, Tuple, Iterable, Any
+
+from .hash import hash256
+from .transaction.transaction import TransactionReader
+from .utils import unsigned_to_varint
+
+#
+# TSC Merkle proof standard https://tsc.bitcoinassociation.net/standards/merkle-proof-standardised-format/
+#
+MERKLE_PROOF_FLAG_TX: int = 0x01
+MERKLE_PROOF_FLAG_TARGET_MASK: int = 0x06
+MERKLE_PROOF_FLAG_TREE: int = 0x08
+MERKLE_PROOF_FLAG_COMPOSITE: int = 0x10
+
+MERKLE_PROOF_TARGET_TYPES: Dict[int, str] = {0x00: 'hash', 0x02: 'header', 0x04: 'merkleRoot'}
+MERKLE_PROOF_TARGET_FLAGS: Dict[str, int] = {v: k for k, v in MERKLE_PROOF_TARGET_TYPES.items()}
+
+MERKLE_PROOF_NODE_HASH: int = 0x00
+MERKLE_PROOF_NODE_DUPLICATE: int = 0x01
+
+
+def merkle_parent(left: bytes, right: bytes) -> bytes:
+    """
+    :returns: parent node of two nodes, all in internal byte order
+    """
+    return hash256(left + right)
+
+
+def merkle_root(txids: List[str]) -> str:
+    """
+    compute the merkle root of a block, level by level, the last node is paired with itself when the level has odd nodes
+    :param txids: txids of all the transactions in block order
+    """
+    assert txids, 'empty txids'
+    level: List[bytes] = [bytes.fromhex(txid)[::-1] for txid in txids]
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [hash256(level[i] + level[i + 1]) for i in range(0, len(level), 2)]
+    return level[0][::-1].hex()
+
+
+class MerkleProof:
+
+    def __init__(self, index: int, txid: str, nodes: List[Optional[bytes]], target: bytes, target_type: str = 'merkleRoot', tx: Optional[bytes] = None):
+        """
+        :param index: index of the transaction in block
+        :param txid: txid in hex string
+        :param nodes: sibling nodes from bottom to top in internal byte order, None if the sibling duplicates the current node
+        :param target: block hash or merkle root in internal byte order, or serialized block header, according to target type
+        :param target_type: 'hash', 'header' or 'merkleRoot'
+        :param tx: the full transaction if it is included in proof
+        """
+        assert target_type in MERKLE_PROOF_TARGET_FLAGS, f'unknown target type {target_type}'
+        assert len(target) == (80 if target_type == 'header' else 32), 'invalid byte length of target'
+        self.index: int = index
+        self.txid: str = txid
+        self.nodes: List[Optional[bytes]] = nodes
+        self.target: bytes = target
+        self.target_type: str = target_type
+        self.tx: Optional[bytes] = tx
+
+    def merkle_root(self) -> str:
+        """
+        :returns: merkle root computed from txid and nodes
+        """
+        current, position = bytes.fromhex(self.txid)[::-1], self.index
+        for node in self.nodes:
+            sibling = current if node is None else node
+            current = merkle_parent(sibling, current) if position & 1 else merkle_parent(current, sibling)
+            position >>= 1
+        return current[::-1].hex()
+
+    def expected_merkle_root(self) -> Optional[str]:
+        """
+        :returns: merkle root given by target, None if target is block hash
+        """
+        if self.target_type == 'merkleRoot':
+            return self.target[::-1].hex()
+        if self.target_type == 'header':
+            return self.target[36:68][::-1].hex()
+        return None
+
+    def _well_formed(self) -> bool:
+        if self.tx is not None and hash256(self.tx)[::-1].hex() != self.txid:
+            return False
+        # the index must fit in the tree, and a duplicated sibling is only possible for the last node of a level which is always on the left
+        return self.index >> len(self.nodes) == 0 and all([node is not None or not (self.index >> level) & 1 for level, node in enumerate(self.nodes)])
+
+    def verify(self, merkle_root: Optional[str] = None) -> bool:
+        """
+        :param merkle_root: verify against this merkle root, which is required if target is block hash, otherwise the one of target
+        """
+        expected = merkle_root or self.expected_merkle_root()
+        if expected is None:
+            raise ValueError('merkle root is required to verify a proof targets block hash')
+        return self._well_formed() and self.merkle_root() == expected
+
+    def serialize(self) -> bytes:
+        flags = MERKLE_PROOF_TARGET_FLAGS[self.target_type] | (MERKLE_PROOF_FLAG_TX if self.tx is not None else 0)
+        proof = flags.to_bytes(1, 'little') + unsigned_to_varint(self.index)
+        proof += unsigned_to_varint(len(self.tx)) + self.tx if self.tx is not None else bytes.fromhex(self.txid)[::-1]
+        proof += self.target + unsigned_to_varint(len(self.nodes))
+        for node in self.nodes:
+            proof += MERKLE_PROOF_NODE_DUPLICATE.to_bytes(1, 'little') if node is None else MERKLE_PROOF_NODE_HASH.to_bytes(1, 'little') + node
+        return proof
+
+    def hex(self) -> str:
+        return self.serialize().hex()
+
+    def to_json(self) -> Dict[str, Any]:
+        target = self.target.hex() if self.target_type == 'header' else self.target[::-1].hex()
+        return {
+            'index': self.index,
+            'txOrId': self.tx.hex() if self.tx is not None else self.txid,
+            'targetType': self.target_type,
+            'target': target,
+            'nodes': ['*' if node is None else node[::-1].hex() for node in self.nodes],
+        }
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f'<MerkleProof txid={self.txid} index={self.index} nodes={len(self.nodes)}>'
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return self.__str__()
+
+    @classmethod
+    def from_hex(cls, proof: Union[str, bytes]) -> 'MerkleProof':
+        """
+        parse TSC merkle proof in binary format, hashes are in internal byte order
+        """
+        reader = TransactionReader(proof)
+        flags = reader.read_int(1)
+        if flags & (MERKLE_PROOF_FLAG_TREE | MERKLE_PROOF_FLAG_COMPOSITE):
+            raise ValueError('only single merkle branch proof is supported')
+        target_type = MERKLE_PROOF_TARGET_TYPES.get(flags & MERKLE_PROOF_FLAG_TARGET_MASK)
+        if target_type is None:
+            raise ValueError(f'unknown target type in flags {flags:#04x}')
+        index = reader.read_varint()
+        tx: Optional[bytes] = reader.read_bytes(reader.read_varint()) if flags & MERKLE_PROOF_FLAG_TX else None
+        txid = hash256(tx)[::-1].hex() if tx is not None else reader.read_bytes(32)[::-1].hex()
+        target = reader.read_bytes(80 if target_type == 'header' else 32)
+        nodes: List[Optional[bytes]] = []
+        for _ in range(reader.read_varint()):
+            node_type = reader.read_int(1)
+            if node_type == MERKLE_PROOF_NODE_HASH:
+                nodes.append(reader.read_bytes(32))
+            elif node_type == MERKLE_PROOF_NODE_DUPLICATE:
+                nodes.append(None)
+            else:
+                raise ValueError(f'unsupported node type {node_type}')
+        return MerkleProof(index, txid, nodes, target, target_type, tx)
+
+    @classmethod
+    def from_json(cls, proof: Dict[str, Any]) -> 'MerkleProof':
+        """
+        parse TSC merkle proof in JSON format, hashes are in hex strings as displayed
+        """
+        if proof.get('proofType', 'branch') != 'branch' or proof.get('composite', False):
+            raise ValueError('only single merkle branch proof is supported')
+        target_type = proof.get('targetType', 'hash')
+        tx_or_id: str = proof['txOrId']
+        tx: Optional[bytes] = bytes.fromhex(tx_or_id) if len(tx_or_id) != 64 else None
+        txid = hash256(tx)[::-1].hex() if tx is not None else tx_or_id
+        target = bytes.fromhex(proof['target']) if target_type == 'header' else bytes.fromhex(proof['target'])[::-1]
+        nodes: List[Optional[bytes]] = [None if node == '*' else bytes.fromhex(node)[::-1] for node in proof['nodes']]
+        return MerkleProof(proof['index'], txid, nodes, target, target_type, tx)
+
+
+def _agrees(verified: Dict[Tuple[int, int], bytes], nodes: List[Optional[bytes]], level: int, position: int) -> bool:
+    """
+    :returns: True if nodes from level up are the siblings cached on the path of (level, position) to the root
+    """
+    for node in nodes[level:]:
+        known, sibling = verified.get((level, position)), verified.get((level, position ^ 1))
+        if known is None or sibling is None or sibling != (known if node is None else node):
+            return False
+        level, position = level + 1, position >> 1
+    # the proof reaches the root of the cached path
+    return (level, position) in verified and (level, position ^ 1) not in verified
+
+
+def verify_merkle_proofs(proofs: Iterable[MerkleProof], merkle_root: Optional[str] = None) -> List[bool]:
+    """
+    verify many merkle proofs, typically of transactions in the same block
+    nodes on a path already verified to the root are cached, then other proofs stop hashing as soon as they reach a pair of them
+    :param merkle_root: verify all the proofs against this merkle root, otherwise against the ones of their targets
+    :returns: verification result of each proof in order
+    """
+    # merkle root -> {(level, position): node} of the nodes known to be in the tree
+    verified_trees: Dict[str, Dict[Tuple[int, int], bytes]] = {}
+    results: List[bool] = []
+    for proof in proofs:
+        expected = merkle_root or proof.expected_merkle_root()
+        if expected is None:
+            raise ValueError('merkle root is required to verify a proof targets block hash')
+        if not proof._well_formed():
+            results.append(False)
+            continue
+        verified = verified_trees.setdefault(expected, {})
+        current, position = bytes.fromhex(proof.txid)[::-1], proof.index
+        path: List[Tuple[Tuple[int, int], bytes]] = []
+        result: Optional[bool] = None
+        for level, node in enumerate(proof.nodes):
+            sibling = current if node is None else node
+            known = verified.get((level, position))
+            if known == current and verified.get((level, position ^ 1)) == sibling and _agrees(verified, proof.nodes, level + 1, position >> 1):
+                # the rest of the path is known and the proof agrees on it, otherwise keep hashing to find out
+                result = True
+                break
+            path.append(((level, position), current))
+            path.append(((level, position ^ 1), sibling))
+            current = merkle_parent(sibling, current) if position & 1 else merkle_parent(current, sibling)
+            position >>= 1
+        else:
+            known = verified.get((len(proof.nodes), position))
+            result = current[::-1].hex() == expected and (known is None or known == current)
+            path.append(((len(proof.nodes), position), current))
+        if result:
+            verified.update(path)
+        results.append(result)
+    return results
@@ -0,0 +1,236 @@
+from typing import List, Optional, Iterable, Tuple, Dict, Union
+
+from .coin_selection import UnspentPool, CoinSelector, LargestFirst, P2PKH_OUTPUT_BYTE_LENGTH, discard_spent
+from .constants import Chain, P2PKH_DUST_LIMIT
+from .service.provider import Provider
+from .script.script import Script
+from .script.type import P2pkhScriptType
+from .transaction.transaction import Transaction, TxOutput, InsufficientFunds
+from .transaction.unspent import Unspent
+from .transaction.unspent_set import UnspentSet
+from .utils import unsigned_to_varint
+
+
+def payout_outputs(recipients: Iterable[Tuple[str, int]]) -> List[TxOutput]:
+    """
+    :param recipients: list of tuple (address, satoshi)
+    :returns: P2PKH outputs, each address is decoded once however many times it's paid, every output has its own locking script
+    """
+    script_type = P2pkhScriptType()
+    scripts: Dict[str, bytes] = {}
+    outputs: List[TxOutput] = []
+    for address, satoshi in recipients:
+        script = scripts.get(address)
+        if script is None:
+            script = scripts[address] = P2pkhScriptType.locking(address).serialize()
+        outputs.append(TxOutput(Script(script), satoshi, script_type))
+    return outputs
+
+
+def _batch_end(outputs: List[TxOutput], start: int, max_outputs: int, max_byte_length: Optional[int], reserved_byte_length: int) -> int:
+    """
+    :returns: end of the batch of outputs beginning at start, which is at least one output
+    """
+    # version, locktime and the input count
+    base_byte_length = 8 + 1 + reserved_byte_length
+    end, byte_length = start + 1, outputs[start].byte_length()
+    while end < len(outputs) and end - start < max_outputs:
+        output_byte_length = outputs[end].byte_length()
+        # output count includes change
+        if max_byte_length is not None and base_byte_length + len(unsigned_to_varint(end - start + 2)) + byte_length + output_byte_length > max_byte_length:
+            break
+        end, byte_length = end + 1, byte_length + output_byte_length
+    return end
+
+
+def split_outputs(outputs: List[TxOutput], max_outputs: int = 1000, max_byte_length: Optional[int] = None,
+                  reserved_byte_length: int = 0) -> List[List[TxOutput]]:
+    """
+    split outputs in order into batches, each of which pays at most max_outputs outputs
+    and, if max_byte_length is set, fits in a transaction of max_byte_length with reserved_byte_length left for inputs and change
+    a single output larger than the limit still gets a batch of its own
+    """
+    assert max_outputs > 0, 'max_outputs must be positive'
+    batches: List[List[TxOutput]] = []
+    start = 0
+    while start < len(outputs):
+        end = _batch_end(outputs, start, max_outputs, max_byte_length, reserved_byte_length)
+        batches.append(outputs[start:end])
+        start = end
+    return batches
+
+
+def _spendable(t: Transaction, vout: int) -> Optional[Unspent]:
+    """
+    :returns: output vout of signed transaction t as an unspent, if one of the inputs holds the keys to spend it
+    """
+    tx_output = t.tx_outputs[vout]
+    for tx_input in t.tx_inputs:
+        if tx_input.locking_script == tx_output.locking_script and tx_input.private_keys:
+            return t.to_unspent(vout, private_keys=tx_input.private_keys)
+    return None
+
+
+def _change_unspent(t: Transaction, payouts: int) -> Optional[Unspent]:
+    """
+    :returns: the change output of signed transaction t as an unspent, if it's there and spendable
+    """
+    return _spendable(t, len(t.tx_outputs) - 1) if len(t.tx_outputs) > payouts else None
+
+
+def spendable_unspents(transactions: List[Transaction]) -> List[Unspent]:
+    """
+    :returns: outputs of signed transactions which pay back to the keys of their inputs, as unspents
+    """
+    unspents: List[Unspent] = []
+    for t in transactions:
+        for vout in range(len(t.tx_outputs)):
+            unspent = _spendable(t, vout)
+            if unspent:
+                unspents.append(unspent)
+    return unspents
+
+
+def create_payouts(unspents: Union[List[Unspent], UnspentSet, UnspentPool], recipients: List[Tuple[str, int]], leftover: Optional[str] = None,
+                   fee_rate: Optional[float] = None, max_outputs: int = 1000, max_byte_length: Optional[int] = None,
+                   selector: Optional[CoinSelector] = None, sign: bool = True, workers: Optional[int] = None, chunksize: int = 256,
+                   chain: Optional[Chain] = None, provider: Optional[Provider] = None, **kwargs) -> List[Transaction]:
+    """create transactions paying a large recipient list, batch by batch
+    :param unspents: list of unspents, an UnspentSet or an UnspentPool, those spent are removed
+    :param recipients: list of tuple (address, satoshi)
+    :param leftover: change address of every transaction, the address of the first P2PKH input of each if None
+    :param fee_rate: default fee rate if None
+    :param max_outputs: most outputs paid by a transaction, change excluded
+    :param max_byte_length: most bytes of a signed transaction if set
+    :param selector: coin selection strategy, largest first if None
+    :param sign: sign the transactions if True
+    :param workers: sign across a process pool of this many worker processes if greater than 1
+    :param chunksize: number of signatures sent to a worker at a time
+    :param chain: network chain
+    :param provider: service provider
+    :param kwargs: passing to create transaction
+    :returns: transactions in dependency order, those spending the change of others come after them
+    when the unspents run out, batches built so far are signed together and their change funds the following ones
+    """
+    assert max_outputs > 0, 'max_outputs must be positive'
+    pool = unspents if isinstance(unspents, UnspentPool) else UnspentPool(unspents)
+    selector = selector or LargestFirst()
+    # batches are filled leaving room for one input and the change, then cut down to the most outputs that fit if they need more inputs
+    reserved_byte_length = (selector.input_byte_length or 148) + P2PKH_OUTPUT_BYTE_LENGTH
+    payouts = payout_outputs(recipients)
+    transactions: List[Transaction] = []
+    # batches built but not signed yet, which can't be spent from until signed
+    wave: List[Tuple[Transaction, int]] = []
+    spent: List[Unspent] = []
+    changes: List[Unspent] = []
+
+    def settle() -> None:
+        if sign:
+            Transaction.sign_all([t for t, _ in wave], workers=workers, chunksize=chunksize)
+            unspents_changed = [_change_unspent(t, count) for t, count in wave]
+            unspents_changed = [unspent for unspent in unspents_changed if unspent]
+            changes.extend(unspents_changed)
+            pool.add_many(unspents_changed)
+        transactions.extend([t for t, _ in wave])
+        wave.clear()
+
+    def build(start: int, end: int) -> Tuple[Transaction, List[Unspent]]:
+        t = Transaction(fee_rate=fee_rate, chain=chain, provider=provider, **kwargs).add_outputs(payouts[start:end])
+        picked = selector.select(pool, t)
+        return t.add_change(leftover), picked
+
+    def fits(t: Transaction) -> bool:
+        return max_byte_length is None or t.estimated_byte_length() <= max_byte_length
+
+    start = 0
+    while start < len(payouts):
+        end = _batch_end(payouts, start, max_outputs, max_byte_length, reserved_byte_length)
+        try:
+            t, picked = build(start, end)
+            if not fits(t) and end - start > 1:
+                # more inputs than room was left for, find the most outputs that fit and the rest begin the next batch
+                pool.add_many(picked)
+                low, high = start + 1, end - 1
+                while low < high:
+                    middle = (low + high + 1) // 2
+                    t, picked = build(start, middle)
+                    pool.add_many(picked)
+                    low, high = (middle, high) if fits(t) else (low, middle - 1)
+                end = low
+                t, picked = build(start, end)
+        except InsufficientFunds:
+            if sign and wave:
+                settle()
+                continue
+            # put the pool back as it was
+            pool.add_many(spent)
+            pool.remove_many(changes)
+            raise
+        spent.extend(picked)
+        wave.append((t, end - start))
+        start = end
+    settle()
+    discard_spent(unspents, pool, spent)
+    if pool is unspents:
+        pool.remove_many(changes)
+    return transactions
+
+
+def create_fan_outs(unspents: Union[List[Unspent], UnspentSet, UnspentPool], satoshi: int, count: Optional[int] = None,
+                    address: Optional[str] = None, fee_rate: Optional[float] = None, max_outputs: int = 1000, sign: bool = True,
+                    workers: Optional[int] = None, chunksize: int = 256, chain: Optional[Chain] = None, provider: Optional[Provider] = None,
+                    **kwargs) -> List[Transaction]:
+    """create transactions splitting unspents into outputs of the same satoshi, so that many transactions can spend them independently
+    :param unspents: list of unspents, an UnspentSet or an UnspentPool, those spent are removed
+    :param satoshi: value of each output split out, no less than P2PKH_DUST_LIMIT
+    :param count: number of outputs to split out, as many as unspents can afford if None
+    :param address: address of outputs split out and change, the address of the unspent split if None
+    :param fee_rate: default fee rate if None
+    :param max_outputs: most outputs split out of an unspent
+    :param sign: sign the transactions if True
+    :param workers: sign across a process pool of this many worker processes if greater than 1
+    :param chunksize: number of signatures sent to a worker at a time
+    :param chain: network chain
+    :param provider: service provider
+    :param kwargs: passing to create transaction
+    :returns: transactions each spending one unspent, the largest first, none of them depends on another
+    unspents too small to split out a single output are left untouched, use spendable_unspents to collect outputs split out
+    """
+    assert satoshi >= P2PKH_DUST_LIMIT, f'outputs must be no less than {P2PKH_DUST_LIMIT} satoshi'
+    assert max_outputs > 0, 'max_outputs must be positive'
+    script_type = P2pkhScriptType()
+    locking_script: Optional[Script] = P2pkhScriptType.locking(address) if address else None
+    transactions: List[Transaction] = []
+    spent: List[Unspent] = []
+    remaining = count
+    for unspent in sorted(unspents, key=lambda u: u.satoshi, reverse=True):
+        if remaining == 0:
+            break
+        t = Transaction(fee_rate=fee_rate, chain=chain, provider=provider, **kwargs).add_input(unspent)
+        script = locking_script or (unspent.locking_script if unspent.script_type == script_type else None)
+        assert script, "can't parse any address from unspent"
+        # each output split out costs its satoshi and its own fee, while the input and the change are paid once
+        fixed_fee = t.fee_rate * (t.estimated_byte_length() + 2 * P2PKH_OUTPUT_BYTE_LENGTH)
+        n = int(max(unspent.satoshi - fixed_fee, 0) // (satoshi + t.fee_rate * P2PKH_OUTPUT_BYTE_LENGTH))
+        n = min(n, max_outputs, remaining if remaining is not None else max_outputs)
+        if n == 0:
+            continue
+        t.add_outputs([TxOutput(script, satoshi, script_type) for _ in range(n)])
+        while t.tx_outputs and t.fee() < t.estimated_fee():
+            del t.tx_outputs[-1]
+        if not t.tx_outputs:
+            continue
+        if remaining is not None:
+            remaining -= len(t.tx_outputs)
+        t.add_change(address)
+        transactions.append(t)
+        spent.append(unspent)
+    if remaining:
+        raise InsufficientFunds(f'require {count} outputs of {satoshi} satoshi but only {count - remaining} can be split out')
+    if sign:
+        Transaction.sign_all(transactions, workers=workers, chunksize=chunksize)
+    if isinstance(unspents, UnspentPool):
+        unspents.remove_many(spent)
+    else:
+        discard_spent(unspents, None, spent)
+    return transactions
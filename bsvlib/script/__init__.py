@@ -1,2 +1,2 @@
 from .script import Script
-from .type import ScriptType, UnknownScriptType, P2pkhScriptType, OpReturnScriptType, P2pkScriptType, BareMultisigScriptType
+from .type import ScriptType, UnknownScriptType, P2pkhScriptType, OpReturnScriptType, P2pkScriptType, BareMultisigScriptType, classify_script
@@ -0,0 +1,628 @@
+import hashlib
+from typing import List, Optional, Union, Callable
+
+from Cryptodome.Hash import RIPEMD160
+
+from .script import Script
+from ..constants import SIGHASH
+from ..hash import hash160, hash256
+from ..keys import PublicKey
+
+
+class ScriptError(ValueError):
+    pass
+
+
+class ScriptLimits:
+    """
+    resource limits of script evaluation, exceeding any of them fails the script
+    """
+
+    MAX_SCRIPT_BYTE_LENGTH: int = 10 * 1000 * 1000
+    MAX_OPS: int = 1000 * 1000
+    MAX_STACK_SIZE: int = 100 * 1000
+    MAX_ELEMENT_BYTE_LENGTH: int = 10 * 1000 * 1000
+    MAX_NUMBER_BYTE_LENGTH: int = 750 * 1000
+    MAX_PUBLIC_KEYS_PER_MULTISIG: int = 1000
+
+    def __init__(self, max_script_byte_length: int = MAX_SCRIPT_BYTE_LENGTH, max_ops: int = MAX_OPS, max_stack_size: int = MAX_STACK_SIZE,
+                 max_element_byte_length: int = MAX_ELEMENT_BYTE_LENGTH, max_number_byte_length: int = MAX_NUMBER_BYTE_LENGTH,
+                 max_public_keys_per_multisig: int = MAX_PUBLIC_KEYS_PER_MULTISIG):
+        """
+        :param max_script_byte_length: byte length of a script
+        :param max_ops: number of non-push opcodes executed in a script
+        :param max_stack_size: number of elements in main stack and alt stack together
+        :param max_element_byte_length: byte length of a stack element
+        :param max_number_byte_length: byte length of a stack element used as number
+        :param max_public_keys_per_multisig: number of public keys of OP_CHECKMULTISIG
+        """
+        self.max_script_byte_length: int = max_script_byte_length
+        self.max_ops: int = max_ops
+        self.max_stack_size: int = max_stack_size
+        self.max_element_byte_length: int = max_element_byte_length
+        self.max_number_byte_length: int = max_number_byte_length
+        self.max_public_keys_per_multisig: int = max_public_keys_per_multisig
+
+
+TRUE: bytes = b'\x01'
+FALSE: bytes = b''
+
+
+def decode_num(octets: bytes) -> int:
+    """
+    :returns: integer of a stack element, which is little endian with the sign bit on the most significant byte
+    """
+    if not octets:
+        return 0
+    num = int.from_bytes(octets, 'little')
+    if octets[-1] & 0x80:
+        return -(num ^ (0x80 << (8 * len(octets) - 8)))
+    return num
+
+
+def encode_num(num: int) -> bytes:
+    """
+    :returns: minimally encoded stack element of an integer
+    """
+    if num == 0:
+        return b''
+    magnitude = -num if num < 0 else num
+    octets = bytearray(magnitude.to_bytes((magnitude.bit_length() + 7) // 8, 'little'))
+    if octets[-1] & 0x80:
+        octets.append(0x80 if num < 0 else 0x00)
+    elif num < 0:
+        octets[-1] |= 0x80
+    return bytes(octets)
+
+
+def is_minimal_num(octets: bytes) -> bool:
+    """
+    :returns: True if the stack element is a number encoded with no unnecessary bytes, as encode_num does
+    """
+    # the last byte holds only the sign bit, which the byte before could have held
+    return not octets or bool(octets[-1] & 0x7f) or (len(octets) > 1 and bool(octets[-2] & 0x80))
+
+
+def cast_to_bool(octets: bytes) -> bool:
+    """
+    :returns: False for empty bytes, zeros and negative zero, True otherwise
+    """
+    for i, octet in enumerate(octets):
+        if octet:
+            # negative zero
+            return not (i == len(octets) - 1 and octet == 0x80)
+    return False
+
+
+class Interpreter:
+    """
+    evaluate scripts with a dispatch table indexed by opcode byte, following the rules after genesis upgrade
+    strict evaluation enforces these standard policy rules of signature checks as well
+      - NULLDUMMY, the extra element consumed by OP_CHECKMULTISIG must be empty
+      - NULLFAIL, signatures of a failed OP_CHECKSIG or OP_CHECKMULTISIG must all be empty
+      - the number of public keys and signatures of OP_CHECKMULTISIG must be minimally encoded
+    other policy rules, such as minimal pushes, low S and strict DER encoding of signatures, are not enforced
+    """
+
+    def __init__(self, tx=None, index: int = 0, limits: Optional[ScriptLimits] = None, strict: bool = True):
+        """
+        :param tx: transaction whose input is being unlocked, required for OP_CHECKSIG and OP_CHECKMULTISIG
+        :param index: index of the input being unlocked
+        :param strict: enforce the policy rules of signature checks, scripts failing them are not relayed by the network
+        """
+        self.tx = tx
+        self.index: int = index
+        self.limits: ScriptLimits = limits or ScriptLimits()
+        self.strict: bool = strict
+        self.stack: List[bytes] = []
+        self.alt_stack: List[bytes] = []
+        self.script: bytes = b''
+        # script code committed by signatures begins right after the last OP_CODESEPARATOR executed
+        self.code_separator: int = 0
+
+    def number(self, octets: bytes) -> int:
+        if len(octets) > self.limits.max_number_byte_length:
+            raise ScriptError('number overflow')
+        return decode_num(octets)
+
+    def pop_number(self, minimal: bool = False) -> int:
+        octets = self.stack.pop()
+        if minimal and not is_minimal_num(octets):
+            raise ScriptError('non-minimally encoded number')
+        return self.number(octets)
+
+    def push(self, octets: bytes) -> None:
+        if len(octets) > self.limits.max_element_byte_length:
+            raise ScriptError('element too large')
+        self.stack.append(octets)
+
+    def evaluate(self, script: Union[Script, bytes], stack: Optional[List[bytes]] = None, push_only: bool = False) -> List[bytes]:
+        """
+        :param stack: initial stack, such as the one left by the unlocking script
+        :param push_only: fail on any opcode other than pushing data
+        :returns: stack after evaluation
+        :raises ScriptError: if the script fails
+        """
+        script = script.serialize() if isinstance(script, Script) else bytes(script)
+        limits = self.limits
+        if len(script) > limits.max_script_byte_length:
+            raise ScriptError('script too large')
+        self.stack, self.alt_stack, self.script, self.code_separator = (stack if stack is not None else []), [], script, 0
+        stack, alt_stack = self.stack, self.alt_stack
+        # a branch is executed only if there is no False in conditions
+        conditions: List[bool] = []
+        skipping = 0
+        table = DISPATCH_TABLE
+        i, n, ops = 0, len(script), 0
+        try:
+            while i < n:
+                opcode = script[i]
+                i += 1
+                if opcode < 0x4f:
+                    # push data
+                    if opcode >= 0x4c:
+                        size = 1 << (opcode - 0x4c)
+                        if i + size > n:
+                            raise ScriptError('bad pushdata')
+                        length = int.from_bytes(script[i:i + size], 'little')
+                        i += size
+                    else:
+                        length = opcode
+                    if i + length > n:
+                        raise ScriptError('bad pushdata')
+                    if not skipping:
+                        if length > limits.max_element_byte_length:
+                            raise ScriptError('element too large')
+                        stack.append(script[i:i + length])
+                    i += length
+                elif push_only and opcode > 0x60:
+                    raise ScriptError('script is not push only')
+                elif 0x63 <= opcode <= 0x68:
+                    # flow control is processed even in a branch not executed
+                    if opcode == 0x63 or opcode == 0x64:
+                        condition = False
+                        if not skipping:
+                            condition = cast_to_bool(stack.pop()) == (opcode == 0x63)
+                        conditions.append(condition)
+                        skipping += not condition
+                    elif opcode == 0x67:
+                        if not conditions:
+                            raise ScriptError('unbalanced conditional')
+                        skipping += 1 if conditions[-1] else -1
+                        conditions[-1] = not conditions[-1]
+                    elif opcode == 0x68:
+                        if not conditions:
+                            raise ScriptError('unbalanced conditional')
+                        skipping -= not conditions.pop()
+                    else:
+                        raise ScriptError(f'bad opcode {opcode:#04x}')
+                elif not skipping:
+                    if opcode > 0x60:
+                        ops += 1
+                        if opcode == 0xae or opcode == 0xaf:
+                            # each public key of OP_CHECKMULTISIG counts as an operation
+                            ops += max(self.number(stack[-1]), 0)
+                        if ops > limits.max_ops:
+                            raise ScriptError('too many operations')
+                    if opcode == 0x6a:
+                        # OP_RETURN ends the evaluation, result is given by the stack
+                        return stack
+                    if opcode == 0xab:
+                        self.code_separator = i
+                    else:
+                        table[opcode](self)
+                if len(stack) + len(alt_stack) > limits.max_stack_size:
+                    raise ScriptError('stack overflow')
+        except IndexError:
+            raise ScriptError('invalid stack operation')
+        except (MemoryError, OverflowError) as e:
+            raise ScriptError(f'resource limit exceeded: {e!r}')
+        if conditions:
+            raise ScriptError('unbalanced conditional')
+        return stack
+
+    def verify(self, unlocking: Union[Script, bytes, None] = None, locking: Union[Script, bytes, None] = None) -> bool:
+        """
+        evaluate unlocking script, which must be push only, then the locking script on the stack it leaves
+        scripts default to the ones of the input being unlocked
+        :returns: True if the evaluation succeeds with a true value on the top of stack
+        """
+        if unlocking is None:
+            unlocking = self.tx.tx_inputs[self.index].unlocking_script
+        if locking is None:
+            locking = self.tx.tx_inputs[self.index].locking_script
+        try:
+            stack = self.evaluate(unlocking, push_only=True)
+            stack = self.evaluate(locking, stack)
+        except ScriptError:
+            return False
+        return bool(stack) and cast_to_bool(stack[-1])
+
+    def check_signature(self, signature: bytes, public_key: bytes) -> bool:
+        """
+        verify signature with sighash flag against the signature hash of the input being unlocked
+        """
+        if not signature:
+            return False
+        if self.tx is None:
+            raise ScriptError('no transaction to check signature against')
+        sighash = signature[-1]
+        if not sighash & SIGHASH.FORKID:
+            raise ScriptError('signature without fork id')
+        signature_hash = self.tx.sighash_cache.signature_hash(self.index, sighash, self.script[self.code_separator:])
+        try:
+            return PublicKey(public_key).verify(signature[:-1], signature_hash, None)
+        except Exception:
+            return False
+
+
+def _op_invalid(vm: Interpreter) -> None:
+    raise ScriptError('bad opcode')
+
+
+def _op_push_number(num: int) -> Callable[[Interpreter], None]:
+    octets = encode_num(num)
+
+    def op(vm: Interpreter) -> None:
+        vm.stack.append(octets)
+
+    return op
+
+
+def _op_nop(vm: Interpreter) -> None:
+    pass
+
+
+def _op_verify(vm: Interpreter) -> None:
+    if not cast_to_bool(vm.stack.pop()):
+        raise ScriptError('OP_VERIFY failed')
+
+
+def _op_toaltstack(vm: Interpreter) -> None:
+    vm.alt_stack.append(vm.stack.pop())
+
+
+def _op_fromaltstack(vm: Interpreter) -> None:
+    vm.stack.append(vm.alt_stack.pop())
+
+
+def _need(vm: Interpreter, count: int) -> List[bytes]:
+    if len(vm.stack) < count:
+        raise ScriptError('invalid stack operation')
+    return vm.stack
+
+
+def _op_2drop(vm: Interpreter) -> None:
+    del _need(vm, 2)[-2:]
+
+
+def _op_2dup(vm: Interpreter) -> None:
+    stack = _need(vm, 2)
+    stack.extend(stack[-2:])
+
+
+def _op_3dup(vm: Interpreter) -> None:
+    stack = _need(vm, 3)
+    stack.extend(stack[-3:])
+
+
+def _op_2over(vm: Interpreter) -> None:
+    stack = _need(vm, 4)
+    stack.extend(stack[-4:-2])
+
+
+def _op_2rot(vm: Interpreter) -> None:
+    stack = _need(vm, 6)
+    items = stack[-6:-4]
+    del stack[-6:-4]
+    stack.extend(items)
+
+
+def _op_2swap(vm: Interpreter) -> None:
+    stack = _need(vm, 4)
+    stack[-4:] = stack[-2:] + stack[-4:-2]
+
+
+def _op_ifdup(vm: Interpreter) -> None:
+    if cast_to_bool(vm.stack[-1]):
+        vm.stack.append(vm.stack[-1])
+
+
+def _op_depth(vm: Interpreter) -> None:
+    vm.stack.append(encode_num(len(vm.stack)))
+
+
+def _op_drop(vm: Interpreter) -> None:
+    vm.stack.pop()
+
+
+def _op_dup(vm: Interpreter) -> None:
+    vm.stack.append(vm.stack[-1])
+
+
+def _op_nip(vm: Interpreter) -> None:
+    del _need(vm, 2)[-2]
+
+
+def _op_over(vm: Interpreter) -> None:
+    vm.stack.append(_need(vm, 2)[-2])
+
+
+def _pick_index(vm: Interpreter) -> int:
+    n = vm.pop_number()
+    if n < 0 or n >= len(vm.stack):
+        raise ScriptError('invalid stack operation')
+    return -n - 1
+
+
+def _op_pick(vm: Interpreter) -> None:
+    vm.stack.append(vm.stack[_pick_index(vm)])
+
+
+def _op_roll(vm: Interpreter) -> None:
+    vm.stack.append(vm.stack.pop(_pick_index(vm)))
+
+
+def _op_rot(vm: Interpreter) -> None:
+    vm.stack.append(_need(vm, 3).pop(-3))
+
+
+def _op_swap(vm: Interpreter) -> None:
+    stack = _need(vm, 2)
+    stack[-2], stack[-1] = stack[-1], stack[-2]
+
+
+def _op_tuck(vm: Interpreter) -> None:
+    stack = _need(vm, 2)
+    stack.insert(-2, stack[-1])
+
+
+def _op_cat(vm: Interpreter) -> None:
+    b, a = vm.stack.pop(), vm.stack.pop()
+    vm.push(a + b)
+
+
+def _op_split(vm: Interpreter) -> None:
+    n = vm.pop_number()
+    octets = vm.stack.pop()
+    if n < 0 or n > len(octets):
+        raise ScriptError('invalid split range')
+    vm.stack.append(octets[:n])
+    vm.stack.append(octets[n:])
+
+
+def _op_num2bin(vm: Interpreter) -> None:
+    size = vm.pop_number()
+    if size < 0 or size > vm.limits.max_element_byte_length:
+        raise ScriptError('invalid size of OP_NUM2BIN')
+    octets = bytearray(encode_num(decode_num(vm.stack.pop())))
+    if len(octets) > size:
+        raise ScriptError('number does not fit in size of OP_NUM2BIN')
+    if octets and len(octets) < size:
+        # move the sign bit to the last byte
+        sign = octets[-1] & 0x80
+        octets[-1] &= 0x7f
+        octets += bytes(size - len(octets))
+        octets[-1] |= sign
+    vm.stack.append(bytes(octets) if octets else bytes(size))
+
+
+def _op_bin2num(vm: Interpreter) -> None:
+    octets = encode_num(decode_num(vm.stack.pop()))
+    if len(octets) > vm.limits.max_number_byte_length:
+        raise ScriptError('number overflow')
+    vm.stack.append(octets)
+
+
+def _op_size(vm: Interpreter) -> None:
+    vm.stack.append(encode_num(len(vm.stack[-1])))
+
+
+def _op_invert(vm: Interpreter) -> None:
+    octets = vm.stack.pop()
+    vm.stack.append((int.from_bytes(octets, 'big') ^ ((1 << (8 * len(octets))) - 1)).to_bytes(len(octets), 'big'))
+
+
+def _op_bitwise(operation: Callable[[int, int], int]) -> Callable[[Interpreter], None]:
+    def op(vm: Interpreter) -> None:
+        b, a = vm.stack.pop(), vm.stack.pop()
+        if len(a) != len(b):
+            raise ScriptError('operands of bitwise operation are in different sizes')
+        vm.stack.append(operation(int.from_bytes(a, 'big'), int.from_bytes(b, 'big')).to_bytes(len(a), 'big'))
+
+    return op
+
+
+def _op_equal(vm: Interpreter) -> None:
+    vm.stack.append(TRUE if vm.stack.pop() == vm.stack.pop() else FALSE)
+
+
+def _op_equalverify(vm: Interpreter) -> None:
+    if vm.stack.pop() != vm.stack.pop():
+        raise ScriptError('OP_EQUALVERIFY failed')
+
+
+def _op_unary(operation: Callable[[int], int]) -> Callable[[Interpreter], None]:
+    def op(vm: Interpreter) -> None:
+        vm.stack.append(encode_num(operation(vm.pop_number())))
+
+    return op
+
+
+def _op_binary(operation: Callable[[int, int], int]) -> Callable[[Interpreter], None]:
+    def op(vm: Interpreter) -> None:
+        b, a = vm.pop_number(), vm.pop_number()
+        vm.stack.append(encode_num(operation(a, b)))
+
+    return op
+
+
+def _divide(a: int, b: int) -> int:
+    if b == 0:
+        raise ScriptError('divide by zero')
+    # truncate towards zero
+    quotient = abs(a) // abs(b)
+    return quotient if (a < 0) == (b < 0) else -quotient
+
+
+def _modulo(a: int, b: int) -> int:
+    if b == 0:
+        raise ScriptError('modulo by zero')
+    # sign follows the dividend
+    remainder = abs(a) % abs(b)
+    return -remainder if a < 0 else remainder
+
+
+def _op_numequalverify(vm: Interpreter) -> None:
+    if vm.pop_number() != vm.pop_number():
+        raise ScriptError('OP_NUMEQUALVERIFY failed')
+
+
+def _op_within(vm: Interpreter) -> None:
+    upper, lower, num = vm.pop_number(), vm.pop_number(), vm.pop_number()
+    vm.stack.append(TRUE if lower <= num < upper else FALSE)
+
+
+def _op_shift(left: bool) -> Callable[[Interpreter], None]:
+    def op(vm: Interpreter) -> None:
+        n = vm.pop_number()
+        if n < 0:
+            raise ScriptError('negative shift')
+        octets = vm.stack.pop()
+        if n >= 8 * len(octets):
+            # every bit is shifted out, don't build a huge number to find that out
+            vm.stack.append(bytes(len(octets)))
+            return
+        num = int.from_bytes(octets, 'big')
+        num = ((num << n) & ((1 << (8 * len(octets))) - 1)) if left else (num >> n)
+        vm.stack.append(num.to_bytes(len(octets), 'big'))
+
+    return op
+
+
+def _op_hash(hasher: Callable[[bytes], bytes]) -> Callable[[Interpreter], None]:
+    def op(vm: Interpreter) -> None:
+        vm.stack.append(hasher(vm.stack.pop()))
+
+    return op
+
+
+def _op_checksig(vm: Interpreter) -> None:
+    public_key, signature = vm.stack.pop(), vm.stack.pop()
+    matched = vm.check_signature(signature, public_key)
+    if not matched and signature and vm.strict:
+        raise ScriptError('signature must be empty if OP_CHECKSIG fails')
+    vm.stack.append(TRUE if matched else FALSE)
+
+
+def _op_checkmultisig(vm: Interpreter) -> None:
+    count = vm.pop_number(minimal=vm.strict)
+    if count < 0 or count > vm.limits.max_public_keys_per_multisig:
+        raise ScriptError('invalid number of public keys')
+    public_keys = [vm.stack.pop() for _ in range(count)]
+    threshold = vm.pop_number(minimal=vm.strict)
+    if threshold < 0 or threshold > count:
+        raise ScriptError('invalid number of signatures')
+    signatures = [vm.stack.pop() for _ in range(threshold)]
+    # the extra element consumed by OP_CHECKMULTISIG
+    if vm.stack.pop() and vm.strict:
+        raise ScriptError('extra element of OP_CHECKMULTISIG must be empty')
+    # signatures are matched against public keys in order, a public key is passed once it doesn't match
+    candidates = iter(public_keys)
+    matched = all(any(vm.check_signature(signature, public_key) for public_key in candidates) for signature in signatures)
+    if not matched and vm.strict and any(signatures):
+        raise ScriptError('signatures must be empty if OP_CHECKMULTISIG fails')
+    vm.stack.append(TRUE if matched else FALSE)
+
+
+def _op_verified(op: Callable[[Interpreter], None], name: str) -> Callable[[Interpreter], None]:
+    def verified(vm: Interpreter) -> None:
+        op(vm)
+        if not cast_to_bool(vm.stack.pop()):
+            raise ScriptError(f'{name} failed')
+
+    return verified
+
+
+def _build_dispatch_table() -> List[Callable[[Interpreter], None]]:
+    table: List[Callable[[Interpreter], None]] = [_op_invalid] * 256
+    table[0x4f] = _op_push_number(-1)
+    for opcode in range(0x51, 0x61):
+        table[opcode] = _op_push_number(opcode - 0x50)
+    # OP_NOP, OP_NOP1, OP_CHECKLOCKTIMEVERIFY and OP_CHECKSEQUENCEVERIFY are NOPs after genesis, OP_NOP4 to OP_NOP10
+    for opcode in [0x61, 0xb0, 0xb1, 0xb2] + list(range(0xb3, 0xba)):
+        table[opcode] = _op_nop
+    table[0x69] = _op_verify
+    # stack
+    table[0x6b] = _op_toaltstack
+    table[0x6c] = _op_fromaltstack
+    table[0x6d] = _op_2drop
+    table[0x6e] = _op_2dup
+    table[0x6f] = _op_3dup
+    table[0x70] = _op_2over
+    table[0x71] = _op_2rot
+    table[0x72] = _op_2swap
+    table[0x73] = _op_ifdup
+    table[0x74] = _op_depth
+    table[0x75] = _op_drop
+    table[0x76] = _op_dup
+    table[0x77] = _op_nip
+    table[0x78] = _op_over
+    table[0x79] = _op_pick
+    table[0x7a] = _op_roll
+    table[0x7b] = _op_rot
+    table[0x7c] = _op_swap
+    table[0x7d] = _op_tuck
+    # data manipulation
+    table[0x7e] = _op_cat
+    table[0x7f] = _op_split
+    table[0x80] = _op_num2bin
+    table[0x81] = _op_bin2num
+    table[0x82] = _op_size
+    # bitwise logic
+    table[0x83] = _op_invert
+    table[0x84] = _op_bitwise(lambda a, b: a & b)
+    table[0x85] = _op_bitwise(lambda a, b: a | b)
+    table[0x86] = _op_bitwise(lambda a, b: a ^ b)
+    table[0x87] = _op_equal
+    table[0x88] = _op_equalverify
+    # arithmetic
+    table[0x8b] = _op_unary(lambda a: a + 1)
+    table[0x8c] = _op_unary(lambda a: a - 1)
+    table[0x8f] = _op_unary(lambda a: -a)
+    table[0x90] = _op_unary(abs)
+    table[0x91] = _op_unary(lambda a: int(a == 0))
+    table[0x92] = _op_unary(lambda a: int(a != 0))
+    table[0x93] = _op_binary(lambda a, b: a + b)
+    table[0x94] = _op_binary(lambda a, b: a - b)
+    table[0x95] = _op_binary(lambda a, b: a * b)
+    table[0x96] = _op_binary(_divide)
+    table[0x97] = _op_binary(_modulo)
+    table[0x98] = _op_shift(left=True)
+    table[0x99] = _op_shift(left=False)
+    table[0x9a] = _op_binary(lambda a, b: int(a != 0 and b != 0))
+    table[0x9b] = _op_binary(lambda a, b: int(a != 0 or b != 0))
+    table[0x9c] = _op_binary(lambda a, b: int(a == b))
+    table[0x9d] = _op_numequalverify
+    table[0x9e] = _op_binary(lambda a, b: int(a != b))
+    table[0x9f] = _op_binary(lambda a, b: int(a < b))
+    table[0xa0] = _op_binary(lambda a, b: int(a > b))
+    table[0xa1] = _op_binary(lambda a, b: int(a <= b))
+    table[0xa2] = _op_binary(lambda a, b: int(a >= b))
+    table[0xa3] = _op_binary(min)
+    table[0xa4] = _op_binary(max)
+    table[0xa5] = _op_within
+    # cryptography
+    table[0xa6] = _op_hash(lambda octets: RIPEMD160.new(octets).digest())
+    table[0xa7] = _op_hash(lambda octets: hashlib.sha1(octets).digest())
+    table[0xa8] = _op_hash(lambda octets: hashlib.sha256(octets).digest())
+    table[0xa9] = _op_hash(hash160)
+    table[0xaa] = _op_hash(hash256)
+    table[0xac] = _op_checksig
+    table[0xad] = _op_verified(_op_checksig, 'OP_CHECKSIGVERIFY')
+    table[0xae] = _op_checkmultisig
+    table[0xaf] = _op_verified(_op_checkmultisig, 'OP_CHECKMULTISIGVERIFY')
+    return table
+
+
+DISPATCH_TABLE: List[Callable[[Interpreter], None]] = _build_dispatch_table()
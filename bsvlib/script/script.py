@@ -1,9 +1,37 @@
-from typing import Union
+from typing import Union, Iterator, Tuple, Optional
 
 from ..utils import unsigned_to_varint
 
 
+def iter_chunks(script: Union[bytes, bytearray, memoryview], start: int = 0) -> Iterator[Tuple[int, Optional[memoryview]]]:
+    """
+    iterate over the opcodes of serialized script from offset start without copying, see Script.chunks
+    """
+    view = memoryview(script)
+    i, n = start, len(view)
+    while i < n:
+        opcode = view[i]
+        i += 1
+        if opcode > 0x4e:
+            yield opcode, None
+            continue
+        if opcode < 0x4c:
+            length = opcode
+        else:
+            # OP_PUSHDATA1 / OP_PUSHDATA2 / OP_PUSHDATA4
+            size = 1 << (opcode - 0x4c)
+            if i + size > n:
+                raise ValueError('bad pushdata')
+            length = int.from_bytes(view[i:i + size], 'little')
+            i += size
+        if i + length > n:
+            raise ValueError('bad pushdata')
+        yield opcode, view[i:i + length]
+        i += length
+
+
 class Script:
+    __slots__ = ('script',)
 
     def __init__(self, script: Union[str, bytes, None] = None):
         """
@@ -26,6 +54,14 @@ class Script:
     def hex(self) -> str:
         return self.script.hex()
 
+    def chunks(self) -> Iterator[Tuple[int, Optional[memoryview]]]:
+        """
+        iterate over the opcodes of this script without copying
+        :returns: generator of (opcode, pushdata), pushdata is a memoryview of the data pushed, None if the opcode doesn't push data
+        :raises ValueError: if pushdata runs beyond the end of script
+        """
+        return iter_chunks(self.script)
+
     def byte_length(self) -> int:
         return len(self.script)
 
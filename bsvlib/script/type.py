@@ -1,5 +1,5 @@
 from abc import abstractmethod, ABCMeta
-from typing import Union, List
+from typing import Union, List, Dict, Tuple
 
 from .script import Script
 from ..constants import PUBLIC_KEY_HASH_BYTE_LENGTH, OP, SIGHASH, PUBLIC_KEY_BYTE_LENGTH_LIST
@@ -192,3 +192,60 @@ class BareMultisigScriptType(ScriptType):
         if not kwargs.get('private_keys'):
             raise ValueError(f"can't estimate unlocking byte length without private keys")
         return 1 + 73 * len(kwargs.get('private_keys'))
+
+
+#
+# templates to classify locking scripts
+#
+_P2PKH_PREFIX: bytes = OP.OP_DUP + OP.OP_HASH160 + PUBLIC_KEY_HASH_BYTE_LENGTH.to_bytes(1, 'little')
+_P2PKH_SUFFIX: bytes = OP.OP_EQUALVERIFY + OP.OP_CHECKSIG
+_P2PKH_BYTE_LENGTH: int = len(_P2PKH_PREFIX) + PUBLIC_KEY_HASH_BYTE_LENGTH + len(_P2PKH_SUFFIX)
+# byte length of P2PK locking script -> prefixes of public key pushed, which are the pushdata opcode followed by the public key prefix
+_P2PK_PREFIXES: Dict[int, Tuple[bytes, ...]] = {35: (b'\x21\x02', b'\x21\x03'), 67: (b'\x41\x04',)}
+_OP_RETURN_PREFIXES: Tuple[bytes, ...] = (OP.OP_FALSE + OP.OP_RETURN, OP.OP_RETURN)
+_OP_1: int = OP.OP_1[0]
+_OP_16: int = OP.OP_16[0]
+_OP_CHECKSIG: int = OP.OP_CHECKSIG[0]
+_OP_CHECKMULTISIG: int = OP.OP_CHECKMULTISIG[0]
+
+
+def _is_bare_multisig(script: bytes) -> bool:
+    """
+    OP_m <public key> ... <public key> OP_n OP_CHECKMULTISIG, with m and n from 1 to 16
+    """
+    if len(script) < 37 or script[-1] != _OP_CHECKMULTISIG or not _OP_1 <= script[0] <= _OP_16 or not _OP_1 <= script[-2] <= _OP_16:
+        return False
+    threshold, count = script[0] - _OP_1 + 1, script[-2] - _OP_1 + 1
+    i, public_keys = 1, 0
+    while i < len(script) - 2:
+        length = script[i]
+        if length not in PUBLIC_KEY_BYTE_LENGTH_LIST:
+            return False
+        i += 1 + length
+        public_keys += 1
+    return i == len(script) - 2 and public_keys == count and threshold <= count
+
+
+def classify_script(script: Union[Script, bytes]) -> ScriptType:
+    """
+    classify a locking script by matching against the templates of P2PKH, P2PK, OP_RETURN and bare multisig
+    :returns: the script type matched, UnknownScriptType if none of them matches
+    """
+    script = script.serialize() if isinstance(script, Script) else script
+    length = len(script)
+    if length == _P2PKH_BYTE_LENGTH and script.startswith(_P2PKH_PREFIX) and script.endswith(_P2PKH_SUFFIX):
+        return _P2PKH
+    if script.startswith(_OP_RETURN_PREFIXES):
+        return _OP_RETURN
+    if length in _P2PK_PREFIXES and script[-1] == _OP_CHECKSIG and script.startswith(_P2PK_PREFIXES[length]):
+        return _P2PK
+    if _is_bare_multisig(script):
+        return _BARE_MULTISIG
+    return _UNKNOWN
+
+
+_P2PKH: ScriptType = P2pkhScriptType()
+_P2PK: ScriptType = P2pkScriptType()
+_OP_RETURN: ScriptType = OpReturnScriptType()
+_BARE_MULTISIG: ScriptType = BareMultisigScriptType()
+_UNKNOWN: ScriptType = UnknownScriptType()
@@ -1,10 +1,12 @@
+import threading
 from abc import ABCMeta, abstractmethod
 from collections import namedtuple
 from typing import List, Dict, Optional, Tuple, Union
 
 import requests
+from requests.adapters import HTTPAdapter
 
-from ..constants import Chain, HTTP_REQUEST_TIMEOUT
+from ..constants import Chain, HTTP_REQUEST_TIMEOUT, HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE
 from ..keys import PublicKey, PrivateKey
 
 BroadcastResult = namedtuple('BroadcastResult', 'propagated data')
@@ -12,10 +14,60 @@ BroadcastResult = namedtuple('BroadcastResult', 'propagated data')
 
 class Provider(metaclass=ABCMeta):
 
-    def __init__(self, chain: Chain = Chain.MAIN, headers: Optional[Dict] = None, timeout: Optional[int] = None):
+    def __init__(self, chain: Chain = Chain.MAIN, headers: Optional[Dict] = None, timeout: Optional[int] = None,
+                 pool_connections: Optional[int] = None, pool_maxsize: Optional[int] = None, pool_block: bool = False, keep_alive: bool = True):
+        """
+        :param pool_connections: number of hosts to keep a connection pool for
+        :param pool_maxsize: most connections kept alive to a host
+        :param pool_block: if True then no more than pool_maxsize connections are open to a host at a time, calls beyond wait for one to be free
+        :param keep_alive: reuse connections across calls if True, otherwise close each connection after its call
+        """
         self.chain: Chain = chain
         self.headers: Dict = headers or {'Content-Type': 'application/json', 'Accept': 'application/json', }
         self.timeout: int = timeout or HTTP_REQUEST_TIMEOUT
+        self.pool_connections: int = pool_connections or HTTP_POOL_CONNECTIONS
+        self.pool_maxsize: int = pool_maxsize or HTTP_POOL_MAXSIZE
+        self.pool_block: bool = pool_block
+        self.keep_alive: bool = keep_alive
+        self._session: Optional[requests.Session] = None
+        self._session_lock: threading.Lock = threading.Lock()
+
+    def __getstate__(self) -> Dict:
+        # neither the session nor the lock can be pickled, a copy creates its own on first use
+        state = self.__dict__.copy()
+        state['_session'], state['_session_lock'] = None, None
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        HTTP session shared by all the calls of this provider, created on first use
+        connections are pooled per host, so threads calling the provider at the same time reuse them instead of connecting every call
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize, pool_block=self.pool_block)
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    if not self.keep_alive:
+                        session.headers['Connection'] = 'close'
+                    self._session = session
+        return self._session
+
+    def close(self) -> None:
+        """
+        close connections kept alive, a new session is created on the next call
+        """
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
 
     def parse_kwargs(self, **kwargs) -> Tuple[Optional[str], Optional[PublicKey], Optional[PrivateKey]]:
         """
@@ -30,7 +82,7 @@ class Provider(metaclass=ABCMeta):
         """
         HTTP GET wrapper
         """
-        r = requests.get(
+        r = self.session.get(
             kwargs['url'],
             headers=kwargs.get('headers') or self.headers,
             params=kwargs.get('params'),
@@ -39,6 +91,17 @@ class Provider(metaclass=ABCMeta):
         r.raise_for_status()
         return r.json()
 
+    def post(self, **kwargs) -> requests.Response:
+        """
+        HTTP POST wrapper, the response is returned as is
+        """
+        return self.session.post(
+            kwargs['url'],
+            headers=kwargs.get('headers') or self.headers,
+            data=kwargs.get('data'),
+            timeout=kwargs.get('timeout') or self.timeout
+        )
+
     @abstractmethod
     def get_unspents(self, **kwargs) -> List[Dict]:
         """kwargs will pass the following at least
@@ -1,3 +1,4 @@
+import threading
 from typing import List, Dict, Optional
 
 from .provider import Provider, BroadcastResult
@@ -6,15 +7,27 @@ from ..constants import Chain
 
 
 class Service:
+    # provider of each chain used when none is given, shared so that its connections are kept alive across calls
+    _default_providers: Dict[Chain, Provider] = {}
+    _default_providers_lock: threading.Lock = threading.Lock()
 
     def __init__(self, chain: Optional[Chain] = None, provider: Optional[Provider] = None):
-        if provider:
-            self.provider = provider
-        else:
-            chain = chain or Chain.MAIN
-            self.provider = WhatsOnChain(chain)
+        self.provider = provider or Service.default_provider(chain or Chain.MAIN)
         self.chain = self.provider.chain
 
+    @classmethod
+    def default_provider(cls, chain: Chain) -> Provider:
+        """
+        :returns: the WhatsOnChain provider of chain, created on first use and reused afterwards
+        """
+        provider = cls._default_providers.get(chain)
+        if provider is None:
+            with cls._default_providers_lock:
+                provider = cls._default_providers.get(chain)
+                if provider is None:
+                    provider = cls._default_providers[chain] = WhatsOnChain(chain)
+        return provider
+
     def get_unspents(self, **kwargs) -> List[Dict]:
         """kwargs will pass the following at least
         {
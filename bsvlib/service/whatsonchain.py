@@ -1,16 +1,17 @@
 import json
 from typing import List, Dict, Optional
 
-import requests
-
 from .provider import Provider, BroadcastResult
 from ..constants import Chain
 
 
 class WhatsOnChain(Provider):  # pragma: no cover
 
-    def __init__(self, chain: Chain = Chain.MAIN, headers: Optional[Dict] = None, timeout: Optional[int] = None):
-        super().__init__(chain, headers, timeout)
+    def __init__(self, chain: Chain = Chain.MAIN, headers: Optional[Dict] = None, timeout: Optional[int] = None, **kwargs):
+        """
+        :param kwargs: connection pool options passing to Provider
+        """
+        super().__init__(chain, headers, timeout, **kwargs)
         self.url: str = 'https://api.whatsonchain.com/v1/bsv'
 
     def get_unspents(self, **kwargs) -> List[Dict]:
@@ -42,7 +43,7 @@ class WhatsOnChain(Provider):  # pragma: no cover
         propagated, message = False, ''
         try:
             data = json.dumps({'txHex': raw})
-            r = requests.post(f'{self.url}/{self.chain.value}/tx/raw', headers=self.headers, data=data, timeout=self.timeout)
+            r = self.post(url=f'{self.url}/{self.chain.value}/tx/raw', data=data)
             message = r.json()
             r.raise_for_status()
             propagated = True
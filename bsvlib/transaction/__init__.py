@@ -1,2 +1,5 @@
-from .transaction import TxInput, TxOutput, Transaction, InsufficientFunds, TransactionBytesIO
+from .transaction import TxInput, TxOutput, Transaction, InsufficientFunds, TransactionBytesIO, TransactionReader, LazyTransaction
+from .outpoint import Outpoint
 from .unspent import Unspent
+from .unspent_set import UnspentSet
+from .op_return import OpReturnExtractor
@@ -0,0 +1,139 @@
+import mmap
+import os
+from typing import List, Union, Iterator, Tuple, Iterable, Dict, Optional
+
+from .transaction import TransactionReader
+from ..constants import OP
+from ..script.script import iter_chunks
+
+_OP_FALSE: int = OP.OP_FALSE[0]
+_OP_RETURN: int = OP.OP_RETURN[0]
+# key of the trie node marking the end of a prefix
+_END = -1
+
+
+class OpReturnExtractor:
+    """
+    pick the OP_RETURN outputs of given protocols out of raw transactions in a single pass
+    an output matches when the first pushdata after OP_RETURN starts with one of the protocol prefixes,
+    prefixes are stored in a trie so that every output script is walked once no matter how many protocols are wanted
+    """
+
+    def __init__(self, prefixes: Iterable[Union[str, bytes]]):
+        """
+        :param prefixes: protocol prefixes, str is encoded in UTF-8 the same way as OpReturnScriptType.locking does
+        """
+        self.prefixes: List[bytes] = []
+        self.trie: Dict[int, Dict] = {}
+        for prefix in prefixes:
+            if isinstance(prefix, str):
+                prefix_bytes: bytes = prefix.encode('utf-8')
+            elif isinstance(prefix, bytes):
+                prefix_bytes: bytes = prefix
+            else:
+                raise TypeError('unsupported type of protocol prefix')
+            node = self.trie
+            for octet in prefix_bytes:
+                node = node.setdefault(octet, {})
+            node[_END] = prefix_bytes
+            self.prefixes.append(prefix_bytes)
+
+    def match(self, pushdata: Union[bytes, memoryview]) -> Optional[bytes]:
+        """
+        :returns: the shortest protocol prefix pushdata starts with, None if there isn't any
+        """
+        node = self.trie
+        for octet in pushdata:
+            if _END in node:
+                break
+            node = node.get(octet)
+            if node is None:
+                return None
+        return node.get(_END)
+
+    def match_script(self, script: Union[bytes, memoryview]) -> Optional[List[memoryview]]:
+        """
+        :returns: pushdatas of the OP_RETURN locking script if it belongs to one of the protocols, None otherwise
+            trailing bytes that aren't a complete pushdata are ignored
+        """
+        length = len(script)
+        if length > 1 and script[0] == _OP_FALSE and script[1] == _OP_RETURN:
+            start = 2
+        elif length > 0 and script[0] == _OP_RETURN:
+            start = 1
+        else:
+            return None
+        if start == length:
+            return None
+        # the protocol prefix is checked against the first pushdata before anything is decoded
+        opcode = script[start]
+        if opcode < 0x4c:
+            offset = start + 1
+        elif opcode <= 0x4e:
+            offset = start + 1 + (1 << (opcode - 0x4c))
+        else:
+            return None
+        if self.match(script[offset:]) is None:
+            return None
+        pushdatas = []
+        try:
+            for _, pushdata in iter_chunks(script, start):
+                if pushdata is not None:
+                    pushdatas.append(pushdata)
+        except ValueError:
+            pass
+        # the first pushdata could be truncated
+        return pushdatas if pushdatas and self.match(pushdatas[0]) is not None else None
+
+    def extract(self, stream: Union[str, bytes, bytearray, memoryview, TransactionReader]) -> Iterator[Tuple[str, int, List[memoryview]]]:
+        """
+        walk concatenated raw transactions, in either standard or extended format, without constructing any of their objects
+        :returns: generator of (txid, vout, pushdatas) of the matching outputs, pushdatas are memoryviews of the stream
+        :raises ValueError: if the stream is not made of valid transactions
+        """
+        reader = stream if isinstance(stream, TransactionReader) else TransactionReader(stream)
+        buffer = reader.buffer
+        while reader.remaining():
+            offset = reader.position
+            try:
+                layout = reader.walk_transaction()
+            except AssertionError:
+                raise ValueError(f'invalid transaction at offset {offset}') from None
+            matched = []
+            offsets = layout.output_offsets
+            for vout, output_offset in enumerate(offsets):
+                octet = buffer[output_offset + 8]
+                start = output_offset + 9 if octet < 0xfd else output_offset + 9 + (1 << (octet - 0xfc))
+                # most outputs are told apart by their first opcode before any view is made, an empty script is caught by match_script
+                if buffer[start] != _OP_FALSE and buffer[start] != _OP_RETURN:
+                    continue
+                # an output script ends where the next output begins, the last one right before locktime
+                end = offsets[vout + 1] if vout + 1 < len(offsets) else layout.end - 4
+                pushdatas = self.match_script(buffer[start:end])
+                if pushdatas is not None:
+                    matched.append((vout, pushdatas))
+            if matched:
+                txid = layout.txid(buffer)
+                for vout, pushdatas in matched:
+                    yield txid, vout, pushdatas
+
+    def extract_file(self, path: str) -> Iterator[Tuple[str, int, List[bytes]]]:
+        """
+        walk a file of concatenated raw transactions, the file is memory-mapped and never loaded as a whole
+        :returns: generator of (txid, vout, pushdatas) of the matching outputs, pushdatas are copied out of the map
+        """
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                reader = TransactionReader(mm)
+                matches = self.extract(reader)
+                try:
+                    for match in matches:
+                        txid, vout, pushdatas = match[0], match[1], [pushdata.tobytes() for pushdata in match[2]]
+                        del match
+                        yield txid, vout, pushdatas
+                finally:
+                    # the map can't be closed while its buffer is still exported, views held by the generator go with it
+                    matches.close()
+                    reader.buffer.release()
@@ -0,0 +1,50 @@
+from typing import Optional, Union
+
+
+class Outpoint(bytes):
+    """
+    immutable and hashable outpoint, 32 bytes of txid in internal byte order followed by 4 bytes of vout in little endian
+    which are exactly the bytes serialized in transaction input, so it never goes through hex string in serialization and signing
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, txid: Union[str, bytes, bytearray, memoryview], vout: Optional[int] = None) -> 'Outpoint':
+        """
+        :param txid: txid in hex string, or 32 bytes in internal byte order, or 36 bytes of serialized outpoint if vout is not set
+        :param vout: output index
+        """
+        if vout is None:
+            octets = bytes(txid)
+            assert len(octets) == 36, 'bad outpoint'
+            return super().__new__(cls, octets)
+        octets = bytes.fromhex(txid)[::-1] if isinstance(txid, str) else bytes(txid)
+        assert len(octets) == 32, 'bad txid'
+        return super().__new__(cls, octets + int(vout).to_bytes(4, 'little'))
+
+    @property
+    def txid(self) -> str:
+        """
+        txid in hex string, as displayed
+        """
+        return self[31::-1].hex()
+
+    @property
+    def txid_bytes(self) -> bytes:
+        """
+        txid in internal byte order
+        """
+        return self[:32]
+
+    @property
+    def vout(self) -> int:
+        return int.from_bytes(self[32:], 'little')
+
+    def __str__(self) -> str:
+        return f'{self.txid}:{self.vout}'
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f'<Outpoint {self}>'
+
+
+NULL_OUTPOINT: Outpoint = Outpoint(bytes(32), 0)
@@ -1,17 +1,27 @@
+import hashlib
 import math
+import mmap
+import os
+import struct
+from collections import deque
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import suppress
 from io import BytesIO
-from typing import List, Optional, Union, Dict, Any
+from itertools import islice
+from typing import List, Optional, Union, Dict, Any, Iterator, Tuple, Callable, BinaryIO, Iterable
 
 from typing_extensions import Literal
 
+from .outpoint import Outpoint, NULL_OUTPOINT
 from .unspent import Unspent
 from ..constants import SIGHASH, Chain
 from ..constants import TRANSACTION_VERSION, TRANSACTION_LOCKTIME, TRANSACTION_SEQUENCE, TRANSACTION_FEE_RATE, P2PKH_DUST_LIMIT
-from ..hash import hash256
-from ..keys import PrivateKey
+from ..constants import TRANSACTION_EXTENDED_FORMAT_MARKER
+from ..hash import hash256, hash160
+from ..keys import PrivateKey, PublicKey, sign_many
 from ..script.script import Script
-from ..script.type import ScriptType, P2pkhScriptType, OpReturnScriptType, UnknownScriptType
+from ..script.type import ScriptType, P2pkhScriptType, P2pkScriptType, OpReturnScriptType, BareMultisigScriptType, UnknownScriptType, classify_script
 from ..service.provider import Provider, BroadcastResult
 from ..service.service import Service
 from ..utils import unsigned_to_varint
@@ -55,77 +65,555 @@ class TransactionBytesIO(BytesIO):
         else:
             return self.read_int(8)
 
+    def read_extended_marker(self) -> bool:
+        """
+        consume the BIP-239 extended format marker if the stream is positioned at it
+        :returns: True if the marker was consumed
+        """
+        position = self.tell()
+        if self.read(len(TRANSACTION_EXTENDED_FORMAT_MARKER)) == TRANSACTION_EXTENDED_FORMAT_MARKER:
+            return True
+        self.seek(position)
+        return False
+
+
+_LITTLE_ENDIAN_UNPACKERS = {
+    2: struct.Struct('<H').unpack_from,
+    4: struct.Struct('<I').unpack_from,
+    8: struct.Struct('<Q').unpack_from,
+}
+
+
+class TransactionReader:
+    """
+    walk a memoryview with an integer cursor, bytes are only copied when a field is materialized
+    """
+
+    def __init__(self, octets: Union[str, bytes, bytearray, memoryview], position: int = 0):
+        buffer = memoryview(bytes.fromhex(octets) if isinstance(octets, str) else octets)
+        self.buffer: memoryview = buffer if buffer.format == 'B' and buffer.ndim == 1 else buffer.cast('B')
+        self.position: int = position
+
+    def remaining(self) -> int:
+        return len(self.buffer) - self.position
+
+    def read_view(self, byte_length: int) -> memoryview:
+        """
+        :returns: zero-copy view of the next byte_length bytes
+        """
+        start, end = self.position, self.position + byte_length
+        assert byte_length >= 0 and end <= len(self.buffer), 'read beyond the end of buffer'
+        self.position = end
+        return self.buffer[start:end]
+
+    def read_bytes(self, byte_length: Optional[int] = None) -> bytes:
+        """
+        read and return exactly byte_length bytes, or until the end of buffer if the argument is omitted or None
+        """
+        return self.read_view(self.remaining() if byte_length is None else byte_length).tobytes()
+
+    def read_int(self, byte_length: int, byteorder: Literal['big', 'little'] = 'little') -> int:
+        unpacker = _LITTLE_ENDIAN_UNPACKERS.get(byte_length) if byteorder == 'little' else None
+        if unpacker is None:
+            return int.from_bytes(self.read_view(byte_length), byteorder=byteorder)
+        start = self.position
+        assert start + byte_length <= len(self.buffer), 'read beyond the end of buffer'
+        self.position = start + byte_length
+        return unpacker(self.buffer, start)[0]
+
+    def read_varint(self) -> int:
+        assert self.position < len(self.buffer), 'read beyond the end of buffer'
+        octet = self.buffer[self.position]
+        self.position += 1
+        if octet <= 0xfc:
+            return octet
+        elif octet == 0xfd:
+            return self.read_int(2)
+        elif octet == 0xfe:
+            return self.read_int(4)
+        else:
+            return self.read_int(8)
+
+    def skip(self, byte_length: int) -> None:
+        assert byte_length >= 0 and self.position + byte_length <= len(self.buffer), 'read beyond the end of buffer'
+        self.position += byte_length
+
+    def read_extended_marker(self) -> bool:
+        """
+        consume the BIP-239 extended format marker if the reader is positioned at it
+        :returns: True if the marker was consumed
+        """
+        end = self.position + len(TRANSACTION_EXTENDED_FORMAT_MARKER)
+        if self.buffer[self.position:end] == TRANSACTION_EXTENDED_FORMAT_MARKER:
+            self.position = end
+            return True
+        return False
+
+    def walk_transaction(self) -> 'TransactionLayout':
+        """
+        record where the transaction at the current position, each of its inputs and outputs, and the fields only extended format has lie
+        nothing is decoded but varints, the stream is left right after the transaction
+        :returns: layout of the transaction
+        """
+        layout = TransactionLayout(self.position)
+        skip, read_varint = self.skip, self.read_varint
+        skip(4)
+        extended = layout.extended = self.read_extended_marker()
+        if extended:
+            layout.extended_ranges.append((layout.start + 4, self.position))
+        input_offsets, extended_ranges = layout.input_offsets, layout.extended_ranges
+        for _ in range(read_varint()):
+            input_offsets.append(self.position)
+            skip(36)
+            skip(read_varint())
+            skip(4)
+            if extended:
+                start = self.position
+                skip(8)
+                skip(read_varint())
+                extended_ranges.append((start, self.position))
+        output_offsets = layout.output_offsets
+        for _ in range(read_varint()):
+            output_offsets.append(self.position)
+            skip(8)
+            skip(read_varint())
+        skip(4)
+        layout.end = self.position
+        return layout
+
+    def skip_transaction(self) -> int:
+        """
+        move past the transaction at the current position, in either standard or extended format
+        :returns: byte length of the transaction as it is in the stream, extended fields included
+        """
+        layout = self.walk_transaction()
+        return layout.end - layout.start
+
+    @classmethod
+    def wrap(cls, stream: Union[str, bytes, bytearray, memoryview, 'TransactionReader', TransactionBytesIO]) -> Union['TransactionReader', TransactionBytesIO]:
+        """
+        :returns: stream itself if it is already a reader, otherwise a new reader over it
+        """
+        return stream if isinstance(stream, (TransactionReader, TransactionBytesIO)) else TransactionReader(stream)
+
+
+class TransactionLayout:
+    """
+    boundaries of a raw transaction recorded in one walk, as positions in the buffer walked
+    BIP-239 extended format is handled here only, the others cut the standard serialization out with spans
+    """
+    __slots__ = ('start', 'end', 'extended', 'input_offsets', 'output_offsets', 'extended_ranges')
+
+    def __init__(self, start: int):
+        self.start: int = start
+        self.end: int = start
+        self.extended: bool = False
+        self.input_offsets: List[int] = []
+        self.output_offsets: List[int] = []
+        # byte ranges only present in extended format, the marker and the context of each output spent
+        self.extended_ranges: List[Tuple[int, int]] = []
+
+    def spans(self) -> List[Tuple[int, int]]:
+        """
+        :returns: byte ranges which make up the transaction in standard format
+        """
+        spans, position = [], self.start
+        for start, end in self.extended_ranges:
+            spans.append((position, start))
+            position = end
+        spans.append((position, self.end))
+        return spans
+
+    def standard_byte_length(self) -> int:
+        return self.end - self.start - sum([end - start for start, end in self.extended_ranges])
+
+    def txid(self, buffer: Union[bytes, bytearray, memoryview]) -> str:
+        """
+        :returns: txid of the transaction in buffer, hashed span by span without joining them
+        """
+        h = hashlib.sha256()
+        for start, end in self.spans():
+            h.update(buffer[start:end])
+        return hashlib.sha256(h.digest()).digest()[::-1].hex()
+
+
+def write_chunks(buffer: Union[bytearray, memoryview, BinaryIO], offset: int, chunks: Iterable[bytes]) -> int:
+    """
+    write chunks into a bytearray (or writable memoryview) starting from offset, or into a writable file object
+    a bytearray is filled in place when preallocated, and grows if it's not large enough, padded with zeros up to offset
+    :returns: offset right after the written chunks
+    """
+    if isinstance(buffer, bytearray) and offset > len(buffer):
+        buffer.extend(bytes(offset - len(buffer)))
+    if isinstance(buffer, (bytearray, memoryview)):
+        for chunk in chunks:
+            end = offset + len(chunk)
+            buffer[offset:end] = chunk
+            offset = end
+    else:
+        for chunk in chunks:
+            buffer.write(chunk)
+            offset += len(chunk)
+    return offset
+
+
+# script types are sent in the compact form by their index here, workers classify locking scripts so that the parent doesn't have to
+_COMPACT_SCRIPT_TYPES: Tuple[ScriptType, ...] = (UnknownScriptType(), P2pkhScriptType(), P2pkScriptType(), OpReturnScriptType(), BareMultisigScriptType())
+_COMPACT_SCRIPT_TYPE_CODES: Dict[type, int] = {type(script_type): code for code, script_type in enumerate(_COMPACT_SCRIPT_TYPES)}
+
+
+def decode_compact(raw: Union[str, bytes]) -> Optional[Tuple]:
+    """
+    decode raw transaction into a compact picklable form made of ints and bytes only
+        (version, locktime, ((outpoint, unlocking_script, sequence), ...), ((satoshi, locking_script, script_type_code), ...))
+    outpoint is the 36 bytes serialized, script_type_code is the index of the script type classified in _COMPACT_SCRIPT_TYPES
+    inputs of extended format transactions are followed by (satoshi, locking_script, script_type_code) of the outputs they spend
+    :returns: None if failed to decode
+    """
+    with suppress(Exception):
+        reader = TransactionReader(raw)
+        read_bytes, read_int, read_varint = reader.read_bytes, reader.read_int, reader.read_varint
+        version = read_int(4)
+        extended = reader.read_extended_marker()
+        tx_inputs = []
+        for _ in range(read_varint()):
+            tx_input = (read_bytes(36), read_bytes(read_varint()), read_int(4))
+            if extended:
+                # (satoshi, locking_script, script_type_code) of the output spent
+                satoshi, locking_script = read_int(8), read_bytes(read_varint())
+                tx_input += (satoshi, locking_script, _COMPACT_SCRIPT_TYPE_CODES[type(classify_script(locking_script))])
+            tx_inputs.append(tx_input)
+        tx_outputs = []
+        for _ in range(read_varint()):
+            satoshi, locking_script = read_int(8), read_bytes(read_varint())
+            tx_outputs.append((satoshi, locking_script, _COMPACT_SCRIPT_TYPE_CODES[type(classify_script(locking_script))]))
+        return version, read_int(4), tuple(tx_inputs), tuple(tx_outputs)
+    return None
+
+
+def decode_compact_chunk(raws: List[Union[str, bytes]]) -> List[Optional[Tuple]]:
+    """
+    process pool worker of Transaction.parse_many
+    """
+    return [decode_compact(raw) for raw in raws]
+
+
+def sign_chunk(jobs: List[Tuple[bytes, bytes]]) -> List[bytes]:
+    """
+    process pool worker of Transaction.sign
+    :param jobs: (private key in bytes, signature hash) pairs, private keys are sent in bytes since PrivateKey is not picklable
+    :returns: DER signatures in the same order as jobs
+    """
+    private_keys: Dict[bytes, PrivateKey] = {private_key_bytes: PrivateKey(private_key_bytes) for private_key_bytes in set([job[0] for job in jobs])}
+    return sign_many([(private_keys[private_key_bytes], signature_hash) for private_key_bytes, signature_hash in jobs])
+
+
+def verify_chunk(jobs: List[Tuple[List[bytes], List[Tuple[bytes, bytes]]]]) -> List[bool]:
+    """
+    process pool worker of Transaction.verify
+    :param jobs: (public keys, [(DER signature, signature hash)]) of inputs
+    :returns: verification result of each input
+    """
+    public_keys: Dict[bytes, Optional[PublicKey]] = {}
+
+    def verify(public_key_bytes: bytes, der: bytes, signature_hash: bytes) -> bool:
+        if public_key_bytes not in public_keys:
+            public_keys[public_key_bytes] = None
+            with suppress(Exception):
+                public_keys[public_key_bytes] = PublicKey(public_key_bytes)
+        with suppress(Exception):
+            return public_keys[public_key_bytes].verify(der, signature_hash, None)
+        return False
+
+    results = []
+    for public_keys_bytes, signatures in jobs:
+        # signatures are matched against public keys in order as OP_CHECKMULTISIG does, a public key is passed once it doesn't match
+        candidates = iter(public_keys_bytes)
+        results.append(all(any(verify(public_key_bytes, der, signature_hash) for public_key_bytes in candidates) for der, signature_hash in signatures))
+    return results
+
+
+def _decode_pushes(script: bytes) -> Optional[List[Union[bytes, int]]]:
+    """
+    :returns: data pushed in bytes, including OP_1NEGATE / OP_1 to OP_16, and other opcodes in int, None if the script is malformed
+    """
+    chunks: List[Union[bytes, int]] = []
+    try:
+        for opcode, pushdata in Script(script).chunks():
+            if pushdata is not None:
+                chunks.append(bytes(pushdata))
+            elif opcode == 0x4f or 0x51 <= opcode <= 0x60:
+                chunks.append(b'\x81' if opcode == 0x4f else bytes([opcode - 0x50]))
+            else:
+                chunks.append(opcode)
+    except ValueError:
+        return None
+    return chunks
+
+
+def _split_signature(signature: Union[bytes, int]) -> Optional[Tuple[bytes, int]]:
+    """
+    :returns: (DER, sighash flag) of a signature pushed in unlocking script, None if it is not a BIP-143 one
+    """
+    if not isinstance(signature, bytes) or len(signature) < 9 or not signature[-1] & SIGHASH.FORKID:
+        return None
+    return signature[:-1], signature[-1]
+
+
+class TrackedList(list):
+    """
+    list held by a TrackedAttribute, which notifies the instance through instance._changed(name) whenever it is modified in place
+    """
+
+    __slots__ = ('instance', 'name')
+
+    def __init__(self, instance, name: str, items: Iterable = ()):
+        super().__init__(items)
+        self.instance = instance
+        self.name: str = name
+
+    def __reduce__(self):
+        return type(self), (self.instance, self.name, list(self))
+
+
+class TrackedDict(dict):
+    """
+    dict held by a TrackedAttribute, which notifies the instance through instance._changed(name) whenever it is modified in place
+    """
+
+    __slots__ = ('instance', 'name')
+
+    def __init__(self, instance, name: str, items: Optional[Dict] = None):
+        super().__init__(items or {})
+        self.instance = instance
+        self.name: str = name
+
+    def __reduce__(self):
+        return type(self), (self.instance, self.name, dict(self))
+
+
+def _notifying(method: Callable) -> Callable:
+    """
+    wrap a method of list or dict which modifies it in place, so that a tracked container notifies its instance afterwards
+    """
+
+    def modify(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self.instance._changed(self.name)
+        return result
+
+    return modify
+
+
+for _name in ['append', 'extend', 'insert', 'remove', 'pop', 'clear', 'sort', 'reverse', '__setitem__', '__delitem__', '__iadd__', '__imul__']:
+    setattr(TrackedList, _name, _notifying(getattr(list, _name)))
+for _name in ['pop', 'popitem', 'clear', 'update', 'setdefault', '__setitem__', '__delitem__', '__ior__']:
+    # dict has no __ior__ before python 3.9
+    if hasattr(dict, _name):
+        setattr(TrackedDict, _name, _notifying(getattr(dict, _name)))
+
+
+class TrackedAttribute:
+    """
+    attribute descriptor which notifies the instance through instance._changed(name) whenever it is assigned
+    with a container of TrackedList or TrackedDict, the value is wrapped in it on first access, so that changes in place notify the instance too
+    """
+
+    def __init__(self, container: Optional[type] = None):
+        self.container: Optional[type] = container
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+        self.attribute = f'_{name}'
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = getattr(instance, self.attribute)
+        if self.container is not None and value is not None and not (type(value) is self.container and value.instance is instance):
+            value = self.container(instance, self.name, value)
+            setattr(instance, self.attribute, value)
+        return value
+
+    def __set__(self, instance, value) -> None:
+        setattr(instance, self.attribute, value)
+        instance._changed(self.name)
+
 
 class TxInput:
+    __slots__ = ('_owner', '_outpoint', '_satoshi', 'height', 'confirmations', '_private_keys', '_script_type', 'locking_script',
+                 '_unlocking_script', '_sequence', 'sighash')
+
+    outpoint = TrackedAttribute()
+    satoshi = TrackedAttribute()
+    private_keys = TrackedAttribute(TrackedList)
+    script_type = TrackedAttribute()
+    unlocking_script = TrackedAttribute()
+    sequence = TrackedAttribute()
 
     def __init__(self, unspent: Optional[Unspent] = None, private_keys: Optional[List[PrivateKey]] = None, unlocking_script: Optional[Script] = None,
                  sequence: int = TRANSACTION_SEQUENCE, sighash: SIGHASH = SIGHASH.ALL_FORKID):
-        self.txid: str = unspent.txid if unspent else ('00' * 32)
-        self.vout: int = unspent.vout if unspent else 0
-        self.satoshi: int = unspent.satoshi if unspent else 0
+        # the transaction this input belongs to, which is notified when the serialization changes
+        self._owner: Optional['Transaction'] = None
+
+        self._outpoint: Outpoint = unspent.outpoint if unspent else NULL_OUTPOINT
+        self._satoshi: int = unspent.satoshi if unspent else 0
         self.height: int = unspent.height if unspent else -1
         self.confirmations: int = unspent.confirmations if unspent else 0
-        self.private_keys: List[PrivateKey] = private_keys or (unspent.private_keys if unspent else [])
-        self.script_type: ScriptType = unspent.script_type if unspent else UnknownScriptType
+        self._private_keys: List[PrivateKey] = private_keys or (unspent.private_keys if unspent else [])
+        self._script_type: ScriptType = unspent.script_type if unspent else UnknownScriptType()
         self.locking_script: Script = unspent.locking_script if unspent else Script()
 
-        self.unlocking_script: Script = unlocking_script
-        self.sequence: int = sequence
+        self._unlocking_script: Script = unlocking_script
+        self._sequence: int = sequence
         self.sighash: SIGHASH = sighash
 
-    def serialize(self) -> bytes:
-        stream = BytesIO()
-        stream.write(bytes.fromhex(self.txid)[::-1])
-        stream.write(self.vout.to_bytes(4, 'little'))
-        stream.write(self.unlocking_script.byte_length_varint() if self.unlocking_script else b'\x00')
-        stream.write(self.unlocking_script.serialize() if self.unlocking_script else b'')
-        stream.write(self.sequence.to_bytes(4, 'little'))
-        return stream.getvalue()
+    @property
+    def txid(self) -> str:
+        return self._outpoint.txid
+
+    @txid.setter
+    def txid(self, txid: str) -> None:
+        self.outpoint = Outpoint(txid, self._outpoint.vout)
+
+    @property
+    def vout(self) -> int:
+        return self._outpoint.vout
+
+    @vout.setter
+    def vout(self, vout: int) -> None:
+        self.outpoint = Outpoint(self._outpoint.txid_bytes, vout)
+
+    # BIP-143 midstates covering each tracked field, None if the field is not serialized
+    _MIDSTATES: Dict[str, Optional[Tuple[str, ...]]] = {
+        'outpoint': ('prevouts',), 'sequence': ('sequence',), 'unlocking_script': (), 'satoshi': None, 'private_keys': None, 'script_type': None,
+    }
+
+    def _changed(self, name: str) -> None:
+        if self._owner is not None:
+            self._owner._drop_totals()
+            midstates = TxInput._MIDSTATES[name]
+            if midstates is not None:
+                self._owner._invalidate(midstates)
+
+    def chunks(self, extended: bool = False) -> Tuple[bytes, ...]:
+        """
+        :param extended: append satoshi and locking script of the output spent, in BIP-239 extended format
+        :returns: serialized fields of this input in order
+        """
+        unlocking_script: bytes = self.unlocking_script.serialize() if self.unlocking_script else b''
+        chunks = (self._outpoint, unsigned_to_varint(len(unlocking_script)), unlocking_script, self.sequence.to_bytes(4, 'little'))
+        if extended:
+            chunks += (self.satoshi.to_bytes(8, 'little'), self.locking_script.byte_length_varint(), self.locking_script.serialize())
+        return chunks
+
+    def serialize(self, extended: bool = False) -> bytes:
+        return b''.join(self.chunks(extended))
+
+    def serialize_into(self, buffer: Union[bytearray, memoryview, BinaryIO], offset: int = 0, extended: bool = False) -> int:
+        """
+        write serialized input into a bytearray at offset, or into a writable file object
+        :returns: offset right after the serialized input
+        """
+        return write_chunks(buffer, offset, self.chunks(extended))
+
+    def byte_length(self) -> int:
+        script_length: int = self.unlocking_script.byte_length() if self.unlocking_script else 0
+        return 40 + len(unsigned_to_varint(script_length)) + script_length
+
+    size = byte_length
 
     def __str__(self) -> str:  # pragma: no cover
-        return f'<TxInput outpoint={self.txid}:{self.vout} satoshi={self.satoshi} locking_script={self.locking_script}>'
+        return f'<TxInput outpoint={self._outpoint} satoshi={self.satoshi} locking_script={self.locking_script}>'
 
     def __repr__(self) -> str:  # pragma: no cover
         return self.__str__()
 
     @classmethod
-    def from_hex(cls, stream: Union[str, bytes, TransactionBytesIO]) -> Optional['TxInput']:
+    def _parsed(cls, outpoint: Outpoint, unlocking_script: Script, sequence: int) -> 'TxInput':
+        """
+        input decoded from a raw transaction, its slots are set as __init__ does without an unspent but with no argument to resolve
+        """
+        tx_input = cls.__new__(cls)
+        tx_input._owner, tx_input._outpoint, tx_input._satoshi, tx_input.height, tx_input.confirmations = None, outpoint, 0, -1, 0
+        tx_input._private_keys, tx_input._script_type, tx_input.locking_script = [], UnknownScriptType(), Script()
+        tx_input._unlocking_script, tx_input._sequence, tx_input.sighash = unlocking_script, sequence, SIGHASH.ALL_FORKID
+        return tx_input
+
+    @classmethod
+    def from_hex(cls, stream: Union[str, bytes, bytearray, memoryview, TransactionReader, TransactionBytesIO], extended: bool = False) -> Optional['TxInput']:
+        """
+        :param extended: input is in BIP-239 extended format, followed by satoshi and locking script of the output spent
+        """
         with suppress(Exception):
-            stream = stream if isinstance(stream, TransactionBytesIO) else TransactionBytesIO(stream if isinstance(stream, bytes) else bytes.fromhex(stream))
-            txid = stream.read_bytes(32)[::-1]
-            assert len(txid) == 32
-            vout = stream.read_int(4)
-            assert vout is not None
+            stream = TransactionReader.wrap(stream)
+            outpoint = Outpoint(stream.read_bytes(36))
             script_length = stream.read_varint()
             assert script_length is not None
             unlocking_script_bytes = stream.read_bytes(script_length)
             sequence = stream.read_int(4)
             assert sequence is not None
-            return TxInput(unspent=Unspent(txid=txid.hex(), vout=vout, satoshi=0, locking_script=Script()), unlocking_script=Script(unlocking_script_bytes), sequence=sequence)
+            tx_input = TxInput._parsed(outpoint, Script(unlocking_script_bytes), sequence)
+            if extended:
+                tx_input._satoshi = stream.read_int(8)
+                tx_input.locking_script = Script(stream.read_bytes(stream.read_varint()))
+                tx_input._script_type = classify_script(tx_input.locking_script)
+            return tx_input
         return None
 
 
 class TxOutput:
+    __slots__ = ('_owner', '_satoshi', '_locking_script', 'script_type')
+
+    satoshi = TrackedAttribute()
+    locking_script = TrackedAttribute()
 
     def __init__(self, out: Union[str, List[Union[str, bytes]], Script], satoshi: int = 0, script_type: ScriptType = UnknownScriptType()):
-        self.satoshi = satoshi
+        # the transaction this output belongs to, which is notified when the serialization changes
+        self._owner: Optional['Transaction'] = None
+
+        self._satoshi: int = satoshi
         if isinstance(out, str):
             # from address
-            self.locking_script: Script = P2pkhScriptType.locking(out)
+            self._locking_script: Script = P2pkhScriptType.locking(out)
             self.script_type: ScriptType = P2pkhScriptType()
-        elif isinstance(out, List):
+        elif isinstance(out, list):
             # from list of pushdata
-            self.locking_script: Script = OpReturnScriptType.locking(out)
+            self._locking_script: Script = OpReturnScriptType.locking(out)
             self.script_type: ScriptType = OpReturnScriptType()
         elif isinstance(out, Script):
             # from locking script
-            self.locking_script: Script = out
+            self._locking_script: Script = out
             self.script_type: ScriptType = script_type
         else:
             raise TypeError('unsupported transaction output type')
 
+    def _changed(self, name: str) -> None:
+        if self._owner is not None:
+            self._owner._drop_totals()
+            self._owner._invalidate(('outputs',))
+
+    def chunks(self) -> Tuple[bytes, ...]:
+        """
+        :returns: serialized fields of this output in order
+        """
+        return self.satoshi.to_bytes(8, 'little'), self.locking_script.byte_length_varint(), self.locking_script.serialize()
+
     def serialize(self) -> bytes:
-        return self.satoshi.to_bytes(8, 'little') + self.locking_script.byte_length_varint() + self.locking_script.serialize()
+        return b''.join(self.chunks())
+
+    def serialize_into(self, buffer: Union[bytearray, memoryview, BinaryIO], offset: int = 0) -> int:
+        """
+        write serialized output into a bytearray at offset, or into a writable file object
+        :returns: offset right after the serialized output
+        """
+        return write_chunks(buffer, offset, self.chunks())
+
+    def byte_length(self) -> int:
+        script_length: int = self.locking_script.byte_length()
+        return 8 + len(unsigned_to_varint(script_length)) + script_length
+
+    size = byte_length
 
     def __str__(self) -> str:  # pragma: no cover
         return f'<TxOutput satoshi={self.satoshi} locking_script={self.locking_script.hex()}>'
@@ -134,27 +622,275 @@ class TxOutput:
         return self.__str__()
 
     @classmethod
-    def from_hex(cls, stream: Union[str, bytes, TransactionBytesIO]) -> Optional['TxOutput']:
+    def _parsed(cls, locking_script: Script, satoshi: int, script_type: ScriptType) -> 'TxOutput':
+        """
+        output decoded from a raw transaction, its slots are set as __init__ does for a locking script
+        """
+        tx_output = cls.__new__(cls)
+        tx_output._owner, tx_output._satoshi, tx_output._locking_script, tx_output.script_type = None, satoshi, locking_script, script_type
+        return tx_output
+
+    @classmethod
+    def from_hex(cls, stream: Union[str, bytes, bytearray, memoryview, TransactionReader, TransactionBytesIO]) -> Optional['TxOutput']:
         with suppress(Exception):
-            stream = stream if isinstance(stream, TransactionBytesIO) else TransactionBytesIO(stream if isinstance(stream, bytes) else bytes.fromhex(stream))
+            stream = TransactionReader.wrap(stream)
             satoshi = stream.read_int(8)
             assert satoshi is not None
             script_length = stream.read_varint()
             assert script_length is not None
             locking_script_bytes = stream.read_bytes(script_length)
-            return TxOutput(out=Script(locking_script_bytes), satoshi=satoshi)
+            return TxOutput._parsed(Script(locking_script_bytes), satoshi, classify_script(locking_script_bytes))
         return None
 
 
+def _read_items(reader: TransactionReader, inputs_count: int, extended: bool) -> Tuple[List[TxInput], List[TxOutput]]:
+    """
+    decode inputs and then outputs of a transaction from reader, which is positioned right after the input count
+    fields are read inline rather than through TxInput.from_hex and TxOutput.from_hex, it's the hot loop of Transaction.from_hex
+    """
+    read_bytes, read_int, read_varint, parse_input, parse_output = reader.read_bytes, reader.read_int, reader.read_varint, TxInput._parsed, TxOutput._parsed
+    tx_inputs = []
+    for _ in range(inputs_count):
+        outpoint = Outpoint(read_bytes(36))
+        unlocking_script = Script(read_bytes(read_varint()))
+        tx_input = parse_input(outpoint, unlocking_script, read_int(4))
+        if extended:
+            tx_input._satoshi = read_int(8)
+            tx_input.locking_script = Script(read_bytes(read_varint()))
+            tx_input._script_type = classify_script(tx_input.locking_script)
+        tx_inputs.append(tx_input)
+    tx_outputs = []
+    for _ in range(read_varint()):
+        satoshi = read_int(8)
+        locking_script_bytes = read_bytes(read_varint())
+        tx_outputs.append(parse_output(Script(locking_script_bytes), satoshi, classify_script(locking_script_bytes)))
+    return tx_inputs, tx_outputs
+
+
+class TxItems(list):
+    """
+    list of transaction inputs or outputs, which notifies the owner transaction on every modification
+    """
+
+    __slots__ = ('owner', 'midstates')
+
+    def __init__(self, owner: 'Transaction', items: Optional[List[Union[TxInput, TxOutput]]] = None, midstates: Tuple[str, ...] = ()):
+        """
+        :param midstates: BIP-143 midstates covering the items, which are invalidated together with the serialization
+        """
+        super().__init__(items or ())
+        self.owner: 'Transaction' = owner
+        self.midstates: Tuple[str, ...] = midstates
+        # the owner drops its running totals when it's given a new list, so items only need adopting
+        self._adopt(self)
+
+    def _adopt(self, items: List[Union[TxInput, TxOutput]]) -> None:
+        for item in items:
+            if item._owner is not None and item._owner is not self.owner:
+                # shared with another transaction which won't be notified any longer, so stop caching there
+                item._owner._cacheable = False
+                item._owner._invalidate()
+            item._owner = self.owner
+        self.owner._invalidate(self.midstates)
+
+    def __reduce__(self):
+        return TxItems._restore, (self.owner, list(self), self.midstates)
+
+    @classmethod
+    def _restore(cls, owner: 'Transaction', items: List[Union[TxInput, TxOutput]], midstates: Tuple[str, ...]) -> 'TxItems':
+        """
+        unpickle without notifying the owner, which is not restored yet, items have their owner restored by themselves
+        """
+        tx_items = cls.__new__(cls)
+        tx_items.owner, tx_items.midstates = owner, midstates
+        list.extend(tx_items, items)
+        return tx_items
+
+    def append(self, item: Union[TxInput, TxOutput]) -> None:
+        self._adopt([item])
+        self.owner._add_totals(self, [item])
+        super().append(item)
+
+    def extend(self, items: List[Union[TxInput, TxOutput]]) -> None:
+        items = list(items)
+        self._adopt(items)
+        self.owner._add_totals(self, items)
+        super().extend(items)
+
+    def insert(self, index: int, item: Union[TxInput, TxOutput]) -> None:
+        self._adopt([item])
+        self.owner._add_totals(self, [item])
+        super().insert(index, item)
+
+    def __setitem__(self, index: Union[int, slice], value) -> None:
+        value = list(value) if isinstance(index, slice) else value
+        self._adopt(value if isinstance(index, slice) else [value])
+        self.owner._drop_totals()
+        super().__setitem__(index, value)
+
+    def __iadd__(self, items: List[Union[TxInput, TxOutput]]) -> 'TxItems':
+        self.extend(items)
+        return self
+
+    def pop(self, index: int = -1) -> Union[TxInput, TxOutput]:
+        self.owner._invalidate(self.midstates)
+        self.owner._drop_totals()
+        return super().pop(index)
+
+    def remove(self, item: Union[TxInput, TxOutput]) -> None:
+        self.owner._invalidate(self.midstates)
+        self.owner._drop_totals()
+        super().remove(item)
+
+    def clear(self) -> None:
+        self.owner._invalidate(self.midstates)
+        self.owner._drop_totals()
+        super().clear()
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        self.owner._invalidate(self.midstates)
+        self.owner._drop_totals()
+        super().__delitem__(index)
+
+    def __imul__(self, n: int) -> 'TxItems':
+        self.owner._invalidate(self.midstates)
+        self.owner._drop_totals()
+        return super().__imul__(n)
+
+    def sort(self, *args, **kwargs) -> None:
+        self.owner._invalidate(self.midstates)
+        super().sort(*args, **kwargs)
+
+    def reverse(self) -> None:
+        self.owner._invalidate(self.midstates)
+        super().reverse()
+
+
+class SighashCache:
+    """
+    BIP-143 midstates of a transaction, hashed on demand and kept until the inputs or outputs they cover change
+        - prevouts: hashPrevouts over outpoints of all the inputs
+        - sequence: hashSequence over nSequence of all the inputs
+        - outputs: hashOutputs over all the outputs
+    """
+
+    MIDSTATES: Tuple[str, ...] = ('prevouts', 'sequence', 'outputs')
+
+    def __init__(self, tx: 'Transaction'):
+        self.tx: 'Transaction' = tx
+        self._midstates: Dict[str, bytes] = {}
+
+    def invalidate(self, midstates: Iterable[str] = MIDSTATES) -> None:
+        for midstate in midstates:
+            self._midstates.pop(midstate, None)
+
+    def _midstate(self, name: str, compute: Callable[[], bytes]) -> bytes:
+        midstate = self._midstates.get(name)
+        if midstate is None:
+            midstate = compute()
+            if self.tx._cacheable:
+                self._midstates[name] = midstate
+        return midstate
+
+    def hash_prevouts(self) -> bytes:
+        return self._midstate('prevouts', lambda: hash256(b''.join([tx_input.outpoint for tx_input in self.tx.tx_inputs])))
+
+    def hash_sequence(self) -> bytes:
+        return self._midstate('sequence', lambda: hash256(b''.join([tx_input.sequence.to_bytes(4, 'little') for tx_input in self.tx.tx_inputs])))
+
+    def hash_outputs(self) -> bytes:
+        return self._midstate('outputs', lambda: hash256(b''.join([tx_output.serialize() for tx_output in self.tx.tx_outputs])))
+
+    def _select(self, index: int, sighash: int) -> Tuple[bytes, bytes, bytes]:
+        """
+        :returns: hashPrevouts, hashSequence and hashOutputs committed by the input specified by index
+        """
+        # hash previous outs
+        if not sighash & SIGHASH.ANYONECANPAY:
+            # if anyone can pay is not set
+            hash_prevouts = self.hash_prevouts()
+        else:
+            hash_prevouts = b'\x00' * 32
+        # hash sequence
+        if not sighash & SIGHASH.ANYONECANPAY and sighash & 0x1f != SIGHASH.SINGLE and sighash & 0x1f != SIGHASH.NONE:
+            # if none of anyone can pay, single, none is set
+            hash_sequence = self.hash_sequence()
+        else:
+            hash_sequence = b'\x00' * 32
+        # hash outputs
+        if sighash & 0x1f != SIGHASH.SINGLE and sighash & 0x1f != SIGHASH.NONE:
+            # if neither single nor none
+            hash_outputs = self.hash_outputs()
+        elif sighash & 0x1f == SIGHASH.SINGLE and index < len(self.tx.tx_outputs):
+            # if single and the input index is smaller than the number of outputs
+            hash_outputs = hash256(self.tx.tx_outputs[index].serialize())
+        else:
+            hash_outputs = b'\x00' * 32
+        return hash_prevouts, hash_sequence, hash_outputs
+
+    def digest(self, index: int) -> bytes:
+        """
+        :returns: digest of the input specified by index, other inputs are not touched except for the cached midstates
+        """
+        assert 0 <= index < len(self.tx.tx_inputs), f'index out of range [0, {len(self.tx.tx_inputs)})'
+        tx_input = self.tx.tx_inputs[index]
+        return self.tx._digest(tx_input, *self._select(index, tx_input.sighash))
+
+    def signature_hash(self, index: int, sighash: Optional[int] = None, script_code: Optional[bytes] = None) -> bytes:
+        """
+        :param sighash: sighash flag to commit instead of the one of the input, such as the flag found in a signature
+        :param script_code: script code to commit instead of the locking script spent, such as the part after OP_CODESEPARATOR
+        :returns: double SHA-256 of the digest of the input specified by index, hashed without building the digest
+        """
+        assert 0 <= index < len(self.tx.tx_inputs), f'index out of range [0, {len(self.tx.tx_inputs)})'
+        tx_input = self.tx.tx_inputs[index]
+        sighash = tx_input.sighash if sighash is None else sighash
+        return self.tx._signature_hash(tx_input, *self._select(index, sighash), sighash, script_code)
+
+    def _map(self, compute: Callable[[TxInput, bytes, bytes, bytes], bytes]) -> List[bytes]:
+        # inputs of the same sighash flag share the midstates they commit, except for SIGHASH_SINGLE
+        selected: Dict[int, Tuple[bytes, bytes, bytes]] = {}
+        results = []
+        for index, tx_input in enumerate(self.tx.tx_inputs):
+            midstates = selected.get(tx_input.sighash)
+            if midstates is None:
+                midstates = self._select(index, tx_input.sighash)
+                if tx_input.sighash & 0x1f != SIGHASH.SINGLE:
+                    selected[tx_input.sighash] = midstates
+            results.append(compute(tx_input, *midstates))
+        return results
+
+    def digests(self) -> List[bytes]:
+        return self._map(self.tx._digest)
+
+    def signature_hashes(self) -> List[bytes]:
+        return self._map(self.tx._signature_hash)
+
+
 class Transaction:
+    version = TrackedAttribute()
+    locktime = TrackedAttribute()
+    # passed to estimate unlocking scripts, so the estimated byte length is dropped when it changes
+    kwargs = TrackedAttribute(TrackedDict)
 
     def __init__(self, tx_inputs: Optional[List[TxInput]] = None, tx_outputs: Optional[List[TxOutput]] = None,
                  version: int = TRANSACTION_VERSION, locktime: int = TRANSACTION_LOCKTIME, fee_rate: Optional[float] = None,
                  chain: Optional[Chain] = None, provider: Optional[Provider] = None, **kwargs):
-        self.tx_inputs: List[TxInput] = tx_inputs or []
-        self.tx_outputs: List[TxOutput] = tx_outputs or []
-        self.version: int = version
-        self.locktime: int = locktime
+        # memoized serialization and txid, dropped whenever inputs, outputs, version or locktime change
+        self._serialized: Optional[bytes] = None
+        self._txid: Optional[str] = None
+        # False if any input or output is shared with another transaction, then changes can't be tracked reliably
+        self._cacheable: bool = True
+        self._sighash_cache: SighashCache = SighashCache(self)
+        # running totals of (satoshi in, satoshi out), and estimated byte length of inputs and outputs after signing
+        # both are updated as items are added, and recomputed on demand after items are removed or changed
+        self._totals: Optional[List[int]] = None
+        self._estimated: Optional[int] = None
+
+        self.tx_inputs = tx_inputs
+        self.tx_outputs = tx_outputs
+        self._version: int = version
+        self._locktime: int = locktime
         self.fee_rate: float = fee_rate if fee_rate is not None else TRANSACTION_FEE_RATE
 
         self.chain: Chain = chain
@@ -164,17 +900,120 @@ class Transaction:
 
         self.kwargs: Dict[str, Any] = dict(**kwargs) or {}
 
-    def serialize(self) -> bytes:
-        raw = self.version.to_bytes(4, 'little')
-        raw += unsigned_to_varint(len(self.tx_inputs))
+    @property
+    def tx_inputs(self) -> TxItems:
+        return self._tx_inputs
+
+    @tx_inputs.setter
+    def tx_inputs(self, tx_inputs: Optional[List[TxInput]]) -> None:
+        self._drop_totals()
+        self._tx_inputs: TxItems = TxItems(self, tx_inputs, ('prevouts', 'sequence'))
+
+    @property
+    def tx_outputs(self) -> TxItems:
+        return self._tx_outputs
+
+    @tx_outputs.setter
+    def tx_outputs(self, tx_outputs: Optional[List[TxOutput]]) -> None:
+        self._drop_totals()
+        self._tx_outputs: TxItems = TxItems(self, tx_outputs, ('outputs',))
+
+    @property
+    def sighash_cache(self) -> SighashCache:
+        return self._sighash_cache
+
+    def _changed(self, name: str) -> None:
+        if name == 'kwargs':
+            # not serialized
+            self._drop_totals()
+            return
+        # neither version nor locktime is covered by midstates
+        self._invalidate(())
+
+    def _invalidate(self, midstates: Iterable[str] = SighashCache.MIDSTATES) -> None:
+        self._serialized = None
+        self._txid = None
+        self._sighash_cache.invalidate(midstates)
+
+    def _drop_totals(self) -> None:
+        self._totals = None
+        self._estimated = None
+
+    def _estimated_input_byte_length(self, tx_input: TxInput, **kwargs) -> int:
+        if tx_input.unlocking_script is not None:
+            # unlocking script already set
+            return tx_input.byte_length()
+        return 41 + tx_input.script_type.estimated_unlocking_byte_length(private_keys=tx_input.private_keys, **{**self.kwargs, **kwargs})
+
+    def _add_totals(self, tx_items: TxItems, items: List[Union[TxInput, TxOutput]]) -> None:
+        """
+        account items being added to tx_items into the running totals, if they are up to date
+        """
+        if self._totals is None:
+            return
+        satoshi = sum([item.satoshi for item in items])
+        self._totals[0 if tx_items is self._tx_inputs else 1] += satoshi
+        if self._estimated is not None:
+            try:
+                if tx_items is self._tx_inputs:
+                    self._estimated += sum([self._estimated_input_byte_length(tx_input) for tx_input in items])
+                else:
+                    self._estimated += sum([tx_output.byte_length() for tx_output in items])
+            except Exception:
+                # unable to estimate yet, let estimated_byte_length raise when it's asked for
+                self._estimated = None
+
+    def _running_totals(self) -> List[int]:
+        """
+        :returns: [satoshi in, satoshi out]
+        """
+        if self._totals is not None and self._cacheable:
+            return self._totals
+        totals = [sum([tx_input.satoshi for tx_input in self.tx_inputs]), sum([tx_output.satoshi for tx_output in self.tx_outputs])]
+        if self._cacheable:
+            self._totals = totals
+        return totals
+
+    def chunks(self, extended: bool = False) -> Iterator[bytes]:
+        """
+        :param extended: in BIP-239 extended format if True
+        :returns: generator of serialized fields of this transaction in order
+        """
+        yield self.version.to_bytes(4, 'little')
+        if extended:
+            yield TRANSACTION_EXTENDED_FORMAT_MARKER
+        yield unsigned_to_varint(len(self.tx_inputs))
         for tx_input in self.tx_inputs:
-            raw += tx_input.serialize()
-        raw += unsigned_to_varint(len(self.tx_outputs))
+            yield from tx_input.chunks(extended)
+        yield unsigned_to_varint(len(self.tx_outputs))
         for tx_output in self.tx_outputs:
-            raw += tx_output.serialize()
-        raw += self.locktime.to_bytes(4, 'little')
+            yield from tx_output.chunks()
+        yield self.locktime.to_bytes(4, 'little')
+
+    def serialize(self, extended: bool = False) -> bytes:
+        """
+        :param extended: in BIP-239 extended format if True, which carries satoshi and locking script of the outputs spent by inputs
+        """
+        if extended:
+            return b''.join(self.chunks(extended))
+        if self._serialized is not None:
+            return self._serialized
+        raw = b''.join(self.chunks())
+        if self._cacheable:
+            self._serialized = raw
         return raw
 
+    def serialize_into(self, buffer: Union[bytearray, memoryview, BinaryIO], offset: int = 0, extended: bool = False) -> int:
+        """
+        write serialized transaction into a bytearray at offset, or stream it into a writable file object or socket file
+        transaction is written field by field, so large scripts are never concatenated into one temporary bytes
+        size a preallocated bytearray with byte_length()
+        :returns: offset right after the serialized transaction
+        """
+        if not extended and self._serialized is not None:
+            return write_chunks(buffer, offset, [self._serialized])
+        return write_chunks(buffer, offset, self.chunks(extended))
+
     def add_input(self, tx_input: Union[TxInput, Unspent]) -> 'Transaction':  # pragma: no cover
         if isinstance(tx_input, TxInput):
             self.tx_inputs.append(tx_input)
@@ -198,13 +1037,18 @@ class Transaction:
             self.add_output(tx_output)
         return self
 
-    def hex(self) -> str:  # pragma: no cover
-        return self.serialize().hex()
+    def hex(self, extended: bool = False) -> str:
+        return self.serialize(extended).hex()
 
     raw = hex
 
     def txid(self) -> str:
-        return hash256(self.serialize())[::-1].hex()
+        if self._txid is not None:
+            return self._txid
+        txid = hash256(self.serialize())[::-1].hex()
+        if self._cacheable:
+            self._txid = txid
+        return txid
 
     def _digest(self, tx_input: TxInput, hash_prevouts: bytes, hash_sequence: bytes, hash_outputs: bytes) -> bytes:
         """
@@ -228,8 +1072,7 @@ class Transaction:
         # 3
         stream.write(hash_sequence)
         # 4
-        stream.write(bytes.fromhex(tx_input.txid)[::-1])
-        stream.write(tx_input.vout.to_bytes(4, 'little'))
+        stream.write(tx_input.outpoint)
         # 5
         stream.write(tx_input.locking_script.byte_length_varint())
         stream.write(tx_input.locking_script.serialize())
@@ -245,78 +1088,168 @@ class Transaction:
         stream.write(tx_input.sighash.to_bytes(4, 'little'))
         return stream.getvalue()
 
+    def _signature_hash(self, tx_input: TxInput, hash_prevouts: bytes, hash_sequence: bytes, hash_outputs: bytes, sighash: Optional[int] = None,
+                        script_code: Optional[bytes] = None) -> bytes:
+        """
+        hash256 of the BIP-143 digest returned by _digest, its fields are fed into SHA-256 one by one
+        so that the locking script spent, which can be megabytes, is never copied into a digest
+        """
+        h = hashlib.sha256(self.version.to_bytes(4, 'little'))
+        h.update(hash_prevouts)
+        h.update(hash_sequence)
+        h.update(tx_input.outpoint)
+        script_code = tx_input.locking_script.serialize() if script_code is None else script_code
+        h.update(unsigned_to_varint(len(script_code)))
+        h.update(script_code)
+        h.update(tx_input.satoshi.to_bytes(8, 'little'))
+        h.update(tx_input.sequence.to_bytes(4, 'little'))
+        h.update(hash_outputs)
+        h.update(self.locktime.to_bytes(4, 'little'))
+        h.update((tx_input.sighash if sighash is None else sighash).to_bytes(4, 'little'))
+        return hashlib.sha256(h.digest()).digest()
+
     def digests(self) -> List[bytes]:
         """
         :returns: the digests of unsigned transaction
         """
-        _hash_prevouts = hash256(b''.join([bytes.fromhex(tx_input.txid)[::-1] + tx_input.vout.to_bytes(4, 'little') for tx_input in self.tx_inputs]))
-        _hash_sequence = hash256(b''.join([tx_input.sequence.to_bytes(4, 'little') for tx_input in self.tx_inputs]))
-        _hash_outputs = hash256(b''.join([tx_output.serialize() for tx_output in self.tx_outputs]))
-        digests = []
-        for i in range(len(self.tx_inputs)):
-            sighash = self.tx_inputs[i].sighash
-            # hash previous outs
-            if not sighash & SIGHASH.ANYONECANPAY:
-                # if anyone can pay is not set
-                hash_prevouts = _hash_prevouts
-            else:
-                hash_prevouts = b'\x00' * 32
-            # hash sequence
-            if not sighash & SIGHASH.ANYONECANPAY and sighash & 0x1f != SIGHASH.SINGLE and sighash & 0x1f != SIGHASH.NONE:
-                # if none of anyone can pay, single, none is set
-                hash_sequence = _hash_sequence
-            else:
-                hash_sequence = b'\x00' * 32
-            # hash outputs
-            if sighash & 0x1f != SIGHASH.SINGLE and sighash & 0x1f != SIGHASH.NONE:
-                # if neither single nor none
-                hash_outputs = _hash_outputs
-            elif sighash & 0x1f == SIGHASH.SINGLE and i < len(self.tx_outputs):
-                # if single and the input index is smaller than the number of outputs
-                hash_outputs = hash256(self.tx_outputs[i].serialize())
-            else:
-                hash_outputs = b'\x00' * 32
-            digests.append(self._digest(self.tx_inputs[i], hash_prevouts, hash_sequence, hash_outputs))
-        return digests
+        return self._sighash_cache.digests()
 
     def digest(self, index: int) -> bytes:
         """
         :returns: digest of the input specified by index
         """
-        assert 0 <= index < len(self.tx_inputs), f'index out of range [0, {len(self.tx_inputs)})'
-        return self.digests()[index]
+        return self._sighash_cache.digest(index)
 
-    def sign(self, bypass: bool = True, **kwargs) -> 'Transaction':  # pragma: no cover
+    def signature_hashes(self) -> List[bytes]:
+        """
+        :returns: hash256 of the digests, which are the messages actually signed, in the same order as digests
+        """
+        return self._sighash_cache.signature_hashes()
+
+    def signature_hash(self, index: int) -> bytes:
+        """
+        :returns: hash256 of the digest of the input specified by index
+        """
+        return self._sighash_cache.signature_hash(index)
+
+    def sign(self, bypass: bool = True, workers: Optional[int] = None, chunksize: int = 256, **kwargs) -> 'Transaction':  # pragma: no cover
         """
         :bypass: if True then ONLY sign inputs which unlocking script is None, otherwise sign all the inputs
+        :param workers: sign across a process pool of this many worker processes if greater than 1, otherwise in the current process
+        :param chunksize: number of signatures sent to a worker at a time
         sign all inputs according to their script type
         """
-        digests = self.digests()
-        for i in range(len(self.tx_inputs)):
-            tx_input = self.tx_inputs[i]
-            if tx_input.unlocking_script is None or not bypass:
-                signatures: List[bytes] = [private_key.sign(digests[i]) for private_key in tx_input.private_keys]
-                payload = {'signatures': signatures, 'private_keys': tx_input.private_keys, 'sighash': tx_input.sighash}
-                tx_input.unlocking_script = tx_input.script_type.unlocking(**payload, **{**self.kwargs, **kwargs})
+        Transaction.sign_all([self], bypass, workers, chunksize, **kwargs)
         return self
 
+    @classmethod
+    def sign_all(cls, transactions: List['Transaction'], bypass: bool = True, workers: Optional[int] = None, chunksize: int = 256,
+                 **kwargs) -> List['Transaction']:
+        """
+        sign many transactions together, so that signatures of all of them are spread across one process pool
+        parameters are the same as Transaction.sign
+        """
+        plans: List[Tuple['Transaction', List[int]]] = []
+        jobs: List[Tuple[PrivateKey, bytes]] = []
+        for t in transactions:
+            signature_hashes = t.signature_hashes()
+            indexes = [i for i, tx_input in enumerate(t.tx_inputs) if tx_input.unlocking_script is None or not bypass]
+            jobs.extend([(private_key, signature_hashes[i]) for i in indexes for private_key in t.tx_inputs[i].private_keys])
+            plans.append((t, indexes))
+        if workers is not None and workers > 1 and len(jobs) > chunksize:
+            jobs = [(private_key.serialize(), signature_hash) for private_key, signature_hash in jobs]
+            chunks = [jobs[i:i + chunksize] for i in range(0, len(jobs), chunksize)]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                signatures = iter([signature for chunk in executor.map(sign_chunk, chunks) for signature in chunk])
+        else:
+            signatures = iter(sign_many(jobs))
+        # unlocking scripts are assembled in the current process, in the order of inputs
+        for t, indexes in plans:
+            for i in indexes:
+                tx_input = t.tx_inputs[i]
+                payload = {'signatures': [next(signatures) for _ in tx_input.private_keys], 'private_keys': tx_input.private_keys, 'sighash': tx_input.sighash}
+                tx_input.unlocking_script = tx_input.script_type.unlocking(**payload, **{**t.kwargs, **kwargs})
+        return transactions
+
+    def _verification_job(self, index: int) -> Optional[Tuple[List[bytes], List[Tuple[bytes, bytes]]]]:
+        """
+        match the unlocking script of input against the locking script it spends, P2PKH, P2PK and bare multisig are supported
+        :returns: (public keys, [(DER signature, signature hash)]) to verify, None if the input fails without verifying signatures
+        """
+        tx_input = self.tx_inputs[index]
+        if tx_input.unlocking_script is None or not tx_input.locking_script:
+            return None
+        locking, unlocking = _decode_pushes(tx_input.locking_script.serialize()), _decode_pushes(tx_input.unlocking_script.serialize())
+        if locking is None or unlocking is None or any([isinstance(chunk, int) for chunk in unlocking]):
+            return None
+        if len(locking) == 5 and locking[:2] == [0x76, 0xa9] and locking[3:] == [0x88, 0xac] and len(unlocking) == 2:
+            # P2PKH
+            public_keys, signatures = [unlocking[1]], unlocking[:1]
+            if hash160(unlocking[1]) != locking[2]:
+                return None
+        elif len(locking) == 2 and locking[1] == 0xac and isinstance(locking[0], bytes) and len(unlocking) == 1:
+            # P2PK
+            public_keys, signatures = [locking[0]], unlocking
+        elif len(locking) >= 4 and locking[-1] == 0xae and all([isinstance(chunk, bytes) for chunk in locking[:-1]]):
+            # bare multisig, OP_0 is consumed by OP_CHECKMULTISIG
+            public_keys, threshold = locking[1:-2], int.from_bytes(locking[0], 'little')
+            if int.from_bytes(locking[-2], 'little') != len(public_keys) or not 1 <= threshold <= len(public_keys):
+                return None
+            if len(unlocking) != threshold + 1 or unlocking[0] != b'':
+                return None
+            signatures = unlocking[1:]
+        else:
+            return None
+        pairs = []
+        for signature in signatures:
+            split = _split_signature(signature)
+            if split is None:
+                return None
+            der, sighash = split
+            pairs.append((der, self._sighash_cache.signature_hash(index, sighash)))
+        return public_keys, pairs
+
+    def verify(self, workers: Optional[int] = None, chunksize: int = 256) -> List[int]:
+        """
+        verify signatures in unlocking scripts of all the inputs, satoshi and locking script they spend must be set
+        inputs spending script types other than P2PKH, P2PK and bare multisig are considered failed
+        :param workers: verify across a process pool of this many worker processes if greater than 1, otherwise in the current process
+        :param chunksize: number of inputs sent to a worker at a time
+        :returns: indexes of the inputs failed, empty if all the inputs are good
+        """
+        jobs = [self._verification_job(i) for i in range(len(self.tx_inputs))]
+        indexes = [i for i, job in enumerate(jobs) if job is not None]
+        jobs = [jobs[i] for i in indexes]
+        if workers is not None and workers > 1 and len(jobs) > chunksize:
+            chunks = [jobs[i:i + chunksize] for i in range(0, len(jobs), chunksize)]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = [result for chunk in executor.map(verify_chunk, chunks) for result in chunk]
+        else:
+            results = verify_chunk(jobs)
+        verified = set([i for i, result in zip(indexes, results) if result])
+        return [i for i in range(len(self.tx_inputs)) if i not in verified]
+
     def satoshi_total_in(self) -> int:
-        return sum([tx_input.satoshi for tx_input in self.tx_inputs])
+        return self._running_totals()[0]
 
     def satoshi_total_out(self) -> int:
-        return sum([tx_output.satoshi for tx_output in self.tx_outputs])
+        return self._running_totals()[1]
 
     def fee(self) -> int:
         """
         :returns: actual fee paid of this transaction under the current state
         """
-        return self.satoshi_total_in() - self.satoshi_total_out()
+        satoshi_total_in, satoshi_total_out = self._running_totals()
+        return satoshi_total_in - satoshi_total_out
 
     def byte_length(self) -> int:
         """
         :returns: actual byte length of this transaction under the current state
         """
-        return len(self.serialize())
+        if self._serialized is not None:
+            return len(self._serialized)
+        byte_length = 8 + len(unsigned_to_varint(len(self.tx_inputs))) + len(unsigned_to_varint(len(self.tx_outputs)))
+        return byte_length + sum([tx_input.byte_length() for tx_input in self.tx_inputs]) + sum([tx_output.byte_length() for tx_output in self.tx_outputs])
 
     size = byte_length
 
@@ -326,15 +1259,15 @@ class Transaction:
         if transaction has already signed, it will return the same value as function byte_length
         """
         estimated_length = 4 + len(unsigned_to_varint(len(self.tx_inputs))) + len(unsigned_to_varint(len(self.tx_outputs))) + 4
-        for tx_input in self.tx_inputs:
-            if tx_input.unlocking_script is not None:
-                # unlocking script already set
-                estimated_length += len(tx_input.serialize())
-            else:
-                estimated_length += 41 + tx_input.script_type.estimated_unlocking_byte_length(private_keys=tx_input.private_keys, **{**self.kwargs, **kwargs})
-        for tx_output in self.tx_outputs:
-            estimated_length += 8 + len(tx_output.locking_script.byte_length_varint()) + tx_output.locking_script.byte_length()
-        return estimated_length
+        if not kwargs and self._estimated is not None and self._cacheable:
+            return estimated_length + self._estimated
+        # running total is kept for the default kwargs only
+        self._running_totals()
+        items_length = sum([self._estimated_input_byte_length(tx_input, **kwargs) for tx_input in self.tx_inputs])
+        items_length += sum([tx_output.byte_length() for tx_output in self.tx_outputs])
+        if not kwargs and self._cacheable:
+            self._estimated = items_length
+        return estimated_length + items_length
 
     estimated_size = estimated_byte_length
 
@@ -390,25 +1323,240 @@ class Transaction:
         return unspents
 
     @classmethod
-    def from_hex(cls, stream: Union[str, bytes, TransactionBytesIO]) -> Optional['Transaction']:
+    def from_hex(cls, stream: Union[str, bytes, bytearray, memoryview, TransactionReader, TransactionBytesIO]) -> Optional['Transaction']:
+        """
+        parse transaction from hex string, bytes-like object, or a reader positioned at the start of a transaction
+        BIP-239 extended format is detected automatically
+        """
         with suppress(Exception):
-            stream = stream if isinstance(stream, TransactionBytesIO) else TransactionBytesIO(stream if isinstance(stream, bytes) else bytes.fromhex(stream))
-            t = Transaction()
-            t.version = stream.read_int(4)
-            assert t.version is not None
+            stream = TransactionReader.wrap(stream)
+            version = stream.read_int(4)
+            assert version is not None
+            extended = stream.read_extended_marker()
             inputs_count = stream.read_varint()
             assert inputs_count is not None
-            for _ in range(inputs_count):
-                _input = TxInput.from_hex(stream)
-                assert _input is not None
-                t.tx_inputs.append(_input)
-            outputs_count = stream.read_varint()
-            assert outputs_count is not None
-            for _ in range(outputs_count):
-                _output = TxOutput.from_hex(stream)
-                assert _output is not None
-                t.tx_outputs.append(_output)
-            t.locktime = stream.read_int(4)
-            assert t.locktime is not None
-            return t
+            # items are collected in plain lists and handed to the transaction at once, so it adopts them and drops caches once
+            if isinstance(stream, TransactionReader):
+                tx_inputs, tx_outputs = _read_items(stream, inputs_count, extended)
+            else:
+                tx_inputs = []
+                for _ in range(inputs_count):
+                    _input = TxInput.from_hex(stream, extended)
+                    assert _input is not None
+                    tx_inputs.append(_input)
+                outputs_count = stream.read_varint()
+                assert outputs_count is not None
+                tx_outputs = []
+                for _ in range(outputs_count):
+                    _output = TxOutput.from_hex(stream)
+                    assert _output is not None
+                    tx_outputs.append(_output)
+            locktime = stream.read_int(4)
+            assert locktime is not None
+            return Transaction(tx_inputs, tx_outputs, version, locktime)
+        return None
+
+    @classmethod
+    def from_compact(cls, compact: Optional[Tuple]) -> Optional['Transaction']:
+        """
+        build transaction from the compact form given by decode_compact
+        """
+        if compact is None:
+            return None
+        version, locktime, compact_inputs, compact_outputs = compact
+        # slots are set directly, script types come classified, and items are adopted in bulk by the constructor
+        parse_input, parse_output, script_types = TxInput._parsed, TxOutput._parsed, _COMPACT_SCRIPT_TYPES
+        tx_inputs = []
+        for compact_input in compact_inputs:
+            tx_input = parse_input(Outpoint(compact_input[0]), Script(compact_input[1]), compact_input[2])
+            if len(compact_input) > 3:
+                tx_input._satoshi, tx_input.locking_script, tx_input._script_type = compact_input[3], Script(compact_input[4]), script_types[compact_input[5]]
+            tx_inputs.append(tx_input)
+        tx_outputs = [parse_output(Script(locking_script), satoshi, script_types[code]) for satoshi, locking_script, code in compact_outputs]
+        return Transaction(tx_inputs, tx_outputs, version, locktime)
+
+    @classmethod
+    def parse_many(cls, raws: Iterable[Union[str, bytes]], workers: Optional[int] = None, chunksize: int = 64,
+                   compact: bool = False) -> List[Optional[Union['Transaction', Tuple]]]:
+        """
+        decode many raw transactions across a process pool
+        workers only decode raw transactions into the compact form, the parent still builds every transaction from it
+        building and unpickling take more than half the time of decoding in the current process, so it can't be twice as fast
+        however many workers there are, see benchmarks/parse_many.py, set compact to get the compact form and skip building
+        :param raws: raw transactions in hex string or bytes
+        :param workers: number of worker processes, default to the number of CPUs, decode in the current process if 1
+        :param chunksize: number of raw transactions sent to a worker at a time
+        :param compact: return the compact form given by decode_compact rather than transactions if True
+        :returns: transactions in the same order as raws, None for the ones failed to decode
+        """
+        return list(cls.iter_parse_many(raws, workers, chunksize, compact=compact))
+
+    @classmethod
+    def iter_parse_many(cls, raws: Iterable[Union[str, bytes]], workers: Optional[int] = None, chunksize: int = 64,
+                        prefetch: int = 2, compact: bool = False) -> Iterator[Optional[Union['Transaction', Tuple]]]:
+        """
+        streaming variant of parse_many, raws are consumed lazily and at most (workers * prefetch) chunks are in flight
+        :returns: generator of transactions in the same order as raws, None for the ones failed to decode
+        """
+        workers = workers or os.cpu_count() or 1
+        raws = iter(raws)
+        if workers <= 1:
+            yield from map(decode_compact if compact else cls.from_hex, raws)
+            return
+
+        def build(compacts: List[Optional[Tuple]]) -> List[Optional[Union['Transaction', Tuple]]]:
+            return compacts if compact else [cls.from_compact(c) for c in compacts]
+
+        chunks = iter(lambda: list(islice(raws, chunksize)), [])
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(decode_compact_chunk, chunk))
+                if len(pending) >= workers * prefetch:
+                    yield from build(pending.popleft().result())
+            while pending:
+                yield from build(pending.popleft().result())
+
+    @classmethod
+    def iter_file(cls, path: str, index_only: bool = False, lazy: bool = False) -> Iterator[Union[Tuple[int, 'Transaction'], Tuple[int, 'LazyTransaction'], Tuple[int, int, str]]]:
+        """
+        iterate over a file of concatenated raw transactions, the file is memory-mapped and never loaded as a whole
+        :param path: path of the file
+        :param index_only: yield (offset, byte_length, txid) without decoding transactions if True
+        :param lazy: yield LazyTransaction instead of Transaction if True
+        :returns: generator of (offset, transaction), or (offset, byte_length, txid) if index_only
+        """
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                reader = TransactionReader(mm)
+                try:
+                    while reader.remaining():
+                        offset = reader.position
+                        if index_only:
+                            try:
+                                layout = reader.walk_transaction()
+                            except AssertionError:
+                                raise ValueError(f'invalid transaction at offset {offset}') from None
+                            yield offset, layout.end - layout.start, layout.txid(reader.buffer)
+                        else:
+                            t = LazyTransaction.from_hex(reader) if lazy else cls.from_hex(reader)
+                            if t is None:
+                                raise ValueError(f'invalid transaction at offset {offset}')
+                            yield offset, t
+                finally:
+                    # the map can't be closed while its buffer is still exported
+                    reader.buffer.release()
+
+
+class LazySequence(Sequence):
+    """
+    read-only sequence whose items are decoded by index on first access, then cached
+    """
+
+    def __init__(self, decode: Callable[[int], Any], length: int):
+        self._decode = decode
+        self._items: List[Any] = [None] * length
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._items)))]
+        item = self._items[index]
+        if item is None:
+            index = index + len(self._items) if index < 0 else index
+            item = self._decode(index)
+            self._items[index] = item
+        return item
+
+
+class LazyTransaction:
+    """
+    transaction view over its raw bytes, only the boundaries of inputs and outputs are recorded in one scan
+    inputs and outputs are decoded on demand when indexed, modifying them has no effect on the raw bytes
+    """
+
+    def __init__(self, raw: Union[str, bytes, bytearray, memoryview]):
+        self._raw: bytes = bytes.fromhex(raw) if isinstance(raw, str) else bytes(raw)
+        reader = TransactionReader(self._raw)
+        layout = reader.walk_transaction()
+        assert reader.remaining() == 0, 'unexpected bytes after transaction'
+        self._layout: TransactionLayout = layout
+        self.version: int = int.from_bytes(self._raw[:4], 'little')
+        self.extended: bool = layout.extended
+        self._input_offsets: List[int] = layout.input_offsets
+        self._output_offsets: List[int] = layout.output_offsets
+        self.locktime: int = int.from_bytes(self._raw[-4:], 'little')
+        self.tx_inputs: LazySequence = LazySequence(self._decode_input, len(self._input_offsets))
+        self.tx_outputs: LazySequence = LazySequence(self._decode_output, len(self._output_offsets))
+        self._txid: Optional[str] = None
+
+    def _decode_input(self, index: int) -> TxInput:
+        return TxInput.from_hex(TransactionReader(self._raw, self._input_offsets[index]), self.extended)
+
+    def _decode_output(self, index: int) -> TxOutput:
+        return TxOutput.from_hex(TransactionReader(self._raw, self._output_offsets[index]))
+
+    def input(self, index: int) -> TxInput:
+        return self.tx_inputs[index]
+
+    def output(self, index: int) -> TxOutput:
+        return self.tx_outputs[index]
+
+    def serialize(self, extended: bool = False) -> bytes:
+        """
+        :returns: the original raw bytes, or raw bytes in standard format cut out of an extended format transaction
+        """
+        if extended:
+            if not self.extended:
+                raise ValueError('transaction was not given in extended format')
+            return self._raw
+        if not self.extended:
+            return self._raw
+        return b''.join([self._raw[start:end] for start, end in self._layout.spans()])
+
+    def hex(self, extended: bool = False) -> str:
+        return self.serialize(extended).hex()
+
+    raw = hex
+
+    def txid(self) -> str:
+        if self._txid is None:
+            self._txid = hash256(self.serialize())[::-1].hex()
+        return self._txid
+
+    def byte_length(self) -> int:
+        """
+        :returns: byte length in standard format
+        """
+        return self._layout.standard_byte_length()
+
+    size = byte_length
+
+    def to_transaction(self) -> Transaction:
+        """
+        :returns: fully decoded transaction
+        """
+        return Transaction.from_hex(self._raw)
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f'<LazyTransaction txid={self.txid()} inputs={len(self.tx_inputs)} outputs={len(self.tx_outputs)}>'
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return self.__str__()
+
+    @classmethod
+    def from_hex(cls, stream: Union[str, bytes, bytearray, memoryview, TransactionReader]) -> Optional['LazyTransaction']:
+        """
+        parse transaction from hex string, bytes-like object, or a reader positioned at the start of a transaction
+        """
+        with suppress(Exception):
+            if not isinstance(stream, TransactionReader):
+                return LazyTransaction(stream)
+            start = stream.position
+            stream.skip_transaction()
+            return LazyTransaction(stream.buffer[start:stream.position])
         return None
@@ -1,5 +1,7 @@
+from functools import lru_cache
 from typing import List, Optional
 
+from .outpoint import Outpoint
 from ..constants import Chain
 from ..keys import PrivateKey
 from ..script.script import Script
@@ -8,15 +10,33 @@ from ..service.provider import Provider
 from ..service.service import Service
 
 
+@lru_cache(maxsize=1024)
+def _p2pkh_locking_bytes(address: str) -> bytes:
+    return P2pkhScriptType.locking(address).serialize()
+
+
+def p2pkh_locking_script(address: str) -> Script:
+    """
+    address is decoded once for unspents of the same address, each of them gets its own locking script over the same immutable bytes
+    """
+    return Script(_p2pkh_locking_bytes(address))
+
+
 class Unspent:
+    __slots__ = ('outpoint', 'satoshi', 'height', 'confirmations', 'private_keys', 'address', 'script_type', 'locking_script')
 
     def __init__(self, **kwargs):
         """
         if script type is P2PKH, then set either one private key or address is enough
         otherwise, then essential to set both locking script and script type
+        outpoint can be set either by txid and vout, or by an Outpoint
         """
-        self.txid: str = kwargs.get('txid')
-        self.vout: int = int(kwargs.get('vout'))
+        outpoint = kwargs.get('outpoint')
+        if not isinstance(outpoint, Outpoint):
+            txid = kwargs.get('txid')
+            assert txid and len(txid) == 64, 'bad unspent'
+            outpoint = Outpoint(txid, int(kwargs.get('vout')))
+        self.outpoint: Outpoint = outpoint
         self.satoshi: int = int(kwargs.get('satoshi'))
         self.height: int = -1 if kwargs.get('height') is None else kwargs.get('height')
         self.confirmations: int = 0 if kwargs.get('confirmations') is None else kwargs.get('confirmations')
@@ -28,23 +48,39 @@ class Unspent:
         # if script type is not set then check address, otherwise check script type only
         self.script_type: ScriptType = kwargs.get('script_type') or (P2pkhScriptType() if self.address else UnknownScriptType())
         # if locking script is not set then parse from address, otherwise check locking script only
-        self.locking_script: Script = kwargs.get('locking_script') or (P2pkhScriptType.locking(self.address) if self.address else Script())
+        self.locking_script: Script = kwargs.get('locking_script') or (p2pkh_locking_script(self.address) if self.address else Script())
         # validate
-        assert self.txid and len(self.txid) == 64 and self.vout is not None and self.satoshi is not None and self.locking_script, 'bad unspent'
+        assert self.satoshi is not None and self.locking_script, 'bad unspent'
+
+    @property
+    def txid(self) -> str:
+        return self.outpoint.txid
+
+    @txid.setter
+    def txid(self, txid: str) -> None:
+        self.outpoint = Outpoint(txid, self.outpoint.vout)
+
+    @property
+    def vout(self) -> int:
+        return self.outpoint.vout
+
+    @vout.setter
+    def vout(self, vout: int) -> None:
+        self.outpoint = Outpoint(self.outpoint.txid_bytes, vout)
 
     def __str__(self) -> str:  # pragma: no cover
-        return f'<Unspent outpoint={self.txid}:{self.vout} satoshi={self.satoshi} script={self.locking_script}>'
+        return f'<Unspent outpoint={self.outpoint} satoshi={self.satoshi} script={self.locking_script}>'
 
     def __repr__(self) -> str:  # pragma: no cover
         return self.__str__()
 
     def __eq__(self, o: object) -> bool:  # pragma: no cover
         if isinstance(o, Unspent):
-            return self.txid == o.txid and self.vout == o.vout
+            return self.outpoint == o.outpoint
         return super().__eq__(o)
 
     def __hash__(self) -> int:  # pragma: no cover
-        return f'{self.txid}:{self.vout}'.__hash__()
+        return hash(self.outpoint)
 
     @classmethod
     def get_unspents(cls, chain: Optional[Chain] = None, provider: Optional[Provider] = None, **kwargs) -> List['Unspent']:
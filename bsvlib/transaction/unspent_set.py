@@ -0,0 +1,252 @@
+import sys
+from array import array
+from typing import List, Optional, Iterable, Dict, Tuple, Iterator, Union, Callable
+
+from .outpoint import Outpoint
+from .transaction import TransactionReader
+from .unspent import Unspent
+from ..keys import PrivateKey
+from ..script import type as script_types
+from ..script.script import Script
+from ..script.type import ScriptType, UnknownScriptType
+from ..utils import unsigned_to_varint
+
+
+class UnspentSet:
+    """
+    columnar container of unspents, txid (in internal byte order) / vout / satoshi / height / confirmations are stored in compact arrays
+    locking script, script type, address and private keys are shared by all the unspents of the same owner
+    unspents are indexed by outpoint, and handed out as Unspent views
+    """
+
+    MAGIC: bytes = b'BSVU\x02'
+
+    def __init__(self, unspents: Optional[Iterable[Unspent]] = None):
+        self._txids: bytearray = bytearray()
+        self._vouts: array = array('I')
+        self._satoshis: array = array('Q')
+        self._heights: array = array('q')
+        self._confirmations: array = array('q')
+        self._owners: array = array('I')
+        self._index: Dict[Outpoint, int] = {}
+        # (locking_script, script_type, address, private_keys)
+        self._profiles: List[Tuple[Script, ScriptType, Optional[str], List[PrivateKey]]] = []
+        self._profile_index: Dict[Tuple, int] = {}
+        if unspents:
+            self.add_many(unspents)
+
+    def _outpoint(self, row: int) -> Outpoint:
+        return Outpoint(self._txids[row * 32:row * 32 + 32], self._vouts[row])
+
+    def _profile(self, locking_script: Script, script_type: ScriptType, address: Optional[str], private_keys: List[PrivateKey]) -> int:
+        key = (locking_script.serialize(), id(script_type), address, tuple([id(private_key) for private_key in private_keys]))
+        profile = self._profile_index.get(key)
+        if profile is None:
+            profile = len(self._profiles)
+            self._profiles.append((locking_script, script_type, address, private_keys))
+            self._profile_index[key] = profile
+        return profile
+
+    def _append(self, outpoint: Outpoint, satoshi: int, height: int, confirmations: int, profile: int) -> None:
+        self._index[outpoint] = len(self._vouts)
+        self._txids += outpoint.txid_bytes
+        self._vouts.append(outpoint.vout)
+        self._satoshis.append(satoshi)
+        self._heights.append(height)
+        self._confirmations.append(confirmations)
+        self._owners.append(profile)
+
+    def add(self, unspent: Unspent) -> bool:
+        """
+        :returns: False if the outpoint is already in this set
+        """
+        outpoint = unspent.outpoint
+        if outpoint in self._index:
+            return False
+        profile = self._profile(unspent.locking_script, unspent.script_type, unspent.address, unspent.private_keys)
+        self._append(outpoint, unspent.satoshi, unspent.height, unspent.confirmations, profile)
+        return True
+
+    def add_many(self, unspents: Iterable[Unspent]) -> int:
+        """
+        :returns: number of unspents added
+        """
+        return sum([self.add(unspent) for unspent in unspents])
+
+    extend = add_many
+
+    def _remove_row(self, row: int) -> None:
+        """
+        move the last row into the removed one, so that removal is O(1)
+        """
+        last = len(self._vouts) - 1
+        del self._index[self._outpoint(row)]
+        if row != last:
+            self._txids[row * 32:row * 32 + 32] = self._txids[last * 32:]
+            for column in [self._vouts, self._satoshis, self._heights, self._confirmations, self._owners]:
+                column[row] = column[last]
+            self._index[self._outpoint(row)] = row
+        del self._txids[last * 32:]
+        for column in [self._vouts, self._satoshis, self._heights, self._confirmations, self._owners]:
+            column.pop()
+
+    def remove(self, txid: str, vout: int) -> bool:
+        """
+        :returns: False if the outpoint is not in this set
+        """
+        row = self._index.get(Outpoint(txid, vout))
+        if row is None:
+            return False
+        self._remove_row(row)
+        return True
+
+    def remove_many(self, outpoints: Iterable[Union[Unspent, Outpoint, Tuple[str, int]]]) -> int:
+        """
+        remove spent coins, either unspents, outpoints or tuples (txid, vout)
+        :returns: number of unspents removed
+        """
+        removed = 0
+        for outpoint in outpoints:
+            row = self._index.get(UnspentSet._key(outpoint))
+            if row is not None:
+                self._remove_row(row)
+                removed += 1
+        return removed
+
+    @staticmethod
+    def _key(o: Union[Unspent, Outpoint, Tuple[str, int]]) -> Outpoint:
+        if isinstance(o, Unspent):
+            return o.outpoint
+        return o if isinstance(o, Outpoint) else Outpoint(*o)
+
+    def _unspent(self, row: int) -> Unspent:
+        locking_script, script_type, address, private_keys = self._profiles[self._owners[row]]
+        return Unspent(outpoint=self._outpoint(row), satoshi=self._satoshis[row], height=self._heights[row],
+                       confirmations=self._confirmations[row], private_keys=private_keys, address=address, script_type=script_type,
+                       locking_script=locking_script)
+
+    def get(self, txid: str, vout: int) -> Optional[Unspent]:
+        row = self._index.get(Outpoint(txid, vout))
+        return None if row is None else self._unspent(row)
+
+    def pop(self) -> Unspent:
+        """
+        remove and return the unspent in the last row, so that an UnspentSet can be passed to create_transaction directly
+        """
+        if not self._vouts:
+            raise IndexError('pop from empty UnspentSet')
+        unspent = self._unspent(len(self._vouts) - 1)
+        self._remove_row(len(self._vouts) - 1)
+        return unspent
+
+    def __len__(self) -> int:
+        return len(self._vouts)
+
+    def __iter__(self) -> Iterator[Unspent]:
+        for row in range(len(self._vouts)):
+            yield self._unspent(row)
+
+    def __contains__(self, o: object) -> bool:
+        return UnspentSet._key(o) in self._index
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f'<UnspentSet count={len(self)} satoshi={self.total()}>'
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return self.__str__()
+
+    def total(self) -> int:
+        """
+        :returns: sum of satoshi
+        """
+        return sum(self._satoshis)
+
+    def _subset(self, rows: Iterable[int]) -> 'UnspentSet':
+        subset = UnspentSet()
+        # profiles are shared, row owners keep pointing to the same ones
+        subset._profiles, subset._profile_index = self._profiles, self._profile_index
+        for row in rows:
+            subset._append(self._outpoint(row), self._satoshis[row], self._heights[row], self._confirmations[row], self._owners[row])
+        return subset
+
+    def select_where(self, min_satoshi: Optional[int] = None, max_satoshi: Optional[int] = None, min_height: Optional[int] = None,
+                     max_height: Optional[int] = None, predicate: Optional[Callable[[int, int, int], bool]] = None) -> 'UnspentSet':
+        """
+        filter over the columns, bounds are inclusive
+        :param predicate: called with (satoshi, height, confirmations) of every row
+        :returns: a new set of the matched unspents
+        """
+        rows = range(len(self._vouts))
+        if min_satoshi is not None:
+            rows = [row for row in rows if self._satoshis[row] >= min_satoshi]
+        if max_satoshi is not None:
+            rows = [row for row in rows if self._satoshis[row] <= max_satoshi]
+        if min_height is not None:
+            rows = [row for row in rows if self._heights[row] >= min_height]
+        if max_height is not None:
+            rows = [row for row in rows if self._heights[row] <= max_height]
+        if predicate is not None:
+            rows = [row for row in rows if predicate(self._satoshis[row], self._heights[row], self._confirmations[row])]
+        return self._subset(rows)
+
+    def confirmed(self, min_conf: int = 1, current_height: Optional[int] = None) -> 'UnspentSet':
+        """
+        :param current_height: count confirmations from block height if set, otherwise use confirmations of unspents
+        :returns: a new set of unspents with at least min_conf confirmations
+        """
+        if current_height is None:
+            return self._subset([row for row, confirmations in enumerate(self._confirmations) if confirmations >= min_conf])
+        return self._subset([row for row, height in enumerate(self._heights) if height > 0 and current_height - height + 1 >= min_conf])
+
+    def save(self, path: str) -> None:
+        """
+        save to a compact binary file, private keys are NOT saved
+        """
+        columns = [self._vouts, self._satoshis, self._heights, self._confirmations, self._owners]
+        if sys.byteorder == 'big':  # pragma: no cover
+            columns = [array(column.typecode, column) for column in columns]
+            for column in columns:
+                column.byteswap()
+        with open(path, 'wb') as f:
+            f.write(UnspentSet.MAGIC)
+            f.write(unsigned_to_varint(len(self._profiles)))
+            for locking_script, script_type, address, _ in self._profiles:
+                for field in [locking_script.serialize(), type(script_type).__name__.encode('ascii'), (address or '').encode('ascii')]:
+                    f.write(unsigned_to_varint(len(field)) + field)
+            f.write(unsigned_to_varint(len(self)))
+            f.write(self._txids)
+            for column in columns:
+                f.write(column.tobytes())
+
+    @classmethod
+    def load(cls, path: str, private_keys: Optional[List[PrivateKey]] = None) -> 'UnspentSet':
+        """
+        load from a file written by save
+        :param private_keys: attach to the unspents of P2PKH addresses they correspond to
+        """
+        keys: Dict[str, PrivateKey] = {private_key.address(): private_key for private_key in private_keys or []}
+        unspent_set = UnspentSet()
+        with open(path, 'rb') as f:
+            reader = TransactionReader(f.read())
+        assert reader.buffer[:len(UnspentSet.MAGIC)] == UnspentSet.MAGIC, 'bad unspent set file'
+        reader.skip(len(UnspentSet.MAGIC))
+        for _ in range(reader.read_varint()):
+            locking_script = Script(reader.read_bytes(reader.read_varint()))
+            script_type = getattr(script_types, reader.read_bytes(reader.read_varint()).decode('ascii'), None)
+            script_type = script_type() if isinstance(script_type, type) and issubclass(script_type, ScriptType) else UnknownScriptType()
+            address = reader.read_bytes(reader.read_varint()).decode('ascii') or None
+            unspent_set._profiles.append((locking_script, script_type, address, [keys[address]] if address in keys else []))
+        count = reader.read_varint()
+        unspent_set._txids = bytearray(reader.read_view(count * 32))
+        columns = [array(column.typecode) for column in [unspent_set._vouts, unspent_set._satoshis, unspent_set._heights, unspent_set._confirmations, unspent_set._owners]]
+        for column in columns:
+            column.frombytes(reader.read_view(count * column.itemsize))
+            if sys.byteorder == 'big':  # pragma: no cover
+                column.byteswap()
+        unspent_set._vouts, unspent_set._satoshis, unspent_set._heights, unspent_set._confirmations, unspent_set._owners = columns
+        for profile, (locking_script, script_type, address, keys_attached) in enumerate(unspent_set._profiles):
+            key = (locking_script.serialize(), id(script_type), address, tuple([id(private_key) for private_key in keys_attached]))
+            unspent_set._profile_index[key] = profile
+        for row in range(count):
+            unspent_set._index[unspent_set._outpoint(row)] = row
+        return unspent_set
@@ -2,8 +2,10 @@ from concurrent.futures import ThreadPoolExecutor
 from itertools import repeat
 from typing import Optional, List, Tuple, Union, Dict, Any
 
+from .coin_selection import CoinSelector, UnspentPool, discard_spent
 from .constants import Chain, THREAD_POOL_MAX_EXECUTORS
 from .keys import PrivateKey
+from .payout import create_payouts, create_fan_outs
 from .service.provider import Provider
 from .service.service import Service
 from .transaction.transaction import Transaction, TxOutput, InsufficientFunds
@@ -32,6 +34,8 @@ class Wallet:
         if keys:
             self.add_keys(keys)
         self.unspents: List[Unspent] = []
+        # unspents indexed for coin selectors, built on first use and kept in step with unspents until they are refreshed
+        self.pool: Optional[UnspentPool] = None
         self.kwargs: Dict[str, Any] = dict(**kwargs) or {}
 
     def add_key(self, key: Union[str, int, bytes, PrivateKey, None] = None) -> 'Wallet':
@@ -54,6 +58,7 @@ class Wallet:
     def get_unspents(self, refresh: bool = False, **kwargs) -> List[Unspent]:
         if refresh:
             self.unspents = []
+            self.pool = None
             chain: Chain = kwargs.pop('chain', None) or self.chain
             provider: Provider = kwargs.pop('provider', None) or self.provider
             with ThreadPoolExecutor(max_workers=THREAD_POOL_MAX_EXECUTORS) as executor:
@@ -62,6 +67,14 @@ class Wallet:
                     self.unspents.extend(r)
         return self.unspents
 
+    def get_pool(self, refresh: bool = False, **kwargs) -> UnspentPool:
+        """
+        :returns: unspents of this wallet in an UnspentPool, reused by coin selectors across transactions
+        """
+        if refresh or self.pool is None:
+            self.pool = UnspentPool(self.get_unspents(refresh, **kwargs))
+        return self.pool
+
     def get_balance(self, refresh: bool = False, **kwargs) -> int:
         if refresh:
             chain: Chain = kwargs.pop('chain', None) or self.chain
@@ -74,7 +87,7 @@ class Wallet:
     def create_transaction(self, unspents: Optional[List[Unspent]] = None, outputs: Optional[List[Tuple]] = None,
                            leftover: Optional[str] = None, fee_rate: Optional[float] = None,
                            combine: bool = False, pushdatas: Optional[List[Union[str, bytes]]] = None,
-                           change: bool = True, sign: bool = True, **kwargs) -> Transaction:  # pragma: no cover
+                           change: bool = True, sign: bool = True, selector: Optional[CoinSelector] = None, **kwargs) -> Transaction:  # pragma: no cover
         """create a transaction
         :param unspents: list of unspents, will refresh from service if None
         :param outputs: list of tuple (address, satoshi). if None then sweep all the unspents to leftover
@@ -84,16 +97,50 @@ class Wallet:
         :param pushdatas: list of OP_RETURN pushdata
         :param change: automatically add a P2PKH change output if True
         :param sign: sign the transaction if True
+        :param selector: coin selection strategy, pick the last unspent first if None
         :param kwargs: passing to get unspents and create transaction
         """
+        if selector and not unspents and outputs and not combine:
+            # coins are picked out of the pool of this wallet, which is refreshed only before its first use
+            pool = self.get_pool(refresh=self.pool is None, **{**self.kwargs, **kwargs})
+            t = create_transaction(pool, outputs, leftover, fee_rate, combine, pushdatas, change, sign, self.chain, self.provider, selector,
+                                   **{**self.kwargs, **kwargs})
+            discard_spent(self.unspents, pool, [tx_input.outpoint for tx_input in t.tx_inputs])
+            return t
+        unspents: List[Unspent] = unspents or self.get_unspents(refresh=True, **{**self.kwargs, **kwargs})
+        return create_transaction(unspents, outputs, leftover, fee_rate, combine, pushdatas, change, sign, self.chain, self.provider, selector,
+                                  **{**self.kwargs, **kwargs})
+
+    def create_payouts(self, recipients: List[Tuple[str, int]], unspents: Optional[List[Unspent]] = None, leftover: Optional[str] = None,
+                       fee_rate: Optional[float] = None, max_outputs: int = 1000, max_byte_length: Optional[int] = None,
+                       selector: Optional[CoinSelector] = None, sign: bool = True, workers: Optional[int] = None, **kwargs) -> List[Transaction]:  # pragma: no cover
+        """create transactions paying a large recipient list
+        :param recipients: list of tuple (address, satoshi)
+        :param unspents: list of unspents, will refresh from service if None
+        other parameters are the same as function create_payouts
+        """
+        unspents: List[Unspent] = unspents or self.get_unspents(refresh=True, **{**self.kwargs, **kwargs})
+        return create_payouts(unspents, recipients, leftover, fee_rate, max_outputs, max_byte_length, selector, sign, workers,
+                              chain=self.chain, provider=self.provider, **{**self.kwargs, **kwargs})
+
+    def create_fan_outs(self, satoshi: int, count: Optional[int] = None, unspents: Optional[List[Unspent]] = None, address: Optional[str] = None,
+                        fee_rate: Optional[float] = None, max_outputs: int = 1000, sign: bool = True, workers: Optional[int] = None,
+                        **kwargs) -> List[Transaction]:  # pragma: no cover
+        """create transactions splitting coins of this wallet into outputs of the same satoshi
+        :param satoshi: value of each output split out
+        :param count: number of outputs to split out, as many as coins can afford if None
+        :param unspents: list of unspents, will refresh from service if None
+        other parameters are the same as function create_fan_outs
+        """
         unspents: List[Unspent] = unspents or self.get_unspents(refresh=True, **{**self.kwargs, **kwargs})
-        return create_transaction(unspents, outputs, leftover, fee_rate, combine, pushdatas, change, sign, self.chain, self.provider, **{**self.kwargs, **kwargs})
+        return create_fan_outs(unspents, satoshi, count, address, fee_rate, max_outputs, sign, workers,
+                               chain=self.chain, provider=self.provider, **{**self.kwargs, **kwargs})
 
 
 def create_transaction(unspents: List[Unspent], outputs: Optional[List[Tuple]] = None, leftover: Optional[str] = None,
                        fee_rate: Optional[float] = None, combine: bool = False, pushdatas: Optional[List[Union[str, bytes]]] = None,
                        change: bool = True, sign: bool = True, chain: Optional[Chain] = None, provider: Optional[Provider] = None,
-                       **kwargs) -> Transaction:  # pragma: no cover
+                       selector: Optional[CoinSelector] = None, **kwargs) -> Transaction:  # pragma: no cover
     """create a transaction
     :param unspents: list of unspents, will refresh from service if None
     :param outputs: list of tuple (address, satoshi). if None then sweep all the unspents to leftover
@@ -105,6 +152,8 @@ def create_transaction(unspents: List[Unspent], outputs: Optional[List[Tuple]] =
     :param sign: sign the transaction if True
     :param chain: network chain
     :param provider: service provider
+    :param selector: coin selection strategy, pick the last unspent first if None
+        unspents can be given in an UnspentPool, so that its index is built once and reused across transactions
     :param kwargs: passing to get unspents and create transaction
     """
     if not unspents:
@@ -114,15 +163,21 @@ def create_transaction(unspents: List[Unspent], outputs: Optional[List[Tuple]] =
         t.add_output(TxOutput(pushdatas))
     if outputs:
         t.add_outputs([TxOutput(output[0], output[1]) for output in outputs])
-    # pick unspent
-    picked_unspents: List[Unspent] = []
-    while unspents and (combine or not outputs or t.fee() < t.estimated_fee()):
-        unspent = unspents.pop()
-        picked_unspents.append(unspent)
-        t.add_input(unspent)
-    if t.fee() < t.estimated_fee():
-        unspents.extend(picked_unspents)
-        raise InsufficientFunds(f'require {t.estimated_fee() + t.satoshi_total_out()} satoshi but only {t.satoshi_total_in()}')
+    if selector and outputs and not combine:
+        pool = unspents if isinstance(unspents, UnspentPool) else UnspentPool(unspents)
+        picked_unspents: List[Unspent] = selector.select(pool, t)
+        # the coins picked are removed from the unspents given
+        discard_spent(unspents, pool, picked_unspents)
+    else:
+        # pick unspent
+        picked_unspents: List[Unspent] = []
+        while unspents and (combine or not outputs or t.fee() < t.estimated_fee()):
+            unspent = unspents.pop()
+            picked_unspents.append(unspent)
+            t.add_input(unspent)
+        if t.fee() < t.estimated_fee():
+            unspents.extend(picked_unspents)
+            raise InsufficientFunds(f'require {t.estimated_fee() + t.satoshi_total_out()} satoshi but only {t.satoshi_total_in()}')
     if change:
         t.add_change(leftover)
     if sign:
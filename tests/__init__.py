@@ -0,0 +1,12 @@
+from bsvlib.keys import Key
+from bsvlib.transaction.unspent import Unspent
+
+k = Key('L5agPjZKceSTkhqZF2dmFptT5LFrbr6ZGPvP7u4A6dvhTrr71WZ9')
+
+
+def unspents(satoshis, heights=None):
+    """
+    unspents of key k with distinct outpoints, one for each satoshi
+    """
+    heights = heights or [-1] * len(satoshis)
+    return [Unspent(txid=f'{i:064x}', vout=i, satoshi=satoshi, height=height, private_keys=[k]) for i, (satoshi, height) in enumerate(zip(satoshis, heights))]
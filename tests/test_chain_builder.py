@@ -0,0 +1,54 @@
+import pytest
+
+from bsvlib.chain_builder import ChainBuilder
+from bsvlib.keys import Key
+from bsvlib.transaction.transaction import Transaction, TxInput, TxOutput, InsufficientFunds
+from . import k, unspents
+
+address = Key().address()
+
+
+def test_chain_builder():
+    items = unspents([100000])
+    builder = ChainBuilder(items, max_depth=3)
+    assert len(builder) == 1 and builder.total() == 100000 and items[0] in builder
+
+    transactions = [builder.create_transaction([(address, 1000)]) for _ in range(3)]
+    for depth, (parent, t) in enumerate(zip([None] + transactions, transactions), start=1):
+        assert builder.depth(t.txid()) == depth and t.verify() == []
+        if parent:
+            # spends the change of the one before
+            assert t.tx_inputs[0].outpoint.txid == parent.txid() and t.tx_inputs[0].outpoint.vout == 1
+            assert t.tx_inputs[0].satoshi == parent.tx_outputs[1].satoshi
+    assert items[0] not in builder
+    # the change of the last one is beyond the ancestor depth
+    assert len(builder) == 0 and builder.total() == 0
+    with pytest.raises(InsufficientFunds, match=r'require 1022 satoshi but only 0 spendable within ancestor depth 3'):
+        builder.create_transaction([(address, 1000)])
+
+    assert builder.emit() == transactions and builder.emit() == []
+    builder.confirm([transactions[0].txid(), 'ff' * 32])
+    assert builder.transactions() == transactions[1:] and builder.emit() == []
+    assert builder.depth(transactions[0].txid()) == 0 and builder.depth(transactions[2].txid()) == 2
+    assert len(builder) == 1
+    t = builder.create_transaction([(address, 1000)])
+    assert builder.depth(t.txid()) == 3 and builder.emit() == [t]
+
+
+def test_chain_builder_shallowest_first():
+    builder = ChainBuilder(unspents([100000, 50000]), max_depth=2)
+    first = builder.create_transaction([(address, 1000)])
+    # the other confirmed unspent is taken before the change
+    second = builder.create_transaction([(address, 1000)])
+    assert builder.depth(first.txid()) == builder.depth(second.txid()) == 1
+    third = builder.create_transaction([(address, 1000)])
+    assert builder.depth(third.txid()) == 2 and builder.transactions() == [first, second, third]
+
+    # transactions built elsewhere
+    t = Transaction().add_input(TxInput(builder.take())).add_output(TxOutput(address, 1000)).add_change().sign()
+    builder.add_transaction(t)
+    assert builder.depth(t.txid()) == 2 and len(builder) == 0
+    with pytest.raises(ValueError, match=r'ancestor depth 3, beyond 2'):
+        builder.add_transaction(Transaction().add_input(t.to_unspent(1, private_keys=[k])).add_output(TxOutput(address, 1000)).sign())
+    with pytest.raises(InsufficientFunds):
+        builder.take()
@@ -0,0 +1,126 @@
+import random
+
+import pytest
+
+from bsvlib.coin_selection import FenwickTree, UnspentPool, LargestFirst, OldestFirst, Knapsack, BranchAndBound
+from bsvlib.transaction.transaction import Transaction, TxOutput, InsufficientFunds
+from bsvlib.transaction.unspent import Unspent
+from bsvlib.transaction.unspent_set import UnspentSet
+from bsvlib.wallet import create_transaction
+from . import k, unspents
+
+
+def funded(t: Transaction) -> bool:
+    return t.fee() >= t.estimated_fee()
+
+
+def test_fenwick_tree():
+    rng = random.Random(0)
+    values = [rng.randint(0, 5) for _ in range(100)]
+    tree = FenwickTree(values)
+    for _ in range(200):
+        slot, delta = rng.randrange(100), rng.randint(0, 3)
+        values[slot] += delta
+        tree.add(slot, delta)
+        end = rng.randint(0, 100)
+        assert tree.prefix(end) == sum(values[:end])
+        k_th = rng.randint(1, sum(values))
+        slot = tree.search(k_th)
+        assert sum(values[:slot]) < k_th <= sum(values[:slot + 1])
+    assert FenwickTree([]).prefix(0) == 0
+
+
+def test_unspent_pool():
+    items = unspents([500, 100, 300, 200, 400], [10, 5, -1, 20, 1])
+    pool = UnspentPool(items)
+    assert len(pool) == 5 and pool.total() == 1500
+    assert [unspent.satoshi for unspent in pool] == [100, 200, 300, 400, 500]
+    assert pool._unspents[pool._ceiling(250)].satoshi == 300 and pool._ceiling(501) is None
+    assert pool._count_below(300) == 3 and pool._count_below(99) == 0
+
+    assert pool.pop() == items[0] and items[0] not in pool and len(pool) == 4 and pool.total() == 1000
+    assert pool.remove_many([items[2], items[2], unspents([1])[0]]) == 1
+    assert [unspent.satoshi for unspent in pool] == [100, 200, 400]
+    assert pool._unspents[pool._ceiling(250)].satoshi == 400
+    assert pool._unspents[pool._oldest()] == items[4]
+    pool.remove_many([items[4]])
+    assert pool._unspents[pool._oldest()] == items[1]
+
+    # taken out ones are put back, new ones rebuild the index
+    assert pool.add_many([items[0], items[0], Unspent(txid='ff' * 32, vout=0, satoshi=250, private_keys=[k])]) == 2
+    assert [unspent.satoshi for unspent in pool] == [100, 200, 250, 500] and pool.total() == 1050
+    assert pool.add(items[1]) is False and pool.add(items[2]) is True
+    assert [unspent.satoshi for unspent in pool] == [100, 200, 250, 300, 500]
+    for _ in range(5):
+        pool.pop()
+    assert len(pool) == 0 and pool.total() == 0 and pool._largest() is None and pool._oldest() is None
+    with pytest.raises(IndexError):
+        pool.pop()
+
+
+def test_selectors():
+    # each input costs 74 satoshi, a transaction with one P2PKH output costs 22 satoshi more
+    satoshis = [20000, 6100, 4100, 3000, 2000]
+    outputs = [TxOutput(k.address(), 10000)]
+
+    def select(selector, heights=None):
+        pool = UnspentPool(unspents(satoshis, heights))
+        t = Transaction().add_outputs(outputs)
+        picked = selector.select(pool, t)
+        assert funded(t) and len(pool) == len(satoshis) - len(picked)
+        assert [tx_input.outpoint for tx_input in t.tx_inputs] == [unspent.outpoint for unspent in picked]
+        assert all([unspent not in pool for unspent in picked])
+        return sorted([unspent.satoshi for unspent in picked])
+
+    assert select(LargestFirst()) == [20000]
+    assert select(OldestFirst(), [-1, 3, 1, -1, 2]) == [2000, 4100, 6100]
+    # no change left
+    assert select(BranchAndBound()) == [4100, 6100]
+    assert sum(select(Knapsack(seed=1))) < 20000
+    # the single unspent is no worse than any subset of the smaller ones
+    satoshis = [10100, 6100, 4100]
+    assert select(Knapsack(seed=1)) == [10100]
+    # nothing within the range of no change, then fall back
+    satoshis = [30000, 5000, 5000]
+    assert select(BranchAndBound()) == select(BranchAndBound(fallback=LargestFirst())) == [30000]
+
+    # not enough, then neither the pool nor the transaction is changed
+    for selector in [LargestFirst(), OldestFirst(), Knapsack(), BranchAndBound()]:
+        pool = UnspentPool(unspents([3000, 3000, 3000]))
+        t = Transaction().add_outputs(outputs)
+        with pytest.raises(InsufficientFunds, match=r'require 10244 satoshi but only 9000'):
+            selector.select(pool, t)
+        assert len(pool) == 3 and pool.total() == 9000 and t.tx_inputs == []
+
+
+def test_branch_and_bound():
+    rng = random.Random(0)
+    satoshis = [rng.randint(1000, 50000) for _ in range(2000)]
+    pool = UnspentPool(unspents(satoshis))
+    for payment in [12345, 54321, 100000]:
+        t = Transaction().add_output(TxOutput(k.address(), payment))
+        picked = BranchAndBound(fallback=LargestFirst()).select(pool, t)
+        # paid without change
+        assert funded(t) and t.add_change().tx_outputs[-1].satoshi == payment
+        pool.add_many(picked)
+
+
+def test_create_transaction():
+    outputs = [(k.address(), 10000)]
+    items = unspents([20000, 6100, 4100, 3000, 2000])
+    t = create_transaction(items, outputs, k.address(), selector=BranchAndBound())
+    assert len(t.tx_outputs) == 1 and sorted([tx_input.satoshi for tx_input in t.tx_inputs]) == [4100, 6100] and t.verify() == []
+    # the coins picked are removed from the unspents given
+    assert sorted([unspent.satoshi for unspent in items]) == [2000, 3000, 20000]
+
+    s = UnspentSet(unspents([20000, 6100, 4100, 3000, 2000]))
+    t = create_transaction(s, outputs, k.address(), selector=LargestFirst())
+    assert [tx_input.satoshi for tx_input in t.tx_inputs] == [20000] and len(t.tx_outputs) == 2 and len(s) == 4
+
+    pool = UnspentPool(unspents([20000, 6100, 4100, 3000, 2000]))
+    create_transaction(pool, outputs, k.address(), selector=BranchAndBound())
+    t = create_transaction(pool, outputs, k.address(), selector=BranchAndBound(fallback=LargestFirst()))
+    assert [tx_input.satoshi for tx_input in t.tx_inputs] == [20000] and len(pool) == 2
+    with pytest.raises(InsufficientFunds):
+        create_transaction(pool, outputs, k.address(), selector=LargestFirst())
+    assert len(pool) == 2
@@ -0,0 +1,143 @@
+import pytest
+
+from bsvlib.constants import OP, SIGHASH
+from bsvlib.hash import hash256
+from bsvlib.keys import Key
+from bsvlib.script.interpreter import Interpreter, ScriptLimits, ScriptError, encode_num, decode_num, cast_to_bool, DISPATCH_TABLE
+from bsvlib.script.script import Script
+from bsvlib.transaction.transaction import Transaction, TxOutput
+from bsvlib.transaction.unspent import Unspent
+from bsvlib.utils import encode_int, encode_pushdata
+from .test_transaction import build_signing_transaction
+
+
+def evaluate(script: bytes, limits=None):
+    return Interpreter(limits=limits).evaluate(script)
+
+
+def test_numbers():
+    for num in [0, 1, -1, 127, 128, -128, 255, 256, -32768, 2147483648, -2147483648, 2 ** 256]:
+        assert decode_num(encode_num(num)) == num
+        # the same encoding as pushed by encode_int
+        assert evaluate(encode_int(num)) == [encode_num(num)]
+    assert encode_num(-2147483648) == bytes.fromhex('0000008080')
+    assert decode_num(bytes.fromhex('00000080000080')) == -2147483648
+    assert not cast_to_bool(b'') and not cast_to_bool(b'\x00\x00') and not cast_to_bool(b'\x00\x80')
+    assert cast_to_bool(b'\x80\x00') and cast_to_bool(b'\x01')
+
+
+def test_evaluate():
+    # examples/op_add.py
+    assert Interpreter().verify(Script(encode_int(5)), Script(encode_int(2) + encode_int(3) + OP.OP_ADD + OP.OP_EQUAL))
+    assert not Interpreter().verify(Script(encode_int(6)), Script(encode_int(2) + encode_int(3) + OP.OP_ADD + OP.OP_EQUAL))
+    # examples/bin2num_num2bin.py
+    assert Interpreter().verify(encode_int(-2147483648), encode_pushdata(bytes.fromhex('00000080000080')) + OP.OP_BIN2NUM + OP.OP_EQUAL)
+    assert Interpreter().verify(encode_pushdata(bytes.fromhex('00000080000000000000')), encode_int(2147483648) + encode_int(10) + OP.OP_NUM2BIN + OP.OP_EQUAL)
+    assert evaluate(encode_int(-5) + encode_int(4) + OP.OP_NUM2BIN) == [bytes.fromhex('05000080')]
+
+    assert evaluate(encode_int(-7) + encode_int(2) + OP.OP_DIV + encode_int(-7) + encode_int(2) + OP.OP_MOD) == [encode_num(-3), encode_num(-1)]
+    assert evaluate(encode_int(3) + encode_int(1) + encode_int(5) + OP.OP_WITHIN) == [b'\x01']
+    assert evaluate(encode_pushdata(b'\x01\x80') + encode_int(1) + OP.OP_LSHIFT) == [b'\x03\x00']
+    assert evaluate(encode_pushdata(b'\x0f\xf0') + OP.OP_INVERT + encode_pushdata(b'\xff\x00') + OP.OP_AND) == [b'\xf0\x00']
+    assert evaluate(encode_pushdata(b'hello') + encode_int(2) + OP.OP_SPLIT + OP.OP_SWAP + OP.OP_CAT + OP.OP_SIZE) == [b'llohe', b'\x05']
+    assert evaluate(encode_pushdata(b'abc') + OP.OP_HASH256) == [hash256(b'abc')]
+    assert evaluate(OP.OP_1 + OP.OP_2 + OP.OP_3 + OP.OP_ROT + OP.OP_2 + OP.OP_PICK + OP.OP_TOALTSTACK + OP.OP_DEPTH + OP.OP_FROMALTSTACK) == \
+        [b'\x02', b'\x03', b'\x01', b'\x03', b'\x02']
+    # conditionals, the branch not executed may contain anything but flow control
+    assert evaluate(OP.OP_1 + OP.OP_IF + OP.OP_2 + OP.OP_ELSE + OP.OP_RESERVED + OP.OP_ENDIF) == [b'\x02']
+    assert evaluate(OP.OP_0 + OP.OP_IF + OP.OP_1 + OP.OP_IF + OP.OP_RESERVED + OP.OP_ENDIF + OP.OP_ELSE + OP.OP_3 + OP.OP_ENDIF) == [b'\x03']
+    assert evaluate(OP.OP_0 + OP.OP_NOTIF + OP.OP_4 + OP.OP_ENDIF) == [b'\x04']
+    # OP_RETURN ends the evaluation
+    assert evaluate(OP.OP_1 + OP.OP_RETURN + OP.OP_RESERVED) == [b'\x01']
+
+    for script in [OP.OP_ADD, OP.OP_1 + OP.OP_IF, OP.OP_ENDIF, OP.OP_1 + OP.OP_0 + OP.OP_DIV, OP.OP_RESERVED, OP.OP_2MUL, OP.OP_VERIF,
+                   OP.OP_0 + OP.OP_VERIFY, b'\x05ab', OP.OP_1 + OP.OP_2 + OP.OP_EQUALVERIFY, encode_pushdata(b'a') + encode_pushdata(b'bc') + OP.OP_AND]:
+        with pytest.raises(ScriptError):
+            evaluate(script)
+    # unlocking script must be push only
+    assert not Interpreter().verify(OP.OP_1 + OP.OP_DUP, OP.OP_EQUAL)
+
+
+def test_limits():
+    with pytest.raises(ScriptError, match=r'too many operations'):
+        evaluate(OP.OP_1 + OP.OP_1ADD * 11, ScriptLimits(max_ops=10))
+    assert evaluate(OP.OP_1 + OP.OP_1ADD * 10, ScriptLimits(max_ops=10)) == [encode_num(11)]
+    with pytest.raises(ScriptError, match=r'stack overflow'):
+        evaluate(OP.OP_1 * 5, ScriptLimits(max_stack_size=4))
+    with pytest.raises(ScriptError, match=r'element too large'):
+        evaluate(encode_pushdata(b'abc') + OP.OP_DUP + OP.OP_CAT, ScriptLimits(max_element_byte_length=5))
+    with pytest.raises(ScriptError, match=r'number overflow'):
+        evaluate(encode_pushdata(b'\x01' * 5) + OP.OP_1ADD, ScriptLimits(max_number_byte_length=4))
+    with pytest.raises(ScriptError, match=r'script too large'):
+        evaluate(OP.OP_NOP * 11, ScriptLimits(max_script_byte_length=10))
+    # huge shift counts shift every bit out instead of exhausting memory
+    huge = encode_pushdata(bytes.fromhex('ffffffffffffff7f'))
+    assert evaluate(encode_pushdata(b'\x01') + huge + OP.OP_LSHIFT) == [b'\x00']
+    assert evaluate(encode_pushdata(b'\x80\x01') + huge + OP.OP_RSHIFT) == [b'\x00\x00']
+    assert evaluate(encode_pushdata(b'\x80\x01') + OP.OP_8 + OP.OP_RSHIFT) == [b'\x00\x80']
+    assert Interpreter().verify(b'', bytes.fromhex('010108ffffffffffffff7f98')) is False
+    # each public key of OP_CHECKMULTISIG counts as an operation
+    multisig = OP.OP_0 + OP.OP_0 + encode_pushdata(Key().public_key().serialize()) * 3 + OP.OP_3 + OP.OP_CHECKMULTISIG
+    with pytest.raises(ScriptError, match=r'too many operations'):
+        evaluate(multisig, ScriptLimits(max_ops=3))
+    assert evaluate(multisig, ScriptLimits(max_ops=4)) == [b'\x01']
+
+
+def test_resource_errors():
+    def exhausted(vm):
+        raise MemoryError()
+
+    op_cat = DISPATCH_TABLE[OP.OP_CAT[0]]
+    DISPATCH_TABLE[OP.OP_CAT[0]] = exhausted
+    try:
+        with pytest.raises(ScriptError, match=r'resource limit exceeded'):
+            evaluate(OP.OP_1 + OP.OP_1 + OP.OP_CAT)
+        assert Interpreter().verify(b'', OP.OP_1 + OP.OP_1 + OP.OP_CAT) is False
+    finally:
+        DISPATCH_TABLE[OP.OP_CAT[0]] = op_cat
+
+
+def test_checksig():
+    t = build_signing_transaction().sign()
+    for i in [0, 1, len(t.tx_inputs) - 1]:
+        assert Interpreter(t, i).verify()
+    assert not Interpreter(t, 0).verify(t.tx_inputs[1].unlocking_script)
+    with pytest.raises(ScriptError, match=r'no transaction'):
+        Interpreter().evaluate(t.tx_inputs[0].unlocking_script.serialize() + t.tx_inputs[0].locking_script.serialize())
+
+    # signature commits the script code after the last OP_CODESEPARATOR executed
+    k = Key()
+    locking = Script(OP.OP_1 + OP.OP_DROP + OP.OP_CODESEPARATOR + encode_pushdata(k.public_key().serialize()) + OP.OP_CHECKSIG)
+    t = Transaction().add_input(Unspent(txid='aa' * 32, vout=0, satoshi=1000, locking_script=locking, private_keys=[k]))
+    t.add_output(TxOutput(out=k.address(), satoshi=900))
+    code = locking.serialize()[3:]
+    signature = k.sign(t.sighash_cache.signature_hash(0, SIGHASH.ALL_FORKID, code), None) + bytes([SIGHASH.ALL_FORKID])
+    assert Interpreter(t, 0).verify(encode_pushdata(signature))
+    signature = k.sign(t.signature_hash(0), None) + bytes([SIGHASH.ALL_FORKID])
+    assert not Interpreter(t, 0).verify(encode_pushdata(signature))
+
+
+def test_strict():
+    public_key = encode_pushdata(Key().public_key().serialize())
+    # NULLDUMMY
+    script = OP.OP_1 + OP.OP_0 + public_key + OP.OP_1 + OP.OP_CHECKMULTISIG
+    with pytest.raises(ScriptError, match=r'extra element of OP_CHECKMULTISIG must be empty'):
+        Interpreter().evaluate(script)
+    assert Interpreter(strict=False).evaluate(script) == [b'\x01']
+
+    # minimally encoded number of public keys and signatures
+    for script in [OP.OP_0 + OP.OP_0 + public_key + b'\x02\x01\x00' + OP.OP_CHECKMULTISIG, OP.OP_0 + b'\x01\x00' + public_key + OP.OP_1 + OP.OP_CHECKMULTISIG]:
+        with pytest.raises(ScriptError, match=r'non-minimally encoded number'):
+            Interpreter().evaluate(script)
+        assert Interpreter(strict=False).evaluate(script) == [b'\x01']
+
+    # NULLFAIL, signatures of a failed check must be empty, here they are made for other inputs
+    t = build_signing_transaction().sign()
+    locking = t.tx_inputs[0].locking_script.serialize() + OP.OP_NOT
+    assert not Interpreter(t, 0).verify(t.tx_inputs[2].unlocking_script, locking)
+    assert Interpreter(t, 0, strict=False).verify(t.tx_inputs[2].unlocking_script, locking)
+    multisig = t.tx_inputs[-1]
+    locking = multisig.locking_script.serialize() + OP.OP_NOT
+    assert not Interpreter(t, 0).verify(multisig.unlocking_script, locking)
+    assert Interpreter(t, 0, strict=False).verify(multisig.unlocking_script, locking)
+    assert Interpreter(t, 0).verify(OP.OP_0 * 3, locking)
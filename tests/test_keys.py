@@ -5,8 +5,8 @@ import pytest
 
 from bsvlib.constants import Chain
 from bsvlib.curve import Point
-from bsvlib.hash import sha256
-from bsvlib.keys import PrivateKey, PublicKey, verify_signed_text
+from bsvlib.hash import sha256, hash256
+from bsvlib.keys import PrivateKey, PublicKey, verify_signed_text, sign_many
 from bsvlib.script.type import P2pkhScriptType
 from bsvlib.utils import text_digest, unstringify_ecdsa_recoverable
 from .test_transaction import digest1, digest2, digest3
@@ -144,3 +144,14 @@ def test_encryption():
     encrypted = 'QklFMQPkjNG3xxnfRv7oUDjUYPH2VN3VFrcglCcwmeYpJpsjRKnfl/XsS+dOgocRV6JKVHkfUZAKIHDo7vwxjv/BPkV5EA2Dl4RJ6d/jpWwgGdFBYA=='
     assert private_key.decrypt_text(encrypted) == plain
     assert private_key.decrypt_text(public_key.encrypt_text(plain)) == plain
+
+
+def test_sign_many():
+    k1, k2 = PrivateKey(), PrivateKey()
+    messages = [f'message {i}'.encode() for i in range(5)]
+    digests = [hash256(message) for message in messages]
+    assert k1.sign_many(digests) == [k1.sign(message) for message in messages]
+    assert k1.sign_many(messages, prehashed=False) == [k1.sign(message) for message in messages]
+    pairs = [(k1, digests[0]), (k2, digests[1]), (k1, digests[2]), (k2, digests[3])]
+    assert sign_many(pairs) == [private_key.sign(digest, None) for private_key, digest in pairs]
+    assert sign_many([]) == []
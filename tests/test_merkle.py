@@ -0,0 +1,119 @@
+import pytest
+
+from bsvlib.hash import hash256
+from bsvlib.merkle import merkle_root, MerkleProof, verify_merkle_proofs
+
+# block 100000
+TXIDS = [
+    '8c14f0db3df150123e6f3dbbf30f8b955a8249b62ac1d1ff16284aefa3d06d87',
+    'fff2525b8931402dd09222c50775608f75787bd2b87e56995a7bdd30f79702c4',
+    '6359f0868171b1d194cbee1af2f16ea598ae8fad666d9b012c8ed2b79a236ec4',
+    'e9a66845e05d5abc0ad04ec80f774a7e585c6e8db975962d069a522137b80c1d',
+]
+MERKLE_ROOT = 'f3e94742aca4b5ef85488dc37c06c3282295ffec960994b2c0d5ac2a25a95766'
+
+
+def build_proof(txids, index, target_type='merkleRoot') -> MerkleProof:
+    level = [bytes.fromhex(txid)[::-1] for txid in txids]
+    nodes, position = [], index
+    while len(level) > 1:
+        sibling = position ^ 1
+        nodes.append(level[sibling] if sibling < len(level) else None)
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [hash256(level[i] + level[i + 1]) for i in range(0, len(level), 2)]
+        position >>= 1
+    return MerkleProof(index, txids[index], nodes, level[0], target_type)
+
+
+def test_merkle_root():
+    assert merkle_root(TXIDS) == MERKLE_ROOT
+    assert merkle_root(TXIDS[:1]) == TXIDS[0]
+    # odd number of nodes duplicates the last one
+    assert merkle_root(TXIDS[:3]) == merkle_root(TXIDS[:3] + TXIDS[2:3])
+
+
+def test_merkle_proof():
+    for index in range(len(TXIDS)):
+        proof = build_proof(TXIDS, index)
+        assert proof.merkle_root() == MERKLE_ROOT
+        assert proof.verify()
+        assert MerkleProof.from_hex(proof.hex()).to_json() == proof.to_json()
+        assert MerkleProof.from_json(proof.to_json()).hex() == proof.hex()
+
+    proof = build_proof(TXIDS, 1)
+    assert proof.to_json() == {
+        'index': 1,
+        'txOrId': TXIDS[1],
+        'targetType': 'merkleRoot',
+        'target': MERKLE_ROOT,
+        'nodes': [TXIDS[0], '8e30899078ca1813be036a073bbf80b86cdddde1c96e9e9c99e9e3782df4ae49'],
+    }
+    assert not MerkleProof(2, TXIDS[1], proof.nodes, proof.target).verify()
+    assert not proof.verify('00' * 32)
+
+    # header target
+    header = bytes(36) + bytes.fromhex(MERKLE_ROOT)[::-1] + bytes(12)
+    proof = MerkleProof(1, TXIDS[1], proof.nodes, header, 'header')
+    assert proof.verify()
+    assert MerkleProof.from_hex(proof.serialize()).target == header
+
+    # block hash target needs merkle root
+    proof = MerkleProof(1, TXIDS[1], proof.nodes, bytes(32), 'hash')
+    with pytest.raises(ValueError):
+        proof.verify()
+    assert proof.verify(MERKLE_ROOT)
+
+    # full transaction included
+    tx = bytes.fromhex('01000000000100f2052a010000001976a914000000000000000000000000000000000000000088ac00000000')
+    txids = [hash256(tx)[::-1].hex()] + TXIDS[1:]
+    proof = build_proof(txids, 0)
+    proof.tx = tx
+    assert MerkleProof.from_hex(proof.hex()).tx == tx
+    assert MerkleProof.from_json(proof.to_json()).verify()
+    proof.tx = tx + b'\x00'
+    assert not proof.verify()
+
+    with pytest.raises(ValueError):
+        MerkleProof.from_hex('08' + build_proof(TXIDS, 0).hex()[2:])
+
+
+def test_duplicate_node():
+    txids = TXIDS[:3]
+    proof = build_proof(txids, 2)
+    assert proof.nodes[0] is None
+    assert proof.to_json()['nodes'][0] == '*'
+    assert proof.verify()
+    assert MerkleProof.from_hex(proof.hex()).nodes[0] is None
+    # duplicate sibling is never on the left
+    assert not MerkleProof(3, txids[2], proof.nodes, proof.target).verify()
+
+
+def test_verify_merkle_proofs():
+    txids = [hash256(i.to_bytes(4, 'little'))[::-1].hex() for i in range(37)]
+    root = merkle_root(txids)
+    proofs = [build_proof(txids, i) for i in range(len(txids))]
+    assert verify_merkle_proofs(proofs) == [True] * len(txids)
+    assert verify_merkle_proofs(proofs, root) == [True] * len(txids)
+    assert verify_merkle_proofs(proofs, '00' * 32) == [False] * len(txids)
+
+    # tampered proofs between good ones must fail even when their upper nodes are cached
+    tampered = build_proof(txids, 5)
+    tampered.nodes[0] = bytes(32)
+    wrong_txid = MerkleProof(6, txids[7], proofs[6].nodes, proofs[6].target)
+    assert verify_merkle_proofs([proofs[4], tampered, wrong_txid, proofs[6]]) == [True, False, False, True]
+    assert verify_merkle_proofs([tampered, proofs[5]]) == [False, True]
+    # a correct sibling at level 0 but nothing right above it
+    tampered = build_proof(txids, 5)
+    tampered.nodes[1:] = [bytes(32)] * (len(tampered.nodes) - 1)
+    assert not tampered.verify()
+    assert verify_merkle_proofs([proofs[4], tampered, proofs[5]]) == [True, False, True]
+    # upper nodes cut short
+    shortened = build_proof(txids, 5)
+    del shortened.nodes[-1]
+    assert verify_merkle_proofs([proofs[4], shortened]) == [True, False]
+
+    # proofs of different blocks
+    assert verify_merkle_proofs([build_proof(TXIDS, 0), proofs[0]]) == [True, True]
+    with pytest.raises(ValueError):
+        verify_merkle_proofs([MerkleProof(0, txids[0], proofs[0].nodes, bytes(32), 'hash')])
@@ -0,0 +1,68 @@
+import pytest
+
+from bsvlib.constants import OP
+from bsvlib.keys import Key
+from bsvlib.script.type import OpReturnScriptType
+from bsvlib.transaction.op_return import OpReturnExtractor
+from bsvlib.transaction.transaction import Transaction, TxOutput
+from bsvlib.transaction.unspent import Unspent
+from bsvlib.utils import encode_pushdata
+
+B = '19HxigV4QyBv3tHpQVcUEQyq1pzZVdoAut'
+MAP = '1PuQa7K62MiKCtssSLKy1kh56WWU7MtUR5'
+
+
+def test_match():
+    extractor = OpReturnExtractor([B, MAP, b'\x00app', b'\x00ap'])
+    assert extractor.prefixes == [B.encode(), MAP.encode(), b'\x00app', b'\x00ap']
+    assert extractor.match(B.encode()) == B.encode()
+    assert extractor.match(memoryview(MAP.encode() + b'|')) == MAP.encode()
+    assert extractor.match(b'\x00apple') == b'\x00ap'
+    assert extractor.match(B[:-1].encode()) is None
+    assert extractor.match(b'') is None
+    assert OpReturnExtractor([b'']).match(b'') == b''
+
+    with pytest.raises(TypeError, match=r'unsupported type of protocol prefix'):
+        # noinspection PyTypeChecker
+        OpReturnExtractor([1])
+
+    script = OpReturnScriptType.locking([B, 'hello', b'\x00' * 300]).serialize()
+    assert [bytes(pushdata) for pushdata in extractor.match_script(script)] == [B.encode(), b'hello', b'\x00' * 300]
+    # OP_RETURN without OP_FALSE, OP_N and non-push opcodes are not pushdatas
+    script = OP.OP_RETURN + encode_pushdata(MAP.encode()) + OP.OP_1 + OP.OP_DUP + encode_pushdata(b'SET')
+    assert [bytes(pushdata) for pushdata in extractor.match_script(script)] == [MAP.encode(), b'SET']
+    # trailing bytes which are not a complete pushdata
+    assert [bytes(pushdata) for pushdata in extractor.match_script(script + b'\x05ab')] == [MAP.encode(), b'SET']
+    for unmatched in [b'', OP.OP_FALSE + OP.OP_RETURN, OP.OP_RETURN + OP.OP_DUP, Key().locking_script().serialize(),
+                      OpReturnScriptType.locking(['hello', B]).serialize(), encode_pushdata(B.encode()), OP.OP_RETURN + b'\x22' + B.encode()[:10]]:
+        assert extractor.match_script(unmatched) is None
+
+
+def test_extract(tmp_path):
+    k = Key('L5agPjZKceSTkhqZF2dmFptT5LFrbr6ZGPvP7u4A6dvhTrr71WZ9')
+    t1 = Transaction().add_inputs([Unspent(txid=f'{i:064x}', vout=i, satoshi=1000, private_keys=[k]) for i in range(2)])
+    t1.add_outputs([TxOutput(k.address(), 500), TxOutput([B, 'hello', 'text/plain']), TxOutput(['other']), TxOutput([MAP, 'SET', 'app', 'x'])]).sign()
+    t2 = Transaction().add_input(Unspent(txid='ff' * 32, vout=0, satoshi=1000, private_keys=[k])).add_output(TxOutput(k.address(), 500)).sign()
+
+    extractor = OpReturnExtractor([B, MAP])
+    expected = [(t1.txid(), 1, [B.encode(), b'hello', b'text/plain']), (t1.txid(), 3, [MAP.encode(), b'SET', b'app', b'x'])]
+    # txid of extended format transactions is the hash in standard format
+    stream = t1.serialize() + t2.serialize() + t1.serialize(extended=True)
+    for octets in [stream, bytearray(stream), stream.hex()]:
+        matches = list(extractor.extract(octets))
+        assert [(txid, vout, [bytes(pushdata) for pushdata in pushdatas]) for txid, vout, pushdatas in matches] == expected * 2
+        assert all([isinstance(pushdata, memoryview) for _, _, pushdatas in matches for pushdata in pushdatas])
+    assert list(OpReturnExtractor(['unknown']).extract(stream)) == []
+    assert list(extractor.extract(b'')) == []
+    with pytest.raises(ValueError, match=r'invalid transaction at offset 0'):
+        list(extractor.extract(t1.serialize()[:-1]))
+
+    path = tmp_path / 'transactions.bin'
+    path.write_bytes(stream)
+    assert list(extractor.extract_file(str(path))) == expected * 2
+    # the map is closed even if the generator is not exhausted
+    matches = extractor.extract_file(str(path))
+    assert next(matches) == expected[0]
+    matches.close()
+    path.write_bytes(b'')
+    assert list(extractor.extract_file(str(path))) == []
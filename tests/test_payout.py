@@ -0,0 +1,104 @@
+import pytest
+
+from bsvlib.coin_selection import UnspentPool
+from bsvlib.keys import Key
+from bsvlib.payout import payout_outputs, split_outputs, create_payouts, create_fan_outs, spendable_unspents
+from bsvlib.transaction.transaction import InsufficientFunds
+from bsvlib.transaction.unspent_set import UnspentSet
+from . import k, unspents
+
+recipients = [(Key().address(), 1000 + i) for i in range(3)]
+
+
+def test_payout_outputs():
+    outputs = payout_outputs(recipients * 2)
+    assert [tx_output.satoshi for tx_output in outputs] == [1000, 1001, 1002] * 2
+    # decoded once, but not shared between outputs
+    assert outputs[0].locking_script.serialize() is outputs[3].locking_script.serialize()
+    assert outputs[0].locking_script is not outputs[3].locking_script
+    assert outputs[0].byte_length() == 34
+
+
+def test_split_outputs():
+    outputs = payout_outputs(recipients * 4)
+    assert [len(batch) for batch in split_outputs(outputs, max_outputs=5)] == [5, 5, 2]
+    # 10 + 34 * 4 = 146
+    assert [len(batch) for batch in split_outputs(outputs, max_byte_length=146)] == [4] * 3
+    assert [len(batch) for batch in split_outputs(outputs, max_byte_length=145)] == [3] * 4
+    # room left for change
+    assert [len(batch) for batch in split_outputs(outputs, max_byte_length=146, reserved_byte_length=34)] == [3] * 4
+    assert [len(batch) for batch in split_outputs(outputs, max_byte_length=10)] == [1] * 12
+    assert split_outputs([]) == []
+
+
+def test_create_payouts():
+    paid = recipients * 10
+    items = unspents([20000] * 4 + [100])
+    transactions = create_payouts(items, paid, max_outputs=7)
+    assert [len(t.tx_outputs) for t in transactions] == [8, 8, 8, 8, 3]
+    assert [tx_output.satoshi for t in transactions for tx_output in t.tx_outputs[:7] if tx_output.satoshi < 2000] == [satoshi for _, satoshi in paid]
+    assert all([t.verify() == [] and t.fee() >= t.estimated_fee() for t in transactions])
+    # the last batch is funded by change of the others
+    assert transactions[-1].tx_inputs[0].txid in [t.txid() for t in transactions[:4]]
+    # the coins spent are removed from the unspents given
+    assert [unspent.satoshi for unspent in items] == [100]
+
+    # not enough for the payouts, neither the unspents nor the pool is changed
+    pool = UnspentPool(unspents([5000, 5000]))
+    with pytest.raises(InsufficientFunds):
+        create_payouts(pool, paid, max_outputs=7)
+    assert len(pool) == 2 and pool.total() == 10000
+
+
+def test_create_payouts_chained():
+    # a single coin, so every batch spends the change of the one before
+    paid = recipients * 4
+    pool = UnspentPool(unspents([100000]))
+    transactions = create_payouts(pool, paid, max_outputs=5, max_byte_length=300)
+    assert [len(t.tx_outputs) - 1 for t in transactions] == [3] * 4
+    for previous, t in zip(transactions, transactions[1:]):
+        assert [tx_input.txid for tx_input in t.tx_inputs] == [previous.txid()]
+        assert t.tx_inputs[0].satoshi == previous.tx_outputs[-1].satoshi
+    assert all([t.verify() == [] and t.byte_length() <= 300 for t in transactions])
+    # the change left is not in the pool
+    assert len(pool) == 0
+
+    with pytest.raises(InsufficientFunds):
+        create_payouts(unspents([100000]), paid, max_outputs=5, sign=False)
+
+
+def test_create_payouts_packed():
+    # every batch needs several inputs, it's cut down to the most outputs that fit rather than halved
+    transactions = create_payouts(unspents([3000] * 40), recipients * 10, max_byte_length=1000)
+    assert [len(t.tx_outputs) - 1 for t in transactions] == [10, 10, 10]
+    assert all([t.verify() == [] and 1000 - 34 < t.byte_length() <= 1000 for t in transactions])
+
+
+def test_create_fan_outs():
+    # with the default fee rate, each input costs 74 satoshi, each output 17 satoshi
+    items = unspents([100000, 50000, 10100])
+    transactions = create_fan_outs(items, 10000)
+    # 9 outputs and change, 4 outputs and change, the smallest can't afford a single output
+    assert [len(t.tx_outputs) for t in transactions] == [10, 5]
+    assert [tx_output.satoshi for tx_output in transactions[0].tx_outputs[:9]] == [10000] * 9
+    assert all([t.verify() == [] and t.fee() >= t.estimated_fee() for t in transactions])
+    assert [unspent.satoshi for unspent in items] == [10100]
+    # spent independently of each other
+    split = spendable_unspents(transactions)
+    assert len(split) == 15 and len({unspent.outpoint for unspent in split}) == 15
+    assert all([unspent.private_keys == [k] for unspent in split])
+
+    # paid to the address given, at most max_outputs and count outputs
+    s = UnspentSet(unspents([100000, 50000]))
+    address = Key().address()
+    transactions = create_fan_outs(s, 1000, count=30, address=address, max_outputs=20)
+    assert [len(t.tx_outputs) for t in transactions] == [21, 11] and len(s) == 0
+    assert all([tx_output.locking_script == transactions[0].tx_outputs[0].locking_script for t in transactions for tx_output in t.tx_outputs])
+    assert spendable_unspents(transactions) == []
+
+    pool = UnspentPool(unspents([5000, 5000]))
+    with pytest.raises(InsufficientFunds, match=r'require 10 outputs of 1000 satoshi but only 8'):
+        create_fan_outs(pool, 1000, count=10)
+    assert len(pool) == 2
+    with pytest.raises(AssertionError):
+        create_fan_outs(pool, 100)
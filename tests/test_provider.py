@@ -0,0 +1,100 @@
+import json
+import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import List, Dict
+
+import pytest
+
+from bsvlib.constants import Chain
+from bsvlib.service import Service, WhatsOnChain
+from bsvlib.service.provider import Provider, BroadcastResult
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # headers and body are written separately, don't let them wait for delayed acks on a kept alive connection
+    disable_nagle_algorithm = True
+
+    def _reply(self, body: Dict) -> None:
+        self.server.connections.add(self.client_address)
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self._reply({'path': self.path})
+
+    def do_POST(self):
+        self._reply({'data': self.rfile.read(int(self.headers['Content-Length'])).decode()})
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class LocalProvider(Provider):
+
+    def get_unspents(self, **kwargs) -> List[Dict]:  # pragma: no cover
+        return []
+
+    def get_balance(self, **kwargs) -> int:  # pragma: no cover
+        return 0
+
+    def broadcast(self, raw: str) -> BroadcastResult:  # pragma: no cover
+        return BroadcastResult(True, raw)
+
+
+@pytest.fixture
+def server():
+    s = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    s.connections = set()
+    thread = threading.Thread(target=s.serve_forever, daemon=True)
+    thread.start()
+    yield s
+    s.shutdown()
+    s.server_close()
+
+
+def test_session(server):
+    url = f'http://127.0.0.1:{server.server_port}'
+    provider = LocalProvider()
+    assert provider.get(url=f'{url}/a') == {'path': '/a'}
+    assert provider.post(url=url, data='raw').json() == {'data': 'raw'}
+    assert provider.get(url=f'{url}/b') == {'path': '/b'}
+    # one connection kept alive for all the calls
+    assert len(server.connections) == 1
+
+    # no more connections than threads calling at the same time
+    server.connections.clear()
+    provider = LocalProvider(pool_maxsize=4, pool_block=True)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert list(executor.map(lambda i: provider.get(url=f'{url}/{i}')['path'], range(40))) == [f'/{i}' for i in range(40)]
+    assert 1 <= len(server.connections) <= 4
+
+    server.connections.clear()
+    provider = LocalProvider(keep_alive=False)
+    for _ in range(3):
+        provider.get(url=url)
+    assert len(server.connections) == 3
+
+    # a copy creates its own session
+    session = provider.session
+    copied = pickle.loads(pickle.dumps(provider))
+    assert copied.session is not session and copied.keep_alive is False
+    provider.close()
+    assert provider.session is not session
+
+
+def test_default_provider():
+    # one provider per chain, so connections are kept alive across services created without a provider
+    provider = Service().provider
+    assert isinstance(provider, WhatsOnChain) and provider.chain == Chain.MAIN
+    assert Service(Chain.MAIN).provider.session is provider.session
+    assert Service(Chain.TEST).provider is Service(Chain.TEST).provider is not provider
+    assert Service(Chain.TEST).chain == Chain.TEST
+    given = LocalProvider()
+    assert Service(Chain.TEST, given).provider is given
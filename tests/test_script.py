@@ -3,7 +3,7 @@ import pytest
 from bsvlib.constants import SIGHASH, OP
 from bsvlib.keys import Key
 from bsvlib.script.script import Script
-from bsvlib.script.type import P2pkhScriptType, OpReturnScriptType, P2pkScriptType, BareMultisigScriptType
+from bsvlib.script.type import P2pkhScriptType, OpReturnScriptType, P2pkScriptType, BareMultisigScriptType, UnknownScriptType, classify_script
 from bsvlib.utils import address_to_public_key_hash, encode_int, encode_pushdata
 
 
@@ -73,3 +73,38 @@ def test_bare_multisig():
 
     payload = {'signatures': [b'\x00', b'\x01'], 'sighash': SIGHASH.ALL_FORKID}
     assert BareMultisigScriptType.unlocking(**payload).hex() == '00' + '020041' + '020141'
+
+
+def test_chunks():
+    script = Script(OP.OP_0 + OP.OP_RETURN + encode_pushdata(b'hello') + encode_pushdata(b'a' * 100, minimal_push=False) + OP.OP_1
+                    + encode_pushdata(b'b' * 300) + OP.OP_PUSHDATA4 + (2).to_bytes(4, 'little') + b'cd')
+    chunks = list(script.chunks())
+    assert [(opcode, None if pushdata is None else bytes(pushdata)) for opcode, pushdata in chunks] == [
+        (0x00, b''), (0x6a, None), (0x05, b'hello'), (0x4c, b'a' * 100), (0x51, None), (0x4d, b'b' * 300), (0x4e, b'cd')
+    ]
+    # pushdata is a view on the script
+    assert all([isinstance(pushdata, memoryview) and pushdata.obj is script.script for _, pushdata in chunks if pushdata is not None])
+    assert list(Script().chunks()) == []
+    for malformed in ['05aabb', '4c', '4d01', '4e0200000061']:
+        with pytest.raises(ValueError, match=r'bad pushdata'):
+            list(Script(malformed).chunks())
+
+
+def test_classify_script():
+    k1, k2 = Key(), Key()
+    k2.compressed = False
+    public_keys = [k1.public_key().serialize(), k2.public_key().serialize()]
+    assert classify_script(P2pkhScriptType.locking(k1.address())) == P2pkhScriptType()
+    assert classify_script(P2pkScriptType.locking(public_keys[0])) == P2pkScriptType()
+    assert classify_script(P2pkScriptType.locking(public_keys[1]).serialize()) == P2pkScriptType()
+    assert classify_script(OpReturnScriptType.locking(['hello', b'world'])) == OpReturnScriptType()
+    assert classify_script(OP.OP_RETURN + encode_pushdata(b'hello')) == OpReturnScriptType()
+    assert classify_script(BareMultisigScriptType.locking(public_keys, 1)) == BareMultisigScriptType()
+    assert classify_script(BareMultisigScriptType.locking(public_keys[:1], 1)) == BareMultisigScriptType()
+
+    p2pkh = P2pkhScriptType.locking(k1.address()).serialize()
+    multisig = BareMultisigScriptType.locking(public_keys, 2).serialize()
+    for unknown in [b'', p2pkh[:-1] + OP.OP_CHECKSIGVERIFY, p2pkh + OP.OP_NOP, encode_pushdata(b'\x05' * 33) + OP.OP_CHECKSIG,
+                    OP.OP_3 + multisig[1:], multisig[:-2] + OP.OP_3 + OP.OP_CHECKMULTISIG, multisig[:1] + b'\x20' + multisig[2:],
+                    encode_int(2) + OP.OP_ADD + OP.OP_EQUAL]:
+        assert classify_script(unknown) == UnknownScriptType()
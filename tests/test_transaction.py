@@ -1,14 +1,18 @@
+import copy
+from io import BytesIO
+
 import pytest
 
-from bsvlib.constants import SIGHASH, Chain
+from bsvlib.constants import SIGHASH, Chain, TRANSACTION_EXTENDED_FORMAT_MARKER
 from bsvlib.hash import hash256
 from bsvlib.keys import Key
 from bsvlib.script.script import Script
-from bsvlib.script.type import P2pkhScriptType, P2pkScriptType
+from bsvlib.script.type import P2pkhScriptType, P2pkScriptType, BareMultisigScriptType, OpReturnScriptType, UnknownScriptType
 from bsvlib.service import WhatsOnChain
-from bsvlib.transaction.transaction import TxInput, TxOutput, Transaction, TransactionBytesIO
+from bsvlib.transaction.transaction import TxInput, TxOutput, Transaction, TransactionBytesIO, TransactionReader, LazyTransaction, SighashCache, decode_compact
+from bsvlib.transaction.outpoint import Outpoint
 from bsvlib.transaction.unspent import Unspent
-from bsvlib.utils import encode_pushdata
+from bsvlib.utils import encode_pushdata, unsigned_to_varint
 
 digest1 = bytes.fromhex(
     '01000000'
@@ -141,13 +145,45 @@ def test_transaction_bytes_io():
         io.read_varint()
 
 
-def test_from_hex():
+def test_transaction_reader():
+    octets = bytes.fromhex('0011223344556677889912fd1234fe12345678ff1234567890abcdef00112233')
+    for source in [octets, octets.hex(), bytearray(octets), memoryview(octets)]:
+        reader = TransactionReader(source)
+        assert reader.read_bytes(4) == bytes.fromhex('00112233')
+        assert reader.read_int(1) == int.from_bytes(bytes.fromhex('44'), 'little')
+        assert reader.read_int(2) == int.from_bytes(bytes.fromhex('5566'), 'little')
+        assert reader.read_int(3, 'big') == int.from_bytes(bytes.fromhex('778899'), 'big')
+        assert reader.read_varint() == int.from_bytes(bytes.fromhex('12'), 'little')
+        assert reader.read_varint() == int.from_bytes(bytes.fromhex('1234'), 'little')
+        assert reader.read_varint() == int.from_bytes(bytes.fromhex('12345678'), 'little')
+        assert reader.read_varint() == int.from_bytes(bytes.fromhex('1234567890abcdef'), 'little')
+        assert reader.remaining() == 4
+        assert reader.read_view(1) == bytes.fromhex('00')
+        reader.skip(1)
+        assert reader.read_bytes() == bytes.fromhex('2233')
+        assert reader.read_bytes() == b''
+
+        with pytest.raises(AssertionError):
+            reader.read_int(1)
+        with pytest.raises(AssertionError):
+            reader.read_varint()
+        with pytest.raises(AssertionError):
+            reader.skip(1)
+
+    # reader over a multi-dimensional buffer is flattened into bytes
+    assert TransactionReader(memoryview(octets).cast('B', shape=[4, 8])).read_bytes(4) == bytes.fromhex('00112233')
+    reader = TransactionReader(octets, 30)
+    assert TransactionReader.wrap(reader) is reader and reader.read_bytes() == bytes.fromhex('2233')
+
+
+def test_from_hex(monkeypatch):
     assert TxInput.from_hex('') is None
     tx_in = TxInput.from_hex('0011' * 16 + '00112233' + '00' + '00112233')
     assert tx_in.txid == '1100' * 16
     assert tx_in.vout == 0x33221100
     assert tx_in.unlocking_script == Script()
     assert tx_in.sequence == 0x33221100
+    assert tx_in.script_type == UnknownScriptType() and TxInput().script_type == UnknownScriptType()
 
     assert TxOutput.from_hex('') is None
     assert Transaction.from_hex('') is None
@@ -177,6 +213,31 @@ def test_from_hex():
              '00000000'
     t = Transaction.from_hex(raw_tx)
     assert t.txid() == 'e8c6b26f26d90e9cf035762a91479635a75eff2b3b2845663ed72a2397acdfd2'
+    assert all([tx_input.script_type == UnknownScriptType() for tx_input in t.tx_inputs])
+
+    raw_tx_bytes = bytes.fromhex(raw_tx)
+    for source in [raw_tx_bytes, bytearray(raw_tx_bytes), memoryview(raw_tx_bytes), TransactionBytesIO(raw_tx_bytes)]:
+        assert Transaction.from_hex(source).serialize() == raw_tx_bytes
+    # parse consecutive transactions from the same reader
+    reader = TransactionReader(raw_tx_bytes * 2)
+    assert Transaction.from_hex(reader).txid() == Transaction.from_hex(reader).txid() == t.txid()
+    assert reader.remaining() == 0
+    # truncated
+    assert Transaction.from_hex(raw_tx[:-2]) is None
+
+    reader = TransactionReader(raw_tx_bytes + b'\x00')
+    assert reader.skip_transaction() == len(raw_tx_bytes) and reader.remaining() == 1
+
+    # parsed items are adopted in bulk, the sighash cache is dropped once for inputs and once for outputs rather than per item
+    invalidated = []
+    monkeypatch.setattr(SighashCache, 'invalidate', lambda self, midstates=SighashCache.MIDSTATES: invalidated.append(tuple(midstates)))
+    t = Transaction.from_hex(raw_tx)
+    assert invalidated == [('prevouts', 'sequence'), ('outputs',)]
+    assert all([tx_item._owner is t for tx_item in t.tx_inputs + t.tx_outputs])
+    assert t.satoshi_total_out() == 0x1a0a + 0x1cea05
+    monkeypatch.undo()
+    t.tx_inputs[0].sequence = 0
+    assert t.txid() != 'e8c6b26f26d90e9cf035762a91479635a75eff2b3b2845663ed72a2397acdfd2'
 
 
 def test_parse_outputs():
@@ -258,3 +319,528 @@ def test_estimated_byte_length():
     _in.unlocking_script = b''
     assert t.estimated_byte_length() == 85
     assert t.estimated_byte_length() == t.byte_length()
+
+
+def test_running_totals():
+    def walked(tx: Transaction) -> tuple:
+        estimated = 8 + len(unsigned_to_varint(len(tx.tx_inputs))) + len(unsigned_to_varint(len(tx.tx_outputs)))
+        for tx_input in tx.tx_inputs:
+            if tx_input.unlocking_script is not None:
+                estimated += tx_input.byte_length()
+            else:
+                estimated += 41 + tx_input.script_type.estimated_unlocking_byte_length(private_keys=tx_input.private_keys, **tx.kwargs)
+        estimated += sum([tx_output.byte_length() for tx_output in tx.tx_outputs])
+        return sum([tx_input.satoshi for tx_input in tx.tx_inputs]), sum([tx_output.satoshi for tx_output in tx.tx_outputs]), estimated
+
+    def totals(tx: Transaction) -> tuple:
+        return tx.satoshi_total_in(), tx.satoshi_total_out(), tx.estimated_byte_length()
+
+    k1, k2 = Key(), Key()
+    k2.compressed = False
+    t = Transaction().add_output(TxOutput(k1.address(), 1000))
+    assert totals(t) == walked(t)
+    for i in range(300):
+        # totals are updated as items are added, varint of the item count grows beyond 252 items
+        t.add_input(Unspent(txid=f'{i:064x}', vout=0, satoshi=100 + i, private_keys=[k1 if i % 2 else k2]))
+        t.add_output(TxOutput(['hello'] * (i % 3)))
+        assert totals(t) == walked(t) and t.fee() == t.satoshi_total_in() - t.satoshi_total_out()
+    t.tx_inputs.insert(0, TxInput(Unspent(txid='ff' * 32, vout=0, satoshi=1, private_keys=[k1])))
+    t.tx_outputs.extend([TxOutput(k1.address(), 1), TxOutput(k2.address(), 2)])
+    assert totals(t) == walked(t)
+
+    # items changed or removed
+    t.tx_inputs[0].satoshi = 5000
+    assert totals(t) == walked(t)
+    t.tx_inputs[1].private_keys = [k1, k2]
+    t.tx_inputs[1].script_type = BareMultisigScriptType()
+    assert totals(t) == walked(t)
+    t.tx_outputs[0].satoshi = 10
+    t.tx_outputs[1].locking_script = Script('00' * 300)
+    assert totals(t) == walked(t)
+    t.tx_inputs.pop()
+    del t.tx_outputs[-3:]
+    t.tx_inputs[2] = TxInput(Unspent(txid='ee' * 32, vout=0, satoshi=7, private_keys=[k2]))
+    t.tx_outputs.remove(t.tx_outputs[3])
+    assert totals(t) == walked(t)
+    t.tx_outputs = [TxOutput(k1.address(), 100)]
+    assert totals(t) == walked(t)
+    t.sign()
+    assert totals(t) == walked(t) and t.estimated_byte_length() == t.byte_length()
+
+    # extra kwargs are not covered by the running total
+    multisig = Transaction().add_input(TxInput(Unspent(txid='00' * 32, vout=0, satoshi=1000, private_keys=[k1, k2], script_type=BareMultisigScriptType())))
+    assert multisig.estimated_byte_length() == multisig.estimated_byte_length(anything=1) == walked(multisig)[2]
+
+    # keys of an input and kwargs changed in place drop the estimate as well
+    class PaddedScriptType(BareMultisigScriptType):
+
+        @classmethod
+        def estimated_unlocking_byte_length(cls, **kwargs) -> int:
+            return super().estimated_unlocking_byte_length(**kwargs) + kwargs.get('padding', 0)
+
+    t = Transaction(padding=0).add_input(TxInput(Unspent(txid='00' * 32, vout=0, satoshi=1000, private_keys=[k1], script_type=PaddedScriptType())))
+    estimated = t.estimated_byte_length()
+    t.tx_inputs[0].private_keys.append(k2)
+    assert t.estimated_byte_length() == walked(t)[2] == estimated + 73
+    t.kwargs['padding'] = 10
+    assert t.estimated_byte_length() == walked(t)[2] == estimated + 83
+    t.kwargs.update(padding=20)
+    assert t.estimated_byte_length() == walked(t)[2] == estimated + 93
+    t.tx_inputs[0].private_keys[:] = [k1]
+    del t.kwargs['padding']
+    assert t.estimated_byte_length() == walked(t)[2] == estimated
+    copied = copy.deepcopy(Transaction(padding=1))
+    copied.estimated_byte_length()
+    copied.kwargs.pop('padding')
+    assert copied._estimated is None and copied.kwargs == {}
+
+    # an input which can't be estimated doesn't fail until the estimation is asked for
+    t = Transaction().add_output(TxOutput(k1.address(), 1000))
+    assert t.estimated_byte_length() == walked(t)[2]
+    _in = TxInput()
+    _in.script_type, _in.satoshi = P2pkhScriptType(), 1000
+    t.add_input(_in).add_input(Unspent(txid='00' * 32, vout=1, satoshi=10, private_keys=[k1]))
+    assert t.fee() == 10
+    with pytest.raises(ValueError, match=r"can't estimate unlocking byte length"):
+        t.estimated_byte_length()
+
+    # items shared with another transaction can be changed without notifying it, its totals are always walked
+    shared = TxOutput(k1.address(), 1000)
+    t1 = Transaction().add_output(shared)
+    t2 = Transaction().add_output(shared)
+    assert t1.satoshi_total_out() == t2.satoshi_total_out() == 1000
+    shared.satoshi = 2000
+    assert t1.satoshi_total_out() == t2.satoshi_total_out() == 2000
+
+
+def test_iter_file(tmp_path):
+    k = Key('L5agPjZKceSTkhqZF2dmFptT5LFrbr6ZGPvP7u4A6dvhTrr71WZ9')
+    transactions = []
+    for i in range(3):
+        t = Transaction().add_input(Unspent(txid=f'{i:064x}', vout=i, satoshi=1000, private_keys=[k]))
+        transactions.append(t.add_output(TxOutput(k.address(), 800 - i)).add_output(TxOutput(['hello', str(i)])).sign())
+    path = tmp_path / 'transactions.bin'
+    path.write_bytes(b''.join([t.serialize() for t in transactions]))
+
+    offsets = [0]
+    for t in transactions:
+        offsets.append(offsets[-1] + t.byte_length())
+
+    parsed = list(Transaction.iter_file(str(path)))
+    assert [offset for offset, _ in parsed] == offsets[:-1]
+    assert [t.serialize() for _, t in parsed] == [t.serialize() for t in transactions]
+
+    indexes = list(Transaction.iter_file(str(path), index_only=True))
+    assert indexes == [(offsets[i], transactions[i].byte_length(), transactions[i].txid()) for i in range(3)]
+
+    lazy = list(Transaction.iter_file(str(path), lazy=True))
+    assert [(offset, t.txid()) for offset, t in lazy] == [(offsets[i], transactions[i].txid()) for i in range(3)]
+
+    # stop early, the file is released by the generator
+    for _ in Transaction.iter_file(str(path)):
+        break
+
+    empty = tmp_path / 'empty.bin'
+    empty.write_bytes(b'')
+    assert list(Transaction.iter_file(str(empty))) == []
+
+    truncated = tmp_path / 'truncated.bin'
+    truncated.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(ValueError, match=rf'invalid transaction at offset {offsets[2]}'):
+        list(Transaction.iter_file(str(truncated)))
+    with pytest.raises(ValueError, match=rf'invalid transaction at offset {offsets[2]}'):
+        list(Transaction.iter_file(str(truncated), index_only=True))
+
+
+def test_lazy_transaction():
+    k = Key('L5agPjZKceSTkhqZF2dmFptT5LFrbr6ZGPvP7u4A6dvhTrr71WZ9')
+    t = Transaction().add_inputs([Unspent(txid=f'{i:064x}', vout=i, satoshi=1000, private_keys=[k]) for i in range(3)])
+    t.add_outputs([TxOutput(k.address(), 500), TxOutput(['hello']), TxOutput(k.address(), 600)]).sign()
+    raw = t.serialize()
+
+    for source in [raw, raw.hex(), bytearray(raw), memoryview(raw)]:
+        lazy = LazyTransaction(source)
+        assert lazy.serialize() == raw and lazy.hex() == raw.hex() and lazy.byte_length() == len(raw)
+        assert lazy.txid() == lazy.txid() == t.txid()
+        assert lazy.version == t.version and lazy.locktime == t.locktime
+
+    lazy = LazyTransaction.from_hex(raw)
+    assert len(lazy.tx_inputs) == 3 and len(lazy.tx_outputs) == 3
+    # nothing decoded yet
+    assert lazy.tx_inputs._items == [None] * 3 and lazy.tx_outputs._items == [None] * 3
+
+    assert lazy.output(2).satoshi == 600 and lazy.output(2).locking_script == k.locking_script()
+    assert lazy.tx_outputs._items[0] is None and lazy.tx_outputs._items[1] is None
+    assert lazy.tx_outputs[-1] is lazy.output(2)
+    assert [o.satoshi for o in lazy.tx_outputs[:2]] == [500, 0]
+
+    assert lazy.input(1).txid == f'{1:064x}' and lazy.input(1).vout == 1
+    assert lazy.input(1).unlocking_script == t.tx_inputs[1].unlocking_script
+    assert [tx_input.vout for tx_input in lazy.tx_inputs] == [0, 1, 2]
+    with pytest.raises(IndexError):
+        lazy.input(3)
+
+    assert lazy.to_transaction().serialize() == raw
+
+    reader = TransactionReader(raw * 2)
+    assert LazyTransaction.from_hex(reader).txid() == LazyTransaction.from_hex(reader).txid() == t.txid()
+    assert LazyTransaction.from_hex(raw[:-1]) is None
+    assert LazyTransaction.from_hex(raw + b'\x00') is None
+
+
+def uncached_serialize(t: Transaction) -> bytes:
+    raw = t.version.to_bytes(4, 'little') + unsigned_to_varint(len(t.tx_inputs)) + b''.join([tx_input.serialize() for tx_input in t.tx_inputs])
+    raw += unsigned_to_varint(len(t.tx_outputs)) + b''.join([tx_output.serialize() for tx_output in t.tx_outputs])
+    return raw + t.locktime.to_bytes(4, 'little')
+
+
+def test_serialization_cache():
+    k = Key('L5agPjZKceSTkhqZF2dmFptT5LFrbr6ZGPvP7u4A6dvhTrr71WZ9')
+    t = Transaction().add_inputs([Unspent(txid=f'{i:064x}', vout=i, satoshi=1000, private_keys=[k]) for i in range(3)])
+    t.add_outputs([TxOutput(k.address(), 500), TxOutput(k.address(), 600)])
+    assert t.serialize() is t.serialize()
+    assert t.txid() is t.txid()
+
+    def changed(mutate) -> None:
+        txid = t.txid()
+        mutate()
+        assert t.serialize() == uncached_serialize(t)
+        assert t.txid() == hash256(uncached_serialize(t))[::-1].hex() != txid
+        assert t.byte_length() == len(uncached_serialize(t))
+
+    changed(lambda: t.sign())
+    changed(lambda: setattr(t.tx_inputs[0], 'unlocking_script', Script('00')))
+    changed(lambda: setattr(t.tx_inputs[0], 'sequence', 0))
+    changed(lambda: setattr(t.tx_inputs[1], 'txid', 'ff' * 32))
+    changed(lambda: setattr(t.tx_inputs[2], 'vout', 100))
+    changed(lambda: setattr(t.tx_outputs[0], 'satoshi', 1))
+    changed(lambda: setattr(t.tx_outputs[1], 'locking_script', Script('6a')))
+    changed(lambda: setattr(t, 'version', 2))
+    changed(lambda: setattr(t, 'locktime', 100))
+    changed(lambda: t.add_output(TxOutput(['hello'])))
+    changed(lambda: t.add_input(TxInput(unlocking_script=Script())))
+    changed(lambda: t.tx_outputs.pop())
+    changed(lambda: t.tx_outputs.append(TxOutput(['world'])))
+    changed(lambda: t.tx_outputs.insert(0, TxOutput(['!'])))
+    changed(lambda: t.tx_outputs.remove(t.tx_outputs[0]))
+    changed(lambda: t.tx_inputs.reverse())
+    changed(lambda: t.tx_inputs.sort(key=lambda tx_input: tx_input.vout))
+    changed(lambda: t.tx_inputs.__delitem__(0))
+    changed(lambda: t.tx_inputs.__setitem__(0, TxInput(unlocking_script=Script('51'))))
+    changed(lambda: t.tx_inputs.__setitem__(slice(0, 1), [TxInput(unlocking_script=Script('52'))]))
+    changed(lambda: t.tx_inputs.__iadd__([TxInput(unlocking_script=Script('53'))]))
+    changed(lambda: t.tx_inputs.__imul__(2))
+    changed(lambda: t.tx_inputs.clear())
+    changed(lambda: setattr(t, 'tx_outputs', [TxOutput(['replaced'])]))
+
+    # the output is shared, so the first transaction stops caching since it won't be notified any longer
+    shared = t.tx_outputs[0]
+    t.txid()
+    another = Transaction().add_output(shared)
+    assert not t._cacheable and another._cacheable
+    shared.satoshi = 1234
+    assert t.serialize() == uncached_serialize(t) and another.serialize() == uncached_serialize(another)
+    assert t.txid() == hash256(uncached_serialize(t))[::-1].hex()
+
+
+def test_serialize_into():
+    k = Key('L5agPjZKceSTkhqZF2dmFptT5LFrbr6ZGPvP7u4A6dvhTrr71WZ9')
+    t = Transaction().add_inputs([Unspent(txid=f'{i:064x}', vout=i, satoshi=1000, private_keys=[k]) for i in range(3)])
+    t.add_outputs([TxOutput(k.address(), 500), TxOutput(['hello' * 100])])
+    t.add_input(TxInput())
+    raw = uncached_serialize(t)
+    assert t.byte_length() == len(raw)
+    assert [tx_input.byte_length() for tx_input in t.tx_inputs] == [len(tx_input.serialize()) for tx_input in t.tx_inputs]
+    assert [tx_output.byte_length() for tx_output in t.tx_outputs] == [len(tx_output.serialize()) for tx_output in t.tx_outputs]
+
+    # preallocated, with an offset
+    buffer = bytearray(t.byte_length() + 2)
+    assert t.serialize_into(buffer, 1) == t.byte_length() + 1
+    assert buffer == b'\x00' + raw + b'\x00'
+    # writable memoryview
+    buffer = bytearray(t.byte_length())
+    assert t.serialize_into(memoryview(buffer)) == len(raw) and buffer == raw
+    # growing bytearray
+    buffer = bytearray()
+    assert t.tx_inputs[0].serialize_into(buffer) == len(buffer) and buffer == t.tx_inputs[0].serialize()
+    assert t.tx_outputs[1].serialize_into(buffer, len(buffer)) == len(buffer) and buffer == t.tx_inputs[0].serialize() + t.tx_outputs[1].serialize()
+    # offset beyond the end, padded with zeros
+    buffer = bytearray(b'\x01')
+    assert t.serialize_into(buffer, 10) == len(raw) + 10 and buffer == b'\x01' + bytes(9) + raw
+    with pytest.raises(ValueError):
+        t.serialize_into(memoryview(bytearray(len(raw))), 10)
+    # file object
+    stream = BytesIO()
+    assert t.serialize_into(stream) == len(raw) and stream.getvalue() == raw
+    # cached serialization is written as a whole
+    assert t.serialize() == raw
+    stream = BytesIO(b'\x00')
+    stream.seek(1)
+    assert t.serialize_into(stream, 1) == len(raw) + 1 and stream.getvalue() == b'\x00' + raw
+
+
+def test_parse_many():
+    k = Key('L5agPjZKceSTkhqZF2dmFptT5LFrbr6ZGPvP7u4A6dvhTrr71WZ9')
+    raws = []
+    for i in range(20):
+        t = Transaction(version=2, locktime=i).add_input(Unspent(txid=f'{i:064x}', vout=i, satoshi=1000, private_keys=[k]))
+        raws.append(t.add_outputs([TxOutput(k.address(), 800 - i), TxOutput(['hello', str(i)])]).sign().serialize())
+    raws = [raw if i % 2 else raw.hex() for i, raw in enumerate(raws)]
+    raws[5] = 'bad'
+    raws[6] = raws[6][:-1]
+
+    expected = [Transaction.from_hex(raw) for raw in raws]
+    assert expected[5] is None and expected[6] is None
+
+    def txids(transactions):
+        return [t.txid() if t else None for t in transactions]
+
+    assert txids(Transaction.parse_many(raws, workers=1, chunksize=3)) == txids(expected)
+    assert txids(Transaction.parse_many(raws, workers=2, chunksize=3)) == txids(expected)
+    assert txids(Transaction.iter_parse_many(iter(raws), workers=2, chunksize=1, prefetch=1)) == txids(expected)
+    assert Transaction.parse_many([]) == []
+    # the compact form as workers give it, built only when asked for
+    compacts = Transaction.parse_many(raws, workers=2, chunksize=3, compact=True)
+    assert compacts == Transaction.parse_many(raws, workers=1, compact=True) and compacts[5] is None and compacts[6] is None
+    assert txids([Transaction.from_compact(compact) for compact in compacts]) == txids(expected)
+
+    t = Transaction.parse_many(raws[:1], workers=1)[0]
+    assert t.version == 2 and t.locktime == 0
+    assert t.tx_inputs[0].txid == f'{0:064x}' and t.tx_outputs[0].satoshi == 800
+    assert t.tx_inputs[0].script_type == UnknownScriptType()
+    assert Transaction.from_compact(None) is None
+    # script types are classified by workers and sent along
+    t = Transaction.from_compact(compacts[0])
+    assert [tx_output.script_type for tx_output in t.tx_outputs] == [P2pkhScriptType(), OpReturnScriptType()]
+    assert all([tx_item._owner is t for tx_item in t.tx_inputs + t.tx_outputs]) and t.satoshi_total_out() == 800
+
+
+def test_compact_objects():
+    address = '1AfxgwYJrBgriZDLryfyKuSdBsi59jeBX9'
+    unspent1 = Unspent(txid='00' * 32, vout=0, satoshi=1000, address=address)
+    unspent2 = Unspent(txid='00' * 32, vout=1, satoshi=1000, address=address)
+    # address is decoded once, but each unspent has its own locking script
+    assert unspent1.locking_script.serialize() is unspent2.locking_script.serialize()
+    assert unspent1.locking_script is not unspent2.locking_script and unspent1.locking_script == P2pkhScriptType.locking(address)
+    unspent1.locking_script.script = b''
+    assert unspent2.locking_script == P2pkhScriptType.locking(address)
+    assert Unspent(txid='00' * 32, vout=2, satoshi=1000, address=address).locking_script == P2pkhScriptType.locking(address)
+    for o in [unspent1, TxInput(unspent1), TxOutput(address, 1000), Script()]:
+        assert not hasattr(o, '__dict__')
+        with pytest.raises(AttributeError):
+            o.undefined = 0
+
+
+def test_extended_format(tmp_path):
+    k = Key('L5agPjZKceSTkhqZF2dmFptT5LFrbr6ZGPvP7u4A6dvhTrr71WZ9')
+    t = Transaction().add_inputs([Unspent(txid=f'{i:064x}', vout=i, satoshi=1000 + i, private_keys=[k]) for i in range(3)])
+    t.add_outputs([TxOutput(k.address(), 500), TxOutput(['hello'])]).sign()
+    raw, ef = t.serialize(), t.serialize(extended=True)
+
+    assert ef[:4] == raw[:4] and ef[4:10] == TRANSACTION_EXTENDED_FORMAT_MARKER
+    tx_input = t.tx_inputs[0]
+    assert tx_input.serialize(extended=True) == tx_input.serialize() + (1000).to_bytes(8, 'little') + b'\x19' + k.locking_script().serialize()
+    assert len(ef) == len(raw) + 6 + 3 * (8 + 1 + 25)
+    assert t.hex(extended=True) == ef.hex() and t.serialize() == raw
+    buffer = bytearray()
+    assert t.serialize_into(buffer, extended=True) == len(ef) and buffer == ef
+
+    # auto detected, the context of outputs spent survives
+    for parsed in [Transaction.from_hex(ef), Transaction.from_hex(ef.hex()), Transaction.from_hex(TransactionBytesIO(ef)), Transaction.from_compact(decode_compact(ef))]:
+        assert parsed.serialize() == raw and parsed.serialize(extended=True) == ef and parsed.txid() == t.txid()
+        assert [(tx_input.satoshi, tx_input.locking_script) for tx_input in parsed.tx_inputs] == [(1000 + i, k.locking_script()) for i in range(3)]
+        assert parsed.digests() == t.digests()
+        # script types are recognised from the locking scripts
+        assert [tx_input.script_type for tx_input in parsed.tx_inputs] == [P2pkhScriptType()] * 3
+        assert [tx_output.script_type for tx_output in parsed.tx_outputs] == [P2pkhScriptType(), OpReturnScriptType()]
+    assert Transaction.from_hex(TransactionBytesIO(raw)).serialize() == raw
+    assert Transaction.from_hex(ef[:-1]) is None
+
+    lazy = LazyTransaction(ef)
+    assert lazy.extended and lazy.serialize() == raw and lazy.serialize(extended=True) == ef and lazy.hex(extended=True) == ef.hex()
+    assert lazy.txid() == t.txid() and lazy.byte_length() == len(raw)
+    assert lazy.input(2).satoshi == 1002 and lazy.input(2).locking_script == k.locking_script() and lazy.output(0).satoshi == 500
+    assert lazy.to_transaction().serialize(extended=True) == ef
+    with pytest.raises(ValueError, match=r'not given in extended format'):
+        LazyTransaction(raw).serialize(extended=True)
+
+    reader = TransactionReader(ef + raw)
+    assert reader.skip_transaction() == len(ef) and reader.skip_transaction() == len(raw)
+    # one walk records where everything is, the standard serialization is cut out of the extended one
+    reader = TransactionReader(b'\x00' + ef + raw)
+    reader.skip(1)
+    for layout, expected in [(reader.walk_transaction(), ef), (reader.walk_transaction(), raw)]:
+        assert layout.extended == (expected == ef) and layout.end - layout.start == len(expected)
+        assert b''.join([reader.buffer[start:end] for start, end in layout.spans()]) == raw
+        assert layout.standard_byte_length() == len(raw) and layout.txid(reader.buffer) == t.txid()
+        assert [TxOutput.from_hex(TransactionReader(reader.buffer, offset)).satoshi for offset in layout.output_offsets] == [o.satoshi for o in t.tx_outputs]
+        assert [TxInput.from_hex(TransactionReader(reader.buffer, offset)).outpoint for offset in layout.input_offsets] == [i.outpoint for i in t.tx_inputs]
+
+    path = tmp_path / 'transactions.bin'
+    path.write_bytes(ef + raw)
+    assert list(Transaction.iter_file(str(path), index_only=True)) == [(0, len(ef), t.txid()), (len(ef), len(raw), t.txid())]
+    assert [parsed.serialize() for _, parsed in Transaction.iter_file(str(path))] == [raw, raw]
+
+
+def test_outpoint():
+    txid = 'd2bc57099dd434a5adb51f7de38cc9b8565fb208090d9b5ea7a6b4778e1fdd48'
+    outpoint = Outpoint(txid, 1)
+    assert outpoint == bytes.fromhex(txid)[::-1] + b'\x01\x00\x00\x00'
+    assert outpoint.txid == txid and outpoint.vout == 1 and outpoint.txid_bytes == bytes.fromhex(txid)[::-1]
+    assert Outpoint(outpoint.txid_bytes, 1) == outpoint
+    assert Outpoint(bytes(outpoint)) == outpoint
+    assert str(outpoint) == f'{txid}:1'
+    assert len({outpoint, Outpoint(txid, 1), Outpoint(txid, 2)}) == 2
+    with pytest.raises(AssertionError):
+        Outpoint(bytes(33))
+
+    unspent = Unspent(txid=txid, vout=1, satoshi=1000, address='1AfxgwYJrBgriZDLryfyKuSdBsi59jeBX9')
+    assert unspent.outpoint == outpoint
+    assert unspent == Unspent(outpoint=outpoint, satoshi=2000, address='1AfxgwYJrBgriZDLryfyKuSdBsi59jeBX9')
+    assert hash(unspent) == hash(outpoint)
+    unspent.vout = 2
+    assert unspent.outpoint == Outpoint(txid, 2) and unspent.txid == txid
+
+    t = Transaction().add_input(unspent).add_output(TxOutput(out='1AfxgwYJrBgriZDLryfyKuSdBsi59jeBX9', satoshi=1000))
+    assert t.tx_inputs[0].outpoint == Outpoint(txid, 2)
+    assert t.serialize()[5:41] == Outpoint(txid, 2)
+    # outpoint changes through hex txid and vout invalidate the cached serialization
+    t.tx_inputs[0].vout = 3
+    assert t.serialize()[5:41] == Outpoint(txid, 3)
+    t.tx_inputs[0].txid = '00' * 32
+    assert t.serialize()[5:41] == Outpoint('00' * 32, 3)
+    assert Transaction.from_hex(t.serialize()).tx_inputs[0].outpoint == Outpoint('00' * 32, 3)
+
+
+def uncached_digests(t: Transaction):
+    hash_prevouts = hash256(b''.join([tx_input.outpoint for tx_input in t.tx_inputs]))
+    hash_sequence = hash256(b''.join([tx_input.sequence.to_bytes(4, 'little') for tx_input in t.tx_inputs]))
+    hash_outputs = hash256(b''.join([tx_output.serialize() for tx_output in t.tx_outputs]))
+    return [t._digest(tx_input, hash_prevouts, hash_sequence, hash_outputs) for tx_input in t.tx_inputs]
+
+
+def test_sighash_cache():
+    key = Key()
+    address = key.address()
+    t = Transaction()
+    t.add_inputs([Unspent(txid=f'{i:064x}', vout=i, satoshi=1000, private_keys=[key]) for i in range(4)])
+    t.add_outputs([TxOutput(out=address, satoshi=900), TxOutput(['hello'])])
+    cache = t.sighash_cache
+    assert t.digests() == uncached_digests(t)
+    assert set(cache._midstates) == {'prevouts', 'sequence', 'outputs'}
+    # a single digest computes nothing else
+    t.tx_outputs[0].satoshi = 800
+    assert set(cache._midstates) == {'prevouts', 'sequence'}
+    assert t.digest(2) == uncached_digests(t)[2]
+
+    def invalidated(mutate, midstates) -> None:
+        t.digests()
+        mutate()
+        assert set(cache._midstates) == {'prevouts', 'sequence', 'outputs'} - set(midstates)
+        assert t.digests() == uncached_digests(t)
+
+    invalidated(lambda: t.sign(), [])
+    invalidated(lambda: setattr(t, 'locktime', 1), [])
+    invalidated(lambda: setattr(t.tx_inputs[0], 'sequence', 0), ['sequence'])
+    invalidated(lambda: setattr(t.tx_inputs[1], 'vout', 7), ['prevouts'])
+    invalidated(lambda: setattr(t.tx_inputs[1], 'txid', 'ff' * 32), ['prevouts'])
+    invalidated(lambda: setattr(t.tx_outputs[1], 'locking_script', Script('6a')), ['outputs'])
+    invalidated(lambda: t.add_output(TxOutput(['world'])), ['outputs'])
+    invalidated(lambda: t.tx_outputs.pop(), ['outputs'])
+    invalidated(lambda: t.tx_inputs.reverse(), ['prevouts', 'sequence'])
+    invalidated(lambda: t.add_input(Unspent(txid='ee' * 32, vout=0, satoshi=1000, private_keys=[key])), ['prevouts', 'sequence'])
+
+    # other sighash flags
+    t.tx_inputs[0].sighash = SIGHASH.SINGLE_FORKID
+    t.tx_inputs[1].sighash = SIGHASH.NONE_ANYONECANPAY_FORKID
+    t.tx_inputs[3].sighash = SIGHASH.SINGLE_FORKID
+    digests = t.digests()
+    assert digests[2:3] == uncached_digests(t)[2:3]
+    assert digests[0] == t._digest(t.tx_inputs[0], cache.hash_prevouts(), b'\x00' * 32, hash256(t.tx_outputs[0].serialize()))
+    assert digests[1] == t._digest(t.tx_inputs[1], b'\x00' * 32, b'\x00' * 32, b'\x00' * 32)
+    assert digests[3] == t._digest(t.tx_inputs[3], cache.hash_prevouts(), b'\x00' * 32, b'\x00' * 32)
+
+    with pytest.raises(AssertionError, match=r'index out of range'):
+        t.digest(len(t.tx_inputs))
+
+    # midstates are not cached once an input is shared with another transaction
+    for tx_input in t.tx_inputs:
+        tx_input.sighash = SIGHASH.ALL_FORKID
+    Transaction().add_input(t.tx_inputs[0])
+    assert not cache._midstates
+    t.tx_inputs[0].sequence = 1
+    assert t.digests() == uncached_digests(t) and not cache._midstates
+
+
+def test_signature_hash():
+    key = Key()
+    t = Transaction()
+    t.add_inputs([Unspent(txid=f'{i:064x}', vout=i, satoshi=1000, private_keys=[key]) for i in range(3)])
+    t.add_output(TxOutput(out=key.address(), satoshi=900))
+    t.tx_inputs[1].sighash = SIGHASH.SINGLE_ANYONECANPAY_FORKID
+    # spends a large locking script
+    t.tx_inputs[2].locking_script = Script(b'\x6a' + bytes(1024 * 1024))
+    assert t.signature_hashes() == [hash256(digest) for digest in t.digests()]
+    assert [t.signature_hash(i) for i in range(3)] == t.signature_hashes()
+
+    t.sign()
+    for i in range(2):
+        der = t.tx_inputs[i].unlocking_script.serialize()[1:-34]
+        assert key.public_key().verify(der[:-1], t.digest(i))
+
+
+def build_signing_transaction() -> Transaction:
+    k1, k2, k3 = Key(1), Key(2), Key(3)
+    t = Transaction()
+    t.add_inputs([Unspent(txid=f'{i:064x}', vout=i, satoshi=1000, private_keys=[[k1, k2][i % 2]]) for i in range(40)])
+    multisig = BareMultisigScriptType.locking([k1.public_key().hex(), k2.public_key().hex(), k3.public_key().hex()], 2)
+    t.add_input(Unspent(txid='ff' * 32, vout=0, satoshi=1000, locking_script=multisig, script_type=BareMultisigScriptType(), private_keys=[k1, k3]))
+    t.add_output(TxOutput(out=k1.address(), satoshi=40000))
+    return t
+
+
+def test_sign_workers():
+    expected = build_signing_transaction().sign().serialize()
+    assert build_signing_transaction().sign(workers=2, chunksize=8).serialize() == expected
+    # bypass inputs already signed
+    t = build_signing_transaction()
+    t.tx_inputs[3].unlocking_script = Script('00')
+    t.sign(workers=2, chunksize=8)
+    assert t.tx_inputs[3].unlocking_script == Script('00')
+    assert t.tx_inputs[4].unlocking_script == Transaction.from_hex(expected).tx_inputs[4].unlocking_script
+
+
+def test_verify():
+    t = build_signing_transaction()
+    k1 = Key(1)
+    t.add_input(Unspent(txid='ee' * 32, vout=1, satoshi=1000, locking_script=P2pkScriptType.locking(k1.public_key().serialize()),
+                        script_type=P2pkScriptType(), private_keys=[k1]))
+    t.tx_inputs[5].sighash = SIGHASH.SINGLE_ANYONECANPAY_FORKID
+    t.sign()
+    assert t.verify() == []
+    assert t.verify(workers=2, chunksize=8) == []
+
+    # verified from raw transaction in extended format, where sighash flags come from signatures
+    assert Transaction.from_hex(t.hex(extended=True)).verify() == []
+    # locking scripts and satoshi spent are unknown
+    assert Transaction.from_hex(t.hex()).verify() == list(range(len(t.tx_inputs)))
+
+    bad = Transaction.from_hex(t.hex(extended=True))
+    # wrong satoshi spent
+    bad.tx_inputs[0].satoshi += 1
+    # signature of another input
+    bad.tx_inputs[1].unlocking_script = bad.tx_inputs[3].unlocking_script
+    # multisig signatures out of order
+    multisig = bad.tx_inputs[40].unlocking_script.serialize()
+    first, second = multisig[1:1 + 1 + multisig[1]], multisig[1 + 1 + multisig[1]:]
+    bad.tx_inputs[40].unlocking_script = Script(b'\x00' + second + first)
+    # P2PK signed by another key
+    bad.tx_inputs[41].unlocking_script = Script(bad.tx_inputs[0].unlocking_script.serialize()[:-34])
+    # not a signature
+    bad.tx_inputs[2].unlocking_script = Script('00')
+    # public key doesn't match
+    bad.tx_inputs[6].unlocking_script = Script(bad.tx_inputs[6].unlocking_script.serialize()[:-34] + encode_pushdata(Key(3).public_key().serialize()))
+    # changes to the transaction invalidate all the signatures committed
+    assert bad.verify() == [0, 1, 2, 6, 40, 41]
+    bad.tx_outputs[0].satoshi -= 1
+    assert bad.verify() == [i for i in range(len(bad.tx_inputs)) if i != 5]
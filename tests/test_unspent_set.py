@@ -0,0 +1,112 @@
+import pytest
+
+from bsvlib.constants import Chain
+from bsvlib.keys import Key
+from bsvlib.script.script import Script
+from bsvlib.script.type import P2pkhScriptType, P2pkScriptType, UnknownScriptType
+from bsvlib.transaction.transaction import Transaction, TxOutput
+from bsvlib.transaction.unspent import Unspent
+from bsvlib.transaction.unspent_set import UnspentSet
+from bsvlib.wallet import create_transaction
+
+k1 = Key('L5agPjZKceSTkhqZF2dmFptT5LFrbr6ZGPvP7u4A6dvhTrr71WZ9')
+k2 = Key('5KiANv9EHEU4o9oLzZ6A7z4xJJ3uvfK2RLEubBtTz1fSwAbpJ2U')
+
+
+def unspents():
+    return [
+        Unspent(txid=f'{i:064x}', vout=i % 3, satoshi=1000 * (i + 1), height=100 + i if i % 2 else -1, confirmations=i, private_keys=[k1 if i % 2 else k2])
+        for i in range(10)
+    ]
+
+
+def test_unspent_set():
+    s = UnspentSet(unspents())
+    assert len(s) == 10 and s.total() == 55000
+    assert list(s) == unspents()
+    # profiles are shared between unspents of the same owner
+    assert len(s._profiles) == 2
+
+    u = s.get(f'{3:064x}', 0)
+    assert u == unspents()[3] and u.satoshi == 4000 and u.height == 103 and u.confirmations == 3
+    assert u.private_keys == [k1] and u.address == k1.address() and u.script_type == P2pkhScriptType() and u.locking_script == k1.locking_script()
+    assert s.get(f'{3:064x}', 1) is None
+    assert unspents()[3] in s and (f'{3:064x}', 0) in s and (f'{3:064x}', 1) not in s
+
+    assert not s.add(unspents()[0])
+    assert s.add_many(unspents()) == 0
+
+    # remove rows in the middle, at the end, and the ones not exist
+    assert s.remove(f'{3:064x}', 0)
+    assert not s.remove(f'{3:064x}', 0)
+    assert s.remove_many([unspents()[9], (f'{5:064x}', 2), (f'{5:064x}', 0)]) == 2
+    assert len(s) == 7 and s.total() == 55000 - 4000 - 10000 - 6000
+    assert sorted([u.txid for u in s]) == sorted([u.txid for u in unspents() if u.txid not in [f'{3:064x}', f'{5:064x}', f'{9:064x}']])
+    for u in unspents():
+        if u in s:
+            assert s.get(u.txid, u.vout).satoshi == u.satoshi
+
+    p2pk = Unspent(txid='ff' * 32, vout=0, satoshi=1, script_type=P2pkScriptType(), locking_script=Script('00'), private_keys=[k1])
+    assert s.add(p2pk) and len(s._profiles) == 3
+    assert s.get('ff' * 32, 0).script_type == P2pkScriptType()
+
+
+def test_filter():
+    s = UnspentSet(unspents())
+    assert s.select_where(min_satoshi=3000, max_satoshi=5000).total() == 12000
+    assert [u.height for u in s.select_where(min_height=105, max_height=107)] == [105, 107]
+    assert len(s.select_where(predicate=lambda satoshi, height, confirmations: confirmations % 2 == 0)) == 5
+    assert len(s.select_where()) == 10
+
+    assert [u.confirmations for u in s.confirmed(8)] == [8, 9]
+    assert [u.height for u in s.confirmed(5, current_height=108)] == [101, 103]
+
+    # subset is independent
+    subset = s.confirmed()
+    subset.pop()
+    assert len(subset) == 8 and len(s) == 10
+
+
+def test_pop():
+    s = UnspentSet(unspents()[:2])
+    assert s.pop() == unspents()[1] and s.pop() == unspents()[0]
+    with pytest.raises(IndexError):
+        s.pop()
+
+
+def test_interoperate():
+    s = UnspentSet(unspents())
+    t = Transaction().add_inputs(s).add_output(TxOutput(k1.address(), 1000)).sign()
+    assert len(t.tx_inputs) == 10 and t.fee() == 54000
+
+    t = create_transaction(s, [(k1.address(), 9500)], k1.address())
+    # the coins picked are removed from the set
+    assert len(s) == 10 - len(t.tx_inputs)
+    assert all([tx_input.txid not in [u.txid for u in s] for tx_input in t.tx_inputs])
+
+
+def test_save_load(tmp_path):
+    unknown = Unspent(txid='ee' * 32, vout=1, satoshi=1, locking_script=Script('6a'))
+    s = UnspentSet(unspents() + [unknown])
+    s.remove(f'{0:064x}', 0)
+    path = str(tmp_path / 'unspents.bin')
+    s.save(path)
+
+    loaded = UnspentSet.load(path)
+    assert list(loaded) == list(s)
+    for a, b in zip(loaded, s):
+        fields = ['satoshi', 'height', 'confirmations', 'address', 'script_type', 'locking_script']
+        assert [getattr(a, field) for field in fields] == [getattr(b, field) for field in fields]
+        # private keys are not saved
+        assert a.private_keys == []
+    assert loaded.get('ee' * 32, 1).script_type == UnknownScriptType()
+    assert loaded.add(unspents()[0]) and len(loaded) == len(s) + 1
+
+    loaded = UnspentSet.load(path, private_keys=[k1, Key(chain=Chain.TEST)])
+    assert [u.private_keys for u in loaded if u.address == k1.address()] == [[k1]] * 5
+    assert [u.private_keys for u in loaded if u.address == k2.address()] == [[]] * 4
+
+    with open(path, 'wb') as f:
+        f.write(b'bad')
+    with pytest.raises(AssertionError, match=r'bad unspent set file'):
+        UnspentSet.load(path)
@@ -1,7 +1,13 @@
+import pytest
+
+from bsvlib.coin_selection import LargestFirst
 from bsvlib.constants import Chain
 from bsvlib.keys import Key
 from bsvlib.service.whatsonchain import WhatsOnChain
+from bsvlib.transaction.transaction import InsufficientFunds
+from bsvlib.transaction.unspent import Unspent
 from bsvlib.wallet import Wallet
+from . import k, unspents
 
 
 def test_chain_provider():
@@ -45,3 +51,31 @@ def test():
     assert w2.get_balance() == w2.get_balance(refresh=True)
 
     assert w1.get_balance() == w2.get_balance()
+
+
+def test_pool(monkeypatch):
+    refreshed = []
+
+    def get_unspents(chain, provider, **kwargs):
+        refreshed.append(kwargs['private_keys'])
+        return unspents([5000, 20000, 10000])
+
+    monkeypatch.setattr(Unspent, 'get_unspents', get_unspents)
+    w = Wallet([k])
+    address = Key().address()
+    t = w.create_transaction(outputs=[(address, 8000)], selector=LargestFirst())
+    pool = w.pool
+    assert len(refreshed) == 1 and t.tx_inputs[0].satoshi == 20000
+    # the same pool is used by the transactions after, which never refresh
+    t = w.create_transaction(outputs=[(address, 8000)], selector=LargestFirst())
+    assert len(refreshed) == 1 and w.get_pool() is pool and t.tx_inputs[0].satoshi == 10000
+    assert [unspent.satoshi for unspent in w.unspents] == [unspent.satoshi for unspent in pool] == [5000]
+    assert w.get_balance() == pool.total() == 5000
+    with pytest.raises(InsufficientFunds):
+        w.create_transaction(outputs=[(address, 8000)], selector=LargestFirst())
+    assert w.get_balance() == pool.total() == 5000
+
+    # refreshing unspents builds the pool again
+    w.get_unspents(refresh=True)
+    assert len(refreshed) == 2 and w.get_pool() is not pool and w.get_pool().total() == 35000
+    assert w.get_pool(refresh=True).total() == 35000 and len(refreshed) == 3